@@ -0,0 +1,100 @@
+"""Benchmark `query_wrappers.most_recent_records_before_start_time`
+against the sort + groupby().last() + merge implementation it replaced.
+
+The synthetic frame is shaped like a multi-year GENCONDATA /
+SPDCONNECTIONPOINTCONSTRAINT result as dynamic_data_compiler hands it
+to the finalise step: string ids, an EFFECTIVEDATE spread over a few
+years with many records per constraint, a version number and a few
+value columns. Both implementations are timed on the same frame, and
+their results are checked to be identical first.
+
+Run: uv run python scripts/benchmark_most_recent_records.py [rows]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from nemosis import defaults
+from nemosis.query_wrappers import most_recent_records_before_start_time
+
+TABLE = "GENCONDATA"
+ROWS = 3_000_000
+CONSTRAINTS = 40_000
+START_TIME = datetime(2021, 1, 1)
+REPEATS = 3
+
+
+def sort_and_merge(data, start_time, table_name):
+    date_col = defaults.primary_date_columns[table_name]
+    group_cols = defaults.effective_date_group_col[table_name]
+    records_from_after_start = data[data[date_col] >= start_time].copy()
+    records_from_before_start = data[data[date_col] < start_time].copy()
+    records_from_before_start = records_from_before_start.sort_values(date_col, kind="stable")
+    if len(group_cols) > 0:
+        most_recent_from_before_start = records_from_before_start.groupby(
+            group_cols, as_index=False, observed=True
+        ).last()
+        group_cols = group_cols + [date_col]
+        most_recent_from_before_start = pd.merge(
+            most_recent_from_before_start.loc[:, group_cols],
+            records_from_before_start,
+            "inner",
+            group_cols,
+        )
+    else:
+        most_recent_from_before_start = records_from_before_start.tail(1)
+    return pd.concat([records_from_after_start, most_recent_from_before_start], sort=False)
+
+
+def synthetic_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    ids = np.array([f"CONSTRAINT_{i:05d}" for i in range(CONSTRAINTS)], dtype=object)
+    effective = pd.Timestamp("2015-01-01") + pd.to_timedelta(
+        rng.integers(0, 7 * 365, rows), unit="D"
+    )
+    return pd.DataFrame(
+        {
+            "EFFECTIVEDATE": effective,
+            "VERSIONNO": rng.integers(1, 5, rows),
+            "GENCONID": ids[rng.integers(0, CONSTRAINTS, rows)],
+            "CONSTRAINTTYPE": rng.choice(np.array(["<=", ">=", "="], dtype=object), rows),
+            "CONSTRAINTVALUE": rng.random(rows) * 1000,
+            "GENERICCONSTRAINTWEIGHT": rng.random(rows),
+            "LASTCHANGED": effective,
+        }
+    )
+
+
+def best_of(function, data) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(data, START_TIME, TABLE)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    data = synthetic_frame(rows)
+    print(f"{TABLE}-shaped frame: {len(data):,} rows, {data['GENCONID'].nunique():,} groups")
+
+    new = most_recent_records_before_start_time(data, START_TIME, TABLE)
+    old = sort_and_merge(data, START_TIME, TABLE)
+    pd.testing.assert_frame_equal(new.reset_index(drop=True), old.reset_index(drop=True))
+    print(f"results identical ({len(new):,} rows)")
+
+    old_time = best_of(sort_and_merge, data)
+    new_time = best_of(most_recent_records_before_start_time, data)
+    print(f"sort + merge:   {old_time:8.3f} s")
+    print(f"groupby + mask: {new_time:8.3f} s  ({old_time / new_time:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""As-of snapshots for tables searched from the start of the data model.
+
+Tables with `search_type == "all"` (DUDETAIL, GENCONDATA, the SPD*
+constraint tables, ...) hold slowly changing records keyed by an
+effective date. To know which record applied at `start_time`, the fetch
+loop reads every monthly archive from `nem_data_model_start_time`
+onwards, and `most_recent_records_before_start_time` then keeps only the
+latest record per group. Even a one-day query reads over a hundred
+archives.
+
+A snapshot stores the result of that reduction for everything up to a
+month boundary (the "cutoff"): for each group in
+`effective_date_group_col`, the records with the latest effective date
+before the cutoff, plus every record dated on or after it (future-dated
+records in early archives, which a later query may still need). Because
+dropping a record that is already superseded never changes which record
+is most recent, a query starting on or after the cutoff gets the same
+result from the snapshot plus the archives after the cutoff as from the
+full scan.
+
+Snapshots are used when a query passes asof_snapshots=True. They live
+under `nemosis_asof/<table>/<columns>/<YYYYMM>.parquet` in the cache
+directory, one per cutoff month, and are keyed by the selected columns
+since they only hold those. The fetch loop builds one at the month
+boundary before each query's start, from the nearest earlier snapshot
+where there is one. It is only saved if data was read for every month
+it covers, and if its cutoff is at least `PUBLICATION_LAG_MONTHS`
+behind the current month, since a snapshot missing a month would give
+every later query the wrong records. They are derived data: delete the
+directory (or pass rebuild=True) to have them rebuilt.
+"""
+import hashlib
+import os
+from datetime import datetime
+
+from nemosis import defaults
+from nemosis import filters
+from nemosis import processing_info_maps
+from nemosis import query_wrappers
+from nemosis.value_parser import _is_text_column, _parse_datetime_np
+
+DIRECTORY_NAME = "nemosis_asof"
+
+# AEMO publishes each month's MMSDM archive some weeks after the month
+# ends, and the most recent months can still be missing or incomplete.
+PUBLICATION_LAG_MONTHS = 2
+
+
+def applies(table_name, select_columns):
+    """
+    True if queries on table_name with these columns can be served from
+    snapshots: monthly MMS tables searched from the start of the data
+    model, whose date filter is an upper bound on the same column that
+    most_recent_records_before_start_time reduces on, and whose selected
+    columns include that column and the group columns.
+    """
+    if processing_info_maps.search_type.get(table_name) != "all":
+        return False
+    if defaults.table_types[table_name] != "MMS":
+        return False
+    finalise = processing_info_maps.finalise[table_name] or []
+    if not finalise or finalise[0] is not query_wrappers.most_recent_records_before_start_time:
+        return False
+    date_col = defaults.primary_date_columns[table_name]
+    window = filters.window_columns.get(processing_info_maps.filter[table_name])
+    if window != [(date_col, False, True)]:
+        return False
+    if select_columns == "all":
+        return True
+    needed = [date_col] + defaults.effective_date_group_col[table_name]
+    return all(column in select_columns for column in needed)
+
+
+def cutoff_for(start_time):
+    """The month boundary at or before start_time that snapshots are
+    taken at."""
+    return datetime(start_time.year, start_time.month, 1)
+
+
+def months_between(start, cutoff):
+    """The (year, month) of each month from the one `start` falls in up
+    to the one before `cutoff`, formatted as the date generators format
+    them (e.g. ("2021", "04"))."""
+    year, month = start.year, start.month
+    while datetime(year, month, 1) < cutoff:
+        yield str(year), defaults.months[month - 1]
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def past_publication_lag(cutoff, now=None):
+    """True if the archives for every month before `cutoff` should have
+    been published by `now` (default: the current time)."""
+    now = now or datetime.now()
+    months_behind = (now.year - cutoff.year) * 12 + now.month - cutoff.month
+    return months_behind >= PUBLICATION_LAG_MONTHS
+
+
+def reduce_to_snapshot(data, table_name, cutoff):
+    """
+    The rows of `data` a snapshot at `cutoff` keeps: records dated
+    before the cutoff only if they have the latest such date in their
+    group, and every record dated on or after it. Row order is
+    preserved, and rows without a date (which
+    most_recent_records_before_start_time never returns) are dropped.
+    """
+    date_col = defaults.primary_date_columns[table_name]
+    group_cols = defaults.effective_date_group_col[table_name]
+    dates = data[date_col]
+    if _is_text_column(dates):
+        dates = _parse_datetime_np(dates)
+    before = dates < cutoff
+    if group_cols:
+        latest = dates.where(before).groupby(
+            [data[col] for col in group_cols], observed=True
+        ).transform("max")
+    else:
+        latest = dates.where(before).max()
+    keep = (dates >= cutoff) | (before & (dates == latest))
+    return data[keep.to_numpy()]
+
+
+class AsOfIndex:
+    """The snapshots of one table, for one set of selected columns."""
+
+    def __init__(self, raw_data_location, table_name, select_columns):
+        if select_columns == "all":
+            key = "all"
+        else:
+            key = hashlib.sha1("\n".join(select_columns).encode()).hexdigest()[:12]
+        self.directory = os.path.join(raw_data_location, DIRECTORY_NAME, table_name, key)
+
+    def path(self, cutoff):
+        return os.path.join(self.directory, f"{cutoff:%Y%m}.parquet")
+
+    def latest(self, cutoff):
+        """
+        (cutoff, path) of the latest snapshot taken at or before
+        `cutoff`, or None if there isn't one.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return None
+        best = None
+        for name in names:
+            stem, extension = os.path.splitext(name)
+            if extension != ".parquet":
+                continue
+            try:
+                snapshot_cutoff = datetime.strptime(stem, "%Y%m")
+            except ValueError:
+                continue
+            if snapshot_cutoff <= cutoff and (best is None or snapshot_cutoff > best):
+                best = snapshot_cutoff
+        if best is None:
+            return None
+        return best, self.path(best)
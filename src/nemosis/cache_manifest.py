@@ -0,0 +1,204 @@
+"""Index of the feather/parquet files in a NEMOSIS cache directory.
+
+The fetch loop used to find out whether each period was cached by
+globbing `raw_data_location`, which lists the whole directory for every
+pattern with a wildcard in it. On FCAS_4_SECOND that is hundreds of
+periods per day, and on a network filesystem holding a large cache each
+listing is slow.
+
+`CacheManifest` instead keeps a SQLite table, `nemosis_manifest.sqlite`
+in the cache directory, with one row per cache file: its table, format,
+row count, columns and size. The table is loaded once per query and
+looked up in memory. A hit is confirmed with a single stat of the file
+(so files deleted or replaced by hand are noticed), and rows are written
+in the same call that moves a finished cache file into place. Cache
+files written before the manifest existed are added the first time they
+are found.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "nemosis_manifest.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_files (
+    path TEXT PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    fformat TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    columns TEXT NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+
+class CacheManifest:
+    """
+    The manifest for one cache directory.
+
+    Entries are keyed by path relative to the cache directory. Instances
+    can be pickled (e.g. to process-pool workers); the in-memory copy of
+    the entries is left behind and reloaded on first use.
+    """
+
+    def __init__(self, raw_data_location):
+        self.raw_data_location = raw_data_location
+        self.path = os.path.join(raw_data_location, MANIFEST_NAME)
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"raw_data_location": self.raw_data_location, "path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["raw_data_location"])
+
+    def lookup(self, full_filename, table_name):
+        """
+        The entry for a cache file as a dict (table_name, fformat, rows,
+        columns, size), or None if the file isn't there.
+
+        Costs one stat. Files missing from the manifest but present on
+        disk are read for their metadata and added.
+        """
+        key = self._key(full_filename)
+        entries = self._load()
+        try:
+            size = os.stat(full_filename).st_size
+        except OSError:
+            if key in entries:
+                self._delete(key)
+            return None
+        entry = entries.get(key)
+        if entry is not None and entry["size"] == size:
+            return entry
+        return self._backfill(full_filename, key, size, table_name)
+
+    def record(self, full_filename, table_name, fformat, data):
+        """Add or replace the entry for a cache file just written from
+        `data`."""
+        entry = {
+            "table_name": table_name,
+            "fformat": fformat,
+            "rows": len(data),
+            "columns": [str(column) for column in data.columns],
+            "size": os.path.getsize(full_filename),
+        }
+        self._store(self._key(full_filename), entry)
+        return entry
+
+    def _key(self, full_filename):
+        return os.path.relpath(full_filename, self.raw_data_location).replace(os.sep, "/")
+
+    def _load(self):
+        with self._lock:
+            if self._entries is None:
+                self._entries = {}
+                try:
+                    with self._connect() as connection:
+                        for path, table_name, fformat, rows, columns, size in connection.execute(
+                            "SELECT path, table_name, fformat, rows, columns, size FROM cache_files"
+                        ):
+                            self._entries[path] = {
+                                "table_name": table_name,
+                                "fformat": fformat,
+                                "rows": rows,
+                                "columns": json.loads(columns),
+                                "size": size,
+                            }
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not read cache manifest {self.path} ({e})")
+            return self._entries
+
+    def _backfill(self, full_filename, key, size, table_name):
+        fformat = os.path.splitext(full_filename)[1].lstrip(".")
+        try:
+            rows, columns = _file_metadata(full_filename, fformat)
+        except (OSError, pa.ArrowException) as e:
+            logger.debug(f"Could not read metadata of {full_filename} ({e})")
+            return None
+        entry = {
+            "table_name": table_name,
+            "fformat": fformat,
+            "rows": rows,
+            "columns": columns,
+            "size": size,
+        }
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache_files"
+                    " (path, table_name, fformat, rows, columns, size)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        entry["table_name"],
+                        entry["fformat"],
+                        entry["rows"],
+                        json.dumps(entry["columns"]),
+                        entry["size"],
+                    ),
+                )
+        except sqlite3.Error as e:
+            # The manifest is only an index; the cache file itself is
+            # already in place and will be backfilled next time.
+            logger.warning(f"Could not update cache manifest {self.path} ({e})")
+        with self._lock:
+            if self._entries is not None:
+                self._entries[key] = entry
+
+    def _delete(self, key):
+        try:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM cache_files WHERE path = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update cache manifest {self.path} ({e})")
+        with self._lock:
+            if self._entries is not None:
+                self._entries.pop(key, None)
+
+    def _connect(self):
+        # A connection per call, so threads and pool workers never share
+        # one; SQLite's own locking serialises their writes. The context
+        # manager commits the statement as a single transaction.
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(_SCHEMA)
+        return _closing_transaction(connection)
+
+
+class _closing_transaction:
+    """sqlite3's connection context manager commits but doesn't close."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection.__enter__()
+
+    def __exit__(self, *exc_info):
+        try:
+            return self.connection.__exit__(*exc_info)
+        finally:
+            self.connection.close()
+
+
+def _file_metadata(full_filename, fformat):
+    if fformat == "parquet":
+        metadata = pq.read_metadata(full_filename)
+        return metadata.num_rows, list(metadata.schema.to_arrow_schema().names)
+    with pa.memory_map(full_filename) as source:
+        reader = pa.ipc.open_file(source)
+        rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        return rows, list(reader.schema.names)
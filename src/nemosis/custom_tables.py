@@ -48,9 +48,7 @@ def fcas4s_scada_match(
         (fcas4s["TIMESTAMP"].dt.minute.isin(list(range(0, 60, 5))))
         & (fcas4s["TIMESTAMP"].dt.second < 20)
     ]
-    fcas4s["TIMESTAMP"] = fcas4s["TIMESTAMP"].apply(
-        lambda dt: datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute)
-    )
+    fcas4s["TIMESTAMP"] = fcas4s["TIMESTAMP"].dt.floor("min")
 
     # Pull in the dispatch unit scada data.
     table_name_scada = "DISPATCH_UNIT_SCADA"
@@ -81,32 +79,9 @@ def fcas4s_scada_match(
     # Combine scada data from interconnectors and dispatch units.
     scada_elements = pd.concat([scada, inter_flows], sort=False)
 
-    # Merge the fcas and scada data based on time stamp, these leads every scada element to be joined to every fcas
-    # element that then allows them to be comapred.
-    profile_comp = pd.merge(
-        fcas4s, scada_elements, "inner", left_on="TIMESTAMP", right_on="SETTLEMENTDATE"
-    )
-
-    # Calculate the error between each measurement.
-    profile_comp["ERROR"] = profile_comp["VALUE"] - profile_comp["SCADAVALUE"]
-    profile_comp["ERROR"] = profile_comp["ERROR"].abs()
-
-    # Choose the fcas values that best matches the scada value during the 5 min interval.
-    profile_comp = profile_comp.sort_values("ERROR")
-    error_comp = profile_comp.groupby(
-        ["MARKETNAME", "ELEMENTNUMBER", "TIMESTAMP"], as_index=False
-    ).first()
-
-    error_comp = error_comp.drop(columns=["TIMESTAMP"])
-
-    error_comp = error_comp.loc[
-        :, ("ELEMENTNUMBER", "MARKETNAME", 'SCADAVALUE', "ERROR")
-    ]
-
-    # Aggregate the error to comapre each scada and fcas element potential match.
-    error_comp = error_comp.groupby(
-        ["MARKETNAME", "ELEMENTNUMBER"], as_index=False
-    ).sum()
+    # Compare every scada element with every fcas element, a batch of 5 min intervals at a time, and total the
+    # errors of the best matching fcas value in each interval.
+    error_comp = aggregate_match_errors(fcas4s, scada_elements)
 
     # Sort the comparisons based on aggregate error.
     error_comp = error_comp.sort_values("ERROR")
@@ -153,6 +128,114 @@ def fcas4s_scada_match(
     return best_matches_scada
 
 
+# Most rows of fcas x scada element comparisons built at once by
+# aggregate_match_errors.
+FCAS_MATCH_BATCH_ROWS = 5_000_000
+
+
+def aggregate_match_errors(fcas4s, scada_elements, batch_rows=None):
+    """
+    For every scada element (MARKETNAME) and fcas element
+    (ELEMENTNUMBER) pair, the total over 5 min intervals of SCADAVALUE
+    and of the absolute ERROR between it and the fcas VALUE that best
+    matches it in the interval.
+
+    Joining every fcas element to every scada element on timestamp gives
+    elements x markets rows per interval, so the join is built for a
+    batch of intervals at a time, of at most batch_rows rows (an
+    interval bigger than that is a batch of its own), and each batch is
+    reduced to its per pair totals before the next is built.
+
+    Args:
+        fcas4s (pd.DataFrame): TIMESTAMP, ELEMENTNUMBER and VALUE
+        scada_elements (pd.DataFrame): SETTLEMENTDATE, MARKETNAME and
+            SCADAVALUE
+        batch_rows (int): defaults to FCAS_MATCH_BATCH_ROWS
+
+    Returns:
+        pd.DataFrame: MARKETNAME, ELEMENTNUMBER, SCADAVALUE and ERROR,
+        sorted by MARKETNAME and ELEMENTNUMBER.
+    """
+    if batch_rows is None:
+        batch_rows = FCAS_MATCH_BATCH_ROWS
+    fcas4s = fcas4s.sort_values("TIMESTAMP", kind="stable")
+    scada_elements = scada_elements.sort_values("SETTLEMENTDATE", kind="stable")
+    fcas_times = fcas4s["TIMESTAMP"].to_numpy()
+    scada_times = scada_elements["SETTLEMENTDATE"].to_numpy()
+
+    intervals, fcas_counts = np.unique(fcas_times, return_counts=True)
+    scada_counts = np.searchsorted(scada_times, intervals, "right") - np.searchsorted(
+        scada_times, intervals, "left"
+    )
+    batch_ends = _batch_ends(fcas_counts * scada_counts, batch_rows)
+
+    totals = []
+    batch_start = 0
+    for batch_end in batch_ends:
+        first, last = intervals[batch_start], intervals[batch_end - 1]
+        fcas_batch = fcas4s.iloc[
+            np.searchsorted(fcas_times, first, "left"):np.searchsorted(fcas_times, last, "right")
+        ]
+        scada_batch = scada_elements.iloc[
+            np.searchsorted(scada_times, first, "left"):np.searchsorted(scada_times, last, "right")
+        ]
+        batch_start = batch_end
+        if scada_batch.empty:
+            continue
+        profile_comp = pd.merge(
+            fcas_batch, scada_batch, "inner", left_on="TIMESTAMP", right_on="SETTLEMENTDATE"
+        )
+
+        # Calculate the error between each measurement.
+        profile_comp["ERROR"] = (profile_comp["VALUE"] - profile_comp["SCADAVALUE"]).abs()
+
+        # Choose the fcas values that best matches the scada value during the 5 min interval.
+        profile_comp = profile_comp.sort_values("ERROR")
+        error_comp = profile_comp.groupby(
+            ["MARKETNAME", "ELEMENTNUMBER", "TIMESTAMP"], as_index=False
+        ).first()
+        totals.append(
+            error_comp.groupby(["MARKETNAME", "ELEMENTNUMBER"], as_index=False)[
+                ["SCADAVALUE", "ERROR"]
+            ].sum()
+        )
+        # Folded together now and then, so the partial totals don't
+        # outgrow a batch.
+        if len(totals) > 1 and sum(len(total) for total in totals) > batch_rows:
+            totals = [_sum_match_errors(totals)]
+
+    if not totals:
+        return pd.DataFrame(
+            {
+                "MARKETNAME": scada_elements["MARKETNAME"].iloc[:0],
+                "ELEMENTNUMBER": fcas4s["ELEMENTNUMBER"].iloc[:0],
+                "SCADAVALUE": pd.Series(dtype="float64"),
+                "ERROR": pd.Series(dtype="float64"),
+            }
+        )
+    return _sum_match_errors(totals)
+
+
+def _sum_match_errors(totals):
+    return pd.concat(totals).groupby(["MARKETNAME", "ELEMENTNUMBER"], as_index=False).sum()
+
+
+def _batch_ends(rows_per_interval, batch_rows):
+    """The index after the last interval of each batch of consecutive
+    intervals whose rows add up to no more than batch_rows (or a single
+    interval if it alone is over)."""
+    ends = []
+    rows = 0
+    for index, interval_rows in enumerate(rows_per_interval):
+        if rows > 0 and rows + interval_rows > batch_rows:
+            ends.append(index)
+            rows = 0
+        rows += interval_rows
+    if len(rows_per_interval) > 0:
+        ends.append(len(rows_per_interval))
+    return ends
+
+
 def capacity_factor(capacity_and_scada_grouped):
     scada_data = np.where(
         capacity_and_scada_grouped["SCADAVALUE"].isnull(),
@@ -252,17 +335,100 @@ def stats_for_group(capacity_and_scada_grouped):
 
 
 def stats_by_month_and_plant(capacity_and_scada):
+    """
+    The stats_for_group statistics for every month and DUID, one row
+    each, sorted by month and DUID.
+
+    Computed with named groupby aggregations over per-row columns, keyed
+    on integer group numbers, rather than calling stats_for_group on
+    each group. The row at nodal peak and the top decile of intervals by
+    nodal demand come from a single stable sort by demand (highest
+    first, missing demand last), so ties are broken by row order: the
+    first row with the highest demand, as idxmax picks, and the earliest
+    rows among equal demands at the decile boundary.
+    """
     # - timedelta(seconds=1)
     capacity_and_scada["effective_set_date"] = capacity_and_scada["SETTLEMENTDATE"]
-    capacity_and_scada["MONTH"] = (
-        capacity_and_scada["effective_set_date"].dt.year.astype(str)
-        + "-"
-        + capacity_and_scada["effective_set_date"].dt.month.astype(str).str.zfill(2)
+    # Formatted once per month rather than once per row.
+    month_codes, months = pd.factorize(
+        capacity_and_scada["effective_set_date"].dt.to_period("M"), sort=True
+    )
+    months = np.asarray(months.strftime("%Y-%m"), dtype=object)
+    capacity_and_scada["MONTH"] = pd.Series(
+        months.take(month_codes), index=capacity_and_scada.index
+    ).where(month_codes >= 0)
+
+    duid_codes, duids = pd.factorize(capacity_and_scada["DUID"], sort=True)
+    group = np.where(
+        (month_codes >= 0) & (duid_codes >= 0),
+        month_codes * len(duids) + duid_codes,
+        -1,
+    )
+    scada = capacity_and_scada["SCADAVALUE"]
+    data = pd.DataFrame(
+        {
+            "GROUP": group,
+            "CAPACITY_FACTOR": (
+                scada.fillna(0.0) / capacity_and_scada["MAXCAPACITY"]
+            ).to_numpy(),
+            "SCADAVALUE": scada.to_numpy(),
+            "TRADING_TOTALCLEARED": capacity_and_scada["TRADING_TOTALCLEARED"].to_numpy(),
+            "TRADING_CASH": (
+                capacity_and_scada["TRADING_TOTALCLEARED"]
+                * capacity_and_scada["TRADING_RRP"]
+            ).to_numpy(),
+            "DISPATCH_CASH": (scada * capacity_and_scada["DISPATCH_RRP"]).to_numpy(),
+            "TOTALDEMAND": capacity_and_scada["TOTALDEMAND"].to_numpy(),
+        }
+    )
+    data = data[data["GROUP"] >= 0]
+
+    # Rank of each row within its group by nodal demand, highest first:
+    # a stable sort by descending demand (NaN, negated or not, sorts
+    # last), regrouped by sorting (group, position in that order) packed
+    # into one integer, then each row's offset from its group's start.
+    group = data["GROUP"].to_numpy()
+    by_demand = np.argsort(
+        -data["TOTALDEMAND"].to_numpy(dtype="float64"), kind="stable"
+    )
+    position_bits = max(int(len(data)).bit_length(), 1)
+    order = np.sort((group[by_demand].astype(np.int64) << position_bits) | np.arange(len(data)))
+    order = by_demand[order & ((1 << position_bits) - 1)]
+    group_sizes = np.bincount(group)
+    group_starts = np.cumsum(group_sizes) - group_sizes
+    demand_rank = np.empty(len(data), dtype=np.intp)
+    demand_rank[order] = np.arange(len(data)) - group_starts[group[order]]
+    rows_in_top_decile = np.ceil(group_sizes[group] / 10)
+    data["PEAK_CAPACITY_FACTOR"] = data["CAPACITY_FACTOR"].where(demand_rank == 0)
+    data["TOP_DECILE_CAPACITY_FACTOR"] = data["CAPACITY_FACTOR"].where(
+        demand_rank < rows_in_top_decile
+    )
+
+    stats = data.groupby("GROUP").agg(
+        CapacityFactor=("CAPACITY_FACTOR", "mean"),
+        SCADA_TOTAL=("SCADAVALUE", "sum"),
+        TRADING_CASH=("TRADING_CASH", "sum"),
+        TRADING_VOLUME=("TRADING_TOTALCLEARED", "sum"),
+        DISPATCH_CASH=("DISPATCH_CASH", "sum"),
+        NodalPeakCapacityFactor=("PEAK_CAPACITY_FACTOR", "max"),
+        Nodal90thPercentileCapacityFactor=("TOP_DECILE_CAPACITY_FACTOR", "mean"),
+    )
+    group = stats.index.to_numpy()
+    return pd.DataFrame(
+        {
+            "Month": months.take(group // len(duids)),
+            "DUID": np.asarray(duids, dtype=object).take(group % len(duids)),
+            "CapacityFactor": stats["CapacityFactor"].to_numpy(),
+            # Assumes 5 min Scada data
+            "Volume": stats["SCADA_TOTAL"].to_numpy() / 12,
+            "TRADING_VWAP": (stats["TRADING_CASH"] / stats["TRADING_VOLUME"]).to_numpy(),
+            "DISPATCH_VWAP": (stats["DISPATCH_CASH"] / stats["SCADA_TOTAL"]).to_numpy(),
+            "NodalPeakCapacityFactor": stats["NodalPeakCapacityFactor"].to_numpy(),
+            "Nodal90thPercentileCapacityFactor": stats[
+                "Nodal90thPercentileCapacityFactor"
+            ].to_numpy(),
+        }
     )
-    capacity_factors = capacity_and_scada.groupby(
-        ["MONTH", "DUID"], as_index=False
-    ).apply(stats_for_group, include_groups=False)
-    return capacity_factors
 
 
 def merge_tables_for_plant_stats(
@@ -399,6 +565,77 @@ def calc_trading_price(dispatch_price):
     return dispatch_price
 
 
+def fill_missing_scada_intervals(scada, timeseries_df):
+    """
+    One row per DUID for every interval in timeseries_df, with SCADAVALUE
+    0.0 where the unit has no SCADA record. DUIDs come out in sorted
+    order, each with its intervals in timeseries_df order, and SCADA
+    records at times not in timeseries_df are dropped.
+
+    Each SCADA record is given its row number in the DUID x interval grid
+    and every column is built with a single take onto the grid, rather
+    than merging each unit's SCADA onto timeseries_df in turn.
+    """
+    columns = ["SETTLEMENTDATE"] + [
+        col for col in scada.columns if col != "SETTLEMENTDATE"
+    ]
+    intervals = pd.Index(timeseries_df["SETTLEMENTDATE"])
+    duid_codes, duids = pd.factorize(scada["DUID"], sort=True)
+    if not intervals.is_unique:
+        return _fill_missing_scada_intervals_by_merge(scada, timeseries_df, duids, columns)
+    interval_positions = _interval_positions(intervals, scada["SETTLEMENTDATE"])
+    on_grid = np.flatnonzero((duid_codes >= 0) & (interval_positions >= 0))
+    grid_size = len(duids) * len(intervals)
+    grid_rows = duid_codes[on_grid] * len(intervals) + interval_positions[on_grid]
+    if len(grid_rows) > 0 and np.bincount(grid_rows, minlength=grid_size).max() > 1:
+        return _fill_missing_scada_intervals_by_merge(scada, timeseries_df, duids, columns)
+    source_rows = np.full(grid_size, -1, dtype=np.intp)
+    source_rows[grid_rows] = on_grid
+    filled = pd.DataFrame(
+        {
+            col: scada[col].array.take(source_rows, allow_fill=True)
+            for col in columns
+            if col not in ("SETTLEMENTDATE", "DUID")
+        }
+    )
+    filled.insert(0, "SETTLEMENTDATE", np.tile(intervals.to_numpy(), len(duids)))
+    filled.insert(1, "DUID", np.repeat(np.asarray(duids), len(intervals)))
+    filled["SCADAVALUE"] = np.where(
+        filled["SCADAVALUE"].isnull(), 0.0, filled["SCADAVALUE"]
+    )
+    return filled.loc[:, columns]
+
+
+def _interval_positions(intervals, times):
+    """The position of each of times in intervals (which are unique), or
+    -1 if it isn't one of them."""
+    if not intervals.is_monotonic_increasing:
+        return intervals.get_indexer(times)
+    times = times.to_numpy()
+    positions = intervals.searchsorted(times)
+    found = positions < len(intervals)
+    found[found] = intervals.to_numpy()[positions[found]] == times[found]
+    return np.where(found, positions, -1)
+
+
+def _fill_missing_scada_intervals_by_merge(scada, timeseries_df, duids, columns):
+    """fill_missing_scada_intervals for SCADA with more than one record
+    per DUID and interval (or repeated intervals), where every matching
+    pair needs keeping."""
+    intervals = timeseries_df["SETTLEMENTDATE"].to_numpy()
+    grid = pd.DataFrame(
+        {
+            "SETTLEMENTDATE": np.tile(intervals, len(duids)),
+            "DUID": np.repeat(np.asarray(duids), len(intervals)),
+        }
+    )
+    scada = pd.merge(grid, scada, "left", on=["SETTLEMENTDATE", "DUID"])
+    scada["SCADAVALUE"] = np.where(
+        scada["SCADAVALUE"].isnull(), 0.0, scada["SCADAVALUE"]
+    )
+    return scada.loc[:, columns]
+
+
 def plant_stats(
     start_time,
     end_time,
@@ -484,16 +721,7 @@ def plant_stats(
         region_summary, defaults.table_primary_keys["DISPATCHREGIONSUM"]
     )
 
-    scada_list = []
-    for gen in scada.groupby(["DUID"], as_index=False):
-        temp = pd.merge(timeseries_df, gen[1], "left", on="SETTLEMENTDATE")
-        temp["SCADAVALUE"] = np.where(
-            temp["SCADAVALUE"].isnull(), 0.0, temp["SCADAVALUE"]
-        )
-        temp["DUID"] = np.where(temp["DUID"].isnull(), gen[0], temp["DUID"])
-        scada_list.append(temp)
-
-    scada = pd.concat(scada_list)
+    scada = fill_missing_scada_intervals(scada, timeseries_df)
 
     trading_load = calc_trading_load(scada)
     combined_data = merge_tables_for_plant_stats(
@@ -542,16 +770,7 @@ def trading_and_dispatch_cost():
     timeseries_df.reset_index(inplace=True)
     timeseries_df.columns = ["SETTLEMENTDATE"]
 
-    scada_list = []
-    for gen in scada.groupby(["DUID"], as_index=False):
-        temp = pd.merge(timeseries_df, gen[1], "left", on="SETTLEMENTDATE")
-        temp["SCADAVALUE"] = np.where(
-            temp["SCADAVALUE"].isnull(), 0.0, temp["SCADAVALUE"]
-        )
-        temp["DUID"] = np.where(temp["DUID"].isnull(), gen[0], temp["DUID"])
-        scada_list.append(temp)
-
-    scada = pd.concat(scada_list)
+    scada = fill_missing_scada_intervals(scada, timeseries_df)
 
     dispatch_price = dynamic_data_compiler(
         "2017/01/01 00:00:00",
@@ -1,20 +1,52 @@
+import asyncio as _asyncio
 import logging
 import os as _os
-import glob as _glob
+import multiprocessing as _multiprocessing
+import uuid as _uuid
+import zipfile as _zipfile
+import functools as _functools
+import operator as _operator
 import pandas as _pd
+import pyarrow as _pa
+import pyarrow.dataset as _pa_dataset
+import pyarrow.parquet as _pq
+from collections import deque as _deque
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from contextlib import contextmanager as _contextmanager
 from datetime import datetime as _datetime, timedelta as _timedelta
+from nemosis import asof_index as _asof_index
 from nemosis import downloader as _downloader
+from nemosis import cache_manifest as _cache_manifest
+from nemosis import filters as _filters
 from nemosis.filters import filter_on_column_value as _filter_on_column_value
 from nemosis import processing_info_maps as _processing_info_maps
 from nemosis import date_generators as _date_generators
 from nemosis import defaults as _defaults
 from nemosis import query_wrappers as _query_wrappers
-from nemosis.value_parser import _infer_column_data_types
+from nemosis.mms_csv import read_mms_csv as _read_mms_csv
+from nemosis.value_parser import (
+    _concat_data_tables,
+    _decode_categorical_columns,
+    _encode_categorical_columns,
+    _infer_column_data_types,
+)
 from nemosis.date_generators import parse_datetime_py as _parse_datetime_py
 from nemosis.custom_errors import UserInputError, NoDataToReturn, DataMismatchError
 
 logger = logging.getLogger(__name__)
 
+# Rows per parquet row group in partitioned caches. Small enough that
+# row-group statistics prune a month file down to a few days of
+# dispatch data, large enough to keep per-group overhead negligible.
+_PARTITIONED_ROW_GROUP_SIZE = 100_000
+
+# Table types fetched as AEMO files holding several reports, of which
+# NEMOSIS reads one or two (see keep_all_sections).
+_MULTI_REPORT_TABLE_TYPES = (
+    "BIDDING", "DAILY_REGION_SUMMARY", "NEXT_DAY_DISPATCHLOAD", "INTERMITTENT_GEN_SCADA",
+)
+
 
 def _validate_raw_data_location(raw_data_location):
     """Validate (and create-if-needed) the user's raw_data_location.
@@ -49,6 +81,12 @@ def dynamic_data_compiler(
     keep_zip=True,
     parse_data_types=True,
     rebuild=False,
+    max_workers=None,
+    stream_from_zip=False,
+    cache_layout="flat",
+    categoricals=False,
+    keep_all_sections=False,
+    asof_snapshots=False,
     **kwargs,
 ):
     """
@@ -94,30 +132,48 @@ def dynamic_data_compiler(
         rebuild (bool): If True then cache files are rebuilt
                         (redownload, re-unzip, re-convert)
                         even if they exist already. False by default.
+        max_workers (int): If greater than 1, archives are downloaded
+                           and unzipped on a pool of this many threads
+                           ahead of the (still date-ordered) read loop.
+                           Default None downloads one archive at a time.
+        stream_from_zip (bool): If True, MMS archive CSVs are parsed
+                                straight out of the downloaded zip and
+                                never extracted to disk. Requires a
+                                feather or parquet fformat and
+                                keep_csv=False. False by default.
+        cache_layout (str): "flat" (default) keeps one cache file per
+                            AEMO archive in raw_data_location.
+                            "partitioned" writes a hive-partitioned
+                            parquet dataset instead, under
+                            table=<table_name>/year=<YYYY>/month=<MM>/,
+                            with rows sorted by date and primary key.
+                            Requires fformat='parquet'.
+        categoricals (bool): If True, identifier columns with few distinct
+                             values (DUID, REGIONID, BIDTYPE, ... see
+                             defaults.categorical_columns) are returned as
+                             pandas categoricals, which use a fraction of
+                             the memory of object strings on large
+                             queries. False by default.
+        keep_all_sections (bool): If True, the sections of AEMO's
+                                  multi-report daily files (BIDMOVE_COMPLETE,
+                                  PUBLIC_DAILY, NEXT_DAY_DISPATCH and
+                                  NEXT_DAY_INTERMITTENT_GEN_SCADA) that the
+                                  table doesn't use are also written to the
+                                  cache directory as CSVs, from the same
+                                  download (see README). False by default.
+        asof_snapshots (bool): If True, queries on tables searched from
+                               the start of the data model (DUDETAIL,
+                               GENCONDATA, ...) save and reuse as-of
+                               snapshots under nemosis_asof/ instead of
+                               reading every archive since 2015 (see
+                               README). Ignored with fformat='csv'.
+                               False by default.
         **kwargs: additional arguments passed to the pd.to_{fformat}() function
 
     Returns:
         all_data (pd.Dataframe): All data concatenated.
     """
 
-    _validate_raw_data_location(raw_data_location)
-
-    if table_name not in _defaults.dynamic_tables:
-        raise UserInputError("Table name provided is not a dynamic table.")
-
-    if fformat not in ["csv", "feather", "parquet"]:
-        raise UserInputError("Argument fformat must be 'csv', 'feather' or 'parquet'")
-
-    if select_columns == "all" and fformat != "csv":
-        raise UserInputError(
-            "If select_columns='all' is used fformat='csv' must be used."
-        )
-
-    _validate_user_select_columns(select_columns, table_name)
-    _validate_user_select_columns_includes_pk(select_columns, table_name)
-    _validate_filter_args(filter_cols, filter_values)
-    _validate_time_window(start_time, end_time)
-
     # Remember whether the user explicitly asked for columns, so we can do a
     # post-load check below. Columns inherited from defaults are allowed to
     # silently be missing from old data vintages (e.g. RAISE1SECRRP before
@@ -130,23 +186,15 @@ def dynamic_data_compiler(
         select_columns,
         date_filter,
         start_search,
-    ) = _set_up_dynamic_compilers(table_name, start_time, end_time, select_columns)
-
-    if filter_cols and not set(filter_cols).issubset(set(select_columns)):
-        raise UserInputError(
-            (
-                "Filter columns not valid. They must be a part of "
-                + "select_columns or the table defaults."
-            )
-        )
+    ) = _set_up_dynamic_query(
+        start_time, end_time, table_name, raw_data_location, select_columns,
+        filter_cols, filter_values, fformat, keep_csv, max_workers,
+        stream_from_zip, cache_layout,
+    )
 
     logger.info(f"Compiling data for table {table_name}")
 
-    # cast from string to datetime, if not already datetime
-    start_time = _parse_datetime_py(start_time, midnight='start')
-    end_time = _parse_datetime_py(end_time, midnight='end')
-    start_search = _parse_datetime_py(start_search, midnight='start')
-    data_tables = _dynamic_data_fetch_loop(
+    data_tables = _dynamic_query_data(
         start_search,
         start_time,
         end_time,
@@ -157,58 +205,407 @@ def dynamic_data_compiler(
         fformat=fformat,
         keep_csv=keep_csv,
         keep_zip=keep_zip,
+        keep_all_sections=keep_all_sections,
         rebuild=rebuild,
         write_kwargs=kwargs,
         user_select_columns=user_select_columns,
+        max_workers=max_workers,
+        stream_from_zip=stream_from_zip,
+        cache_layout=cache_layout,
+        filter_cols=filter_cols,
+        filter_values=filter_values,
+        categoricals=categoricals,
+        asof_snapshots=asof_snapshots,
     )
     if data_tables:
-        all_data = _pd.concat(data_tables, sort=False)
+        all_data = _concat_data_tables(data_tables)
+        if not categoricals:
+            # Typed caches store ID columns dictionary-encoded.
+            all_data = _decode_categorical_columns(all_data)
         finalise_data = _processing_info_maps.finalise[table_name]
         if finalise_data is not None:
             for function in finalise_data:
                 all_data = function(all_data, start_time, table_name)
 
-        if parse_data_types:
-            all_data = _infer_column_data_types(all_data)
-        if filter_cols is not None:
-            if not set(filter_cols).issubset(set(all_data.columns)):
-                missing_columns = [
-                    col for col in filter_cols if col not in all_data.columns
-                ]
-                # Was previously `UserInputError(...)` (no `raise`) — a
-                # silent no-op that returned unfiltered data. Now
-                # properly raised; mostly unreachable thanks to
-                # `_check_loaded_select_columns` below, but kept as
-                # defence in depth (e.g. filter_cols came from defaults
-                # because user passed select_columns=None, and the
-                # default filter column isn't in this AEMO file
-                # vintage).
-                raise UserInputError(
-                    f"Filter columns {missing_columns} not in data for "
-                    f"table {table_name}. Available columns: "
-                    f"{sorted(all_data.columns)}."
-                )
-            else:
-                all_data = _filter_on_column_value(
-                    all_data, filter_cols, filter_values
-                )
-        _check_loaded_select_columns(all_data, user_select_columns, table_name)
-        # Reset index so callers can do .loc[0] / .iloc[0] on the returned
-        # DataFrame; without this, rows carry the indices from the underlying
-        # parquet/feather/CSV (e.g. 20162, 20167, ...).
-        all_data = all_data.reset_index(drop=True)
+        all_data = _type_and_filter_data(
+            all_data, table_name, parse_data_types, filter_cols, filter_values,
+            user_select_columns,
+        )
         logger.info(f"Returning {table_name}.")
         return all_data
     else:
-        raise NoDataToReturn(
+        raise _no_data_to_return(table_name)
+
+
+def iter_dynamic_data(
+    start_time,
+    end_time,
+    table_name,
+    raw_data_location,
+    select_columns=None,
+    filter_cols=None,
+    filter_values=None,
+    fformat="parquet",
+    keep_csv=False,
+    keep_zip=True,
+    parse_data_types=True,
+    rebuild=False,
+    max_workers=None,
+    stream_from_zip=False,
+    cache_layout="flat",
+    categoricals=False,
+    keep_all_sections=False,
+    asof_snapshots=False,
+    **kwargs,
+):
+    """
+    Generator version of dynamic_data_compiler: downloads and reads the
+    same data, but yields it one AEMO file (or file chunk) at a time
+    instead of concatenating everything, so long queries can be
+    aggregated or written out without holding the whole result in
+    memory.
+
+    Each yielded DataFrame has had the date window, column selection,
+    type parsing and column filters applied, exactly as
+    dynamic_data_compiler applies them. The table's finalise functions
+    are applied as the data arrives (see
+    `query_wrappers.IncrementalFinalise`), so concatenating every frame
+    gives the same rows as dynamic_data_compiler. For tables that keep
+    the most recent record from before start_time (e.g. DUDETAILSUMMARY),
+    those records are held back and yielded last. Frames left empty by
+    the filters are skipped.
+
+    Columns not in defaults.column_types have their type inferred per
+    frame, so (unlike dynamic_data_compiler) such a column can come back
+    as int64 in one frame and float64 in another.
+
+    Args:
+        Same as dynamic_data_compiler.
+
+    Yields:
+        data (pd.DataFrame): the data from one file, with a fresh
+            RangeIndex.
+
+    Raises:
+        UserInputError: straight away, for invalid arguments.
+        NoDataToReturn: once the generator is exhausted, if no file
+            could be read at all.
+    """
+    user_select_columns = select_columns
+
+    (
+        start_time,
+        end_time,
+        select_columns,
+        date_filter,
+        start_search,
+    ) = _set_up_dynamic_query(
+        start_time, end_time, table_name, raw_data_location, select_columns,
+        filter_cols, filter_values, fformat, keep_csv, max_workers,
+        stream_from_zip, cache_layout,
+    )
+
+    logger.info(f"Streaming data for table {table_name}")
+
+    data_tables = _iter_dynamic_query_data(
+        start_search,
+        start_time,
+        end_time,
+        table_name,
+        raw_data_location,
+        select_columns,
+        date_filter,
+        fformat=fformat,
+        keep_csv=keep_csv,
+        keep_zip=keep_zip,
+        keep_all_sections=keep_all_sections,
+        rebuild=rebuild,
+        write_kwargs=kwargs,
+        user_select_columns=user_select_columns,
+        max_workers=max_workers,
+        stream_from_zip=stream_from_zip,
+        cache_layout=cache_layout,
+        filter_cols=filter_cols,
+        filter_values=filter_values,
+        categoricals=categoricals,
+        asof_snapshots=asof_snapshots,
+    )
+    # Returned rather than yielded from, so argument errors are raised
+    # by the call instead of by the first next().
+    return _iter_finalised_data(
+        data_tables, start_time, table_name, parse_data_types, filter_cols,
+        filter_values, user_select_columns, categoricals,
+    )
+
+
+def _iter_finalised_data(
+    data_tables, start_time, table_name, parse_data_types, filter_cols,
+    filter_values, user_select_columns, categoricals,
+):
+    """The iter_dynamic_data generator: each frame from the fetch loop
+    put through the finalise functions and _type_and_filter_data."""
+    finalise = _query_wrappers.IncrementalFinalise(
+        _processing_info_maps.finalise[table_name], start_time, table_name
+    )
+    any_data = False
+    for data in data_tables:
+        any_data = True
+        if not categoricals:
+            data = _decode_categorical_columns(data)
+        yield from _type_and_filter_chunk(
+            finalise.update(data), table_name, parse_data_types, filter_cols,
+            filter_values, user_select_columns,
+        )
+    if not any_data:
+        raise _no_data_to_return(table_name)
+    yield from _type_and_filter_chunk(
+        finalise.flush(), table_name, parse_data_types, filter_cols,
+        filter_values, user_select_columns,
+    )
+
+
+def _dynamic_query_data(*args, **kwargs):
+    """The frames from `_iter_dynamic_query_data`, as a list."""
+    return list(_iter_dynamic_query_data(*args, **kwargs))
+
+
+def _iter_dynamic_query_data(
+    start_search,
+    start_time,
+    end_time,
+    table_name,
+    raw_data_location,
+    select_columns,
+    date_filter,
+    asof_snapshots=False,
+    **loop_kwargs,
+):
+    """
+    The frames for a dynamic_data_compiler or iter_dynamic_data query,
+    from `_iter_dynamic_data_fetch_loop`.
+
+    With `asof_snapshots`, for tables that `asof_index` covers, the
+    archives from start_search up to the month start_time falls in are
+    replaced by one as-of snapshot (see `_as_of_snapshot`), which is
+    yielded first, and only the archives from that month on are read.
+    Not used with fformat="csv", which keeps the cache free of parquet
+    files.
+    """
+    cutoff = _asof_index.cutoff_for(start_time)
+    if (
+        not asof_snapshots
+        or loop_kwargs.get("fformat", "parquet") == "csv"
+        or cutoff <= start_search
+        or not _asof_index.applies(table_name, select_columns)
+    ):
+        yield from _iter_dynamic_data_fetch_loop(
+            start_search, start_time, end_time, table_name, raw_data_location,
+            select_columns, date_filter, **loop_kwargs,
+        )
+        return
+
+    snapshot = _as_of_snapshot(
+        cutoff, start_search, table_name, raw_data_location, select_columns, loop_kwargs
+    )
+    if snapshot is not None:
+        if loop_kwargs.get("categoricals"):
+            snapshot = _encode_categorical_columns(snapshot)
+        if date_filter is not None:
+            snapshot = date_filter(snapshot, start_time, end_time)
+        yield snapshot
+    # The loop steps back a day before generating months, so this
+    # starts at the cutoff month.
+    yield from _iter_dynamic_data_fetch_loop(
+        cutoff + _timedelta(days=1), start_time, end_time, table_name,
+        raw_data_location, select_columns, date_filter, **loop_kwargs,
+    )
+
+
+def _as_of_snapshot(
+    cutoff, start_search, table_name, raw_data_location, select_columns, loop_kwargs
+):
+    """
+    The table's as-of snapshot at `cutoff` (see
+    `asof_index.reduce_to_snapshot`), or None if there is no data
+    before it.
+
+    A saved snapshot is read if there is one for this cutoff. Otherwise
+    the snapshot is built from the nearest earlier one (or from
+    start_search) plus the archives in between. It is only saved if
+    every one of those archives was read and the cutoff is outside
+    AEMO's publication lag (see `asof_index.past_publication_lag`), so
+    a month that is missing now can't be left out of later queries.
+    """
+    index = _asof_index.AsOfIndex(raw_data_location, table_name, select_columns)
+    latest = None if loop_kwargs.get("rebuild") else index.latest(cutoff)
+    chunks = []
+    if latest is not None:
+        snapshot_cutoff, path = latest
+        if snapshot_cutoff == cutoff:
+            return _pd.read_parquet(path)
+        chunks.append(_pd.read_parquet(path))
+        start_search = snapshot_cutoff + _timedelta(days=1)
+
+    # No date filter or column filters, so the snapshot also holds the
+    # records later queries need (e.g. those dated after this query's
+    # end). The empty window keeps these months out of the loop's
+    # coverage summary, as they are for the full scan.
+    loop_kwargs = {**loop_kwargs, "filter_cols": None, "filter_values": None}
+    loaded_periods = set()
+    chunks.extend(
+        _iter_dynamic_data_fetch_loop(
+            start_search, cutoff, cutoff - _timedelta(seconds=1), table_name,
+            raw_data_location, select_columns, None,
+            loaded_periods=loaded_periods, **loop_kwargs,
+        )
+    )
+    if not chunks:
+        return None
+    snapshot = _asof_index.reduce_to_snapshot(
+        _concat_data_tables(chunks), table_name, cutoff
+    ).reset_index(drop=True)
+
+    missing = [
+        f"{year}/{month}"
+        for year, month in _asof_index.months_between(start_search, cutoff)
+        if (year, month) not in loaded_periods
+    ]
+    if missing:
+        logger.info(
+            f"Not saving the {table_name} as-of snapshot for {cutoff:%Y/%m}: "
+            f"no data for {', '.join(missing)}."
+        )
+    elif not _asof_index.past_publication_lag(cutoff):
+        logger.info(
+            f"Not saving the {table_name} as-of snapshot for {cutoff:%Y/%m}: "
+            f"the archives before it may not all be published yet."
+        )
+    else:
+        _write_to_format(snapshot, "parquet", index.path(cutoff), {})
+    return snapshot
+
+
+def _type_and_filter_chunk(
+    data, table_name, parse_data_types, filter_cols, filter_values, user_select_columns
+):
+    """_type_and_filter_data for one iter_dynamic_data frame, yielding
+    nothing if the frame is (or ends up) empty."""
+    if data is None or data.empty:
+        return
+    data = _type_and_filter_data(
+        data, table_name, parse_data_types, filter_cols, filter_values,
+        user_select_columns,
+    )
+    if not data.empty:
+        yield data
+
+
+def _set_up_dynamic_query(
+    start_time, end_time, table_name, raw_data_location, select_columns,
+    filter_cols, filter_values, fformat, keep_csv, max_workers,
+    stream_from_zip, cache_layout,
+):
+    """
+    Argument validation and set up shared by dynamic_data_compiler and
+    iter_dynamic_data.
+
+    Returns: start_time, end_time, select_columns, date_filter,
+        start_search, as _set_up_dynamic_compilers does but with the
+        times as datetimes.
+    """
+    _validate_raw_data_location(raw_data_location)
+
+    if table_name not in _defaults.dynamic_tables:
+        raise UserInputError("Table name provided is not a dynamic table.")
+
+    if fformat not in ["csv", "feather", "parquet"]:
+        raise UserInputError("Argument fformat must be 'csv', 'feather' or 'parquet'")
+
+    if select_columns == "all" and fformat != "csv":
+        raise UserInputError(
+            "If select_columns='all' is used fformat='csv' must be used."
+        )
+
+    _validate_user_select_columns(select_columns, table_name)
+    _validate_user_select_columns_includes_pk(select_columns, table_name)
+    _validate_filter_args(filter_cols, filter_values)
+    _validate_time_window(start_time, end_time)
+    _validate_worker_count(max_workers, "max_workers")
+    _validate_stream_from_zip(stream_from_zip, fformat, keep_csv)
+    _validate_cache_layout(cache_layout, fformat)
+
+    (
+        start_time,
+        end_time,
+        select_columns,
+        date_filter,
+        start_search,
+    ) = _set_up_dynamic_compilers(table_name, start_time, end_time, select_columns)
+
+    if filter_cols and not set(filter_cols).issubset(set(select_columns)):
+        raise UserInputError(
             (
-                f"Compiling data for table {table_name} failed. "
-                + "This probably because none of the requested data "
-                + "could be download from AEMO. Check your internet "
-                + "connection and that the requested data is archived on: "
-                + "https://nemweb.com.au see nemosis.defaults for table specific urls."
+                "Filter columns not valid. They must be a part of "
+                + "select_columns or the table defaults."
+            )
+        )
+
+    # cast from string to datetime, if not already datetime
+    start_time = _parse_datetime_py(start_time, midnight='start')
+    end_time = _parse_datetime_py(end_time, midnight='end')
+    start_search = _parse_datetime_py(start_search, midnight='start')
+    return start_time, end_time, select_columns, date_filter, start_search
+
+
+def _type_and_filter_data(
+    all_data, table_name, parse_data_types, filter_cols, filter_values, user_select_columns
+):
+    """
+    The steps dynamic_data_compiler applies after the finalise functions:
+    type parsing, column-value filters, the check that user-selected
+    columns were found, and a fresh index.
+    """
+    if parse_data_types:
+        all_data = _infer_column_data_types(all_data, table_name)
+    if filter_cols is not None:
+        if not set(filter_cols).issubset(set(all_data.columns)):
+            missing_columns = [
+                col for col in filter_cols if col not in all_data.columns
+            ]
+            # Was previously `UserInputError(...)` (no `raise`) — a
+            # silent no-op that returned unfiltered data. Now
+            # properly raised; mostly unreachable thanks to
+            # `_check_loaded_select_columns` below, but kept as
+            # defence in depth (e.g. filter_cols came from defaults
+            # because user passed select_columns=None, and the
+            # default filter column isn't in this AEMO file
+            # vintage).
+            raise UserInputError(
+                f"Filter columns {missing_columns} not in data for "
+                f"table {table_name}. Available columns: "
+                f"{sorted(all_data.columns)}."
+            )
+        else:
+            all_data = _filter_on_column_value(
+                all_data, filter_cols, filter_values
             )
+    _check_loaded_select_columns(all_data, user_select_columns, table_name)
+    # Reset index so callers can do .loc[0] / .iloc[0] on the returned
+    # DataFrame; without this, rows carry the indices from the underlying
+    # parquet/feather/CSV (e.g. 20162, 20167, ...).
+    return all_data.reset_index(drop=True)
+
+
+def _no_data_to_return(table_name):
+    return NoDataToReturn(
+        (
+            f"Compiling data for table {table_name} failed. "
+            + "This probably because none of the requested data "
+            + "could be download from AEMO. Check your internet "
+            + "connection and that the requested data is archived on: "
+            + "https://nemweb.com.au see nemosis.defaults for table specific urls."
         )
+    )
 
 
 def cache_compiler(
@@ -221,6 +618,12 @@ def cache_compiler(
     rebuild=False,
     keep_csv=False,
     keep_zip=True,
+    max_workers=None,
+    n_processes=None,
+    stream_from_zip=False,
+    cache_layout="flat",
+    categoricals=True,
+    keep_all_sections=False,
     **kwargs,
 ):
     """
@@ -263,6 +666,42 @@ def cache_compiler(
                          re-download from AEMO (see #56). Set False
                          for a leaner cache when re-download cost is
                          not a concern.
+        max_workers (int): If greater than 1, archives are downloaded
+                           and unzipped on a pool of this many threads
+                           ahead of the (still date-ordered) conversion
+                           loop. Default None downloads one archive at
+                           a time.
+        n_processes (int): If greater than 1, downloaded CSVs are parsed,
+                           typed and written to feather/parquet on a pool
+                           of this many processes, with downloads
+                           waiting once 2 * n_processes conversions are
+                           queued. Default None converts on the calling
+                           process. Scripts using this
+                           should guard their entry point with
+                           `if __name__ == "__main__":`.
+        stream_from_zip (bool): If True, MMS archive CSVs are parsed
+                                straight out of the downloaded zip and
+                                never extracted to disk. Requires
+                                keep_csv=False. False by default.
+        cache_layout (str): "flat" (default) keeps one cache file per
+                            AEMO archive in raw_data_location.
+                            "partitioned" writes a hive-partitioned
+                            parquet dataset instead, under
+                            table=<table_name>/year=<YYYY>/month=<MM>/,
+                            with rows sorted by date and primary key.
+                            Requires fformat='parquet'.
+        categoricals (bool): If True (default), identifier columns with
+                             few distinct values (see
+                             defaults.categorical_columns) are stored
+                             dictionary-encoded. dynamic_data_compiler
+                             returns them as strings unless it is called
+                             with categoricals=True.
+        keep_all_sections (bool): If True, the sections of AEMO's
+                                  multi-report daily files that the table
+                                  doesn't use are also written to the cache
+                                  directory as CSVs, from the same download.
+                                  See dynamic_data_compiler. False by
+                                  default.
         **kwargs: additional arguments passed to the pd.to_{fformat}() function
 
     Returns:
@@ -288,6 +727,10 @@ def cache_compiler(
     _validate_user_select_columns(select_columns, table_name)
     _validate_user_select_columns_includes_pk(select_columns, table_name)
     _validate_time_window(start_time, end_time)
+    _validate_worker_count(max_workers, "max_workers")
+    _validate_worker_count(n_processes, "n_processes")
+    _validate_stream_from_zip(stream_from_zip, fformat, keep_csv)
+    _validate_cache_layout(cache_layout, fformat)
 
     user_select_columns = select_columns
 
@@ -304,23 +747,76 @@ def cache_compiler(
     end_time = _parse_datetime_py(end_time, midnight='end')
     start_search = _parse_datetime_py(start_search, midnight='start')
 
-    _dynamic_data_fetch_loop(
-        start_search,
+    with _conversion_pool(n_processes) as conversion_pool:
+        _dynamic_data_fetch_loop(
+            start_search,
+            start_time,
+            end_time,
+            table_name,
+            raw_data_location,
+            select_columns,
+            date_filter=None,
+            fformat=fformat,
+            keep_csv=keep_csv,
+            keep_zip=keep_zip,
+            keep_all_sections=keep_all_sections,
+            caching_mode=True,
+            rebuild=rebuild,
+            write_kwargs=kwargs,
+            user_select_columns=user_select_columns,
+            max_workers=max_workers,
+            conversion_pool=conversion_pool,
+            stream_from_zip=stream_from_zip,
+            cache_layout=cache_layout,
+            categoricals=categoricals,
+            # Bounded like the downloads in _prefetch_downloads.
+            max_pending_conversions=2 * (n_processes or 1),
+        )
+    return
+
+
+async def async_dynamic_data_compiler(
+    start_time, end_time, table_name, raw_data_location, **kwargs
+):
+    """
+    Awaitable dynamic_data_compiler, taking the same arguments. The query
+    runs on a worker thread (its downloads on a further pool of
+    max_workers threads, if given), so the event loop is free while AEMO
+    is waited on. Downloads share the module-wide requests session, and
+    downloader.MAX_CONNECTIONS_PER_HOST caps how many requests all
+    queries running at once make to one host.
+
+    Cancelling the awaiting task does not stop a query already running;
+    it finishes in the background and its result is discarded.
+
+    Returns:
+        all_data (pd.Dataframe): All data concatenated.
+    """
+    return await _asyncio.to_thread(
+        dynamic_data_compiler,
         start_time,
         end_time,
         table_name,
         raw_data_location,
-        select_columns,
-        date_filter=None,
-        fformat=fformat,
-        keep_csv=keep_csv,
-        keep_zip=keep_zip,
-        caching_mode=True,
-        rebuild=rebuild,
-        write_kwargs=kwargs,
-        user_select_columns=user_select_columns,
+        **kwargs,
+    )
+
+
+async def async_cache_compiler(
+    start_time, end_time, table_name, raw_data_location, **kwargs
+):
+    """
+    Awaitable cache_compiler, taking the same arguments. See
+    async_dynamic_data_compiler.
+    """
+    return await _asyncio.to_thread(
+        cache_compiler,
+        start_time,
+        end_time,
+        table_name,
+        raw_data_location,
+        **kwargs,
     )
-    return
 
 
 def static_table(
@@ -330,6 +826,7 @@ def static_table(
     filter_cols=None,
     filter_values=None,
     update_static_file=False,
+    max_age=None,
 ):
     """
     Downloads and compiles data for all static tables.
@@ -348,6 +845,13 @@ def static_table(
         update_static_file (bool): If True download latest version of file
                                    even if a version already exists.
                                    Default is False.
+        max_age (int, float or timedelta): If given, a cached file last
+                                   downloaded or checked longer ago than
+                                   this (in seconds) is checked with AEMO
+                                   using a conditional request, and only
+                                   downloaded again if it has changed. 0
+                                   checks on every call. Default is None,
+                                   never check.
 
     Returns:
         data (pd.Dataframe)
@@ -377,6 +881,7 @@ def static_table(
     _validate_user_select_columns(select_columns, table_name)
     _validate_user_select_columns_includes_pk(select_columns, table_name)
     _validate_filter_args(filter_cols, filter_values)
+    max_age = _validate_max_age(max_age)
 
     # Remember whether the user explicitly asked for columns, so we can
     # enforce strict membership after the file is loaded. Defaults-
@@ -397,22 +902,48 @@ def static_table(
 
     logger.info(f"Retrieving static table {table_name}")
     path_and_name = _os.path.join(raw_data_location, _defaults.names[table_name])
-    if not _os.path.isfile(path_and_name) or update_static_file:
-        logger.info(f"Downloading data for table {table_name}")
+    cached = _os.path.isfile(path_and_name)
+    revalidate = (
+        cached
+        and not update_static_file
+        and max_age is not None
+        and _downloader.seconds_since_validated(path_and_name) >= max_age
+    )
+    if not cached or update_static_file or revalidate:
+        logger.info(
+            f"{'Checking' if revalidate else 'Downloading'} data for table {table_name}"
+        )
         try:
+            # Always revalidate=True so the file's ETag / Last-Modified are
+            # kept for the next check; it only makes the request
+            # conditional when the file is cached and not being forced.
             static_downloader_map[table_name](
-                _defaults.static_table_url[table_name], path_and_name
+                _defaults.static_table_url[table_name],
+                path_and_name,
+                force_redo=update_static_file,
+                revalidate=True,
             )
-        except Exception:
-            raise NoDataToReturn(
-                (
-                    f"Compiling data for table {table_name} failed. "
-                    + "This probably because none of the requested data "
-                    + "could be download from AEMO. Check your internet "
-                    + "connection and that the requested data is archived on: "
-                    + "https://nemweb.com.au see nemosis.defaults for table specific urls."
+        except Exception as e:
+            # The download goes to a .part file, so a failed max_age check
+            # leaves the cached copy intact; better stale than nothing
+            # while AEMO is unreachable. A forced refresh, or an error
+            # that won't go away (e.g. a 404 after AEMO moves the file),
+            # still fails.
+            if revalidate and _downloader._is_transient(e):
+                logger.warning(
+                    f"Could not check for a newer {table_name} with AEMO ({e}), "
+                    f"using the cached copy {path_and_name}"
+                )
+            else:
+                raise NoDataToReturn(
+                    (
+                        f"Compiling data for table {table_name} failed. "
+                        + "This probably because none of the requested data "
+                        + "could be download from AEMO. Check your internet "
+                        + "connection and that the requested data is archived on: "
+                        + "https://nemweb.com.au see nemosis.defaults for table specific urls."
+                    )
                 )
-            )
 
     table = static_file_reader_map[table_name](path_and_name, table_name)
 
@@ -474,6 +1005,194 @@ def static_table(
     return table
 
 
+def _read_cache_file(
+    full_filename,
+    fformat,
+    table_name,
+    select_columns,
+    date_filter,
+    start_time,
+    end_time,
+    filter_cols=None,
+    filter_values=None,
+):
+    """
+    Read a feather or parquet cache file, loading only what the fetch
+    loop and dynamic_data_compiler can go on to use.
+
+    Columns are limited to select_columns plus the table's date columns
+    (for date_filter) and filter_cols. For parquet, a predicate built
+    by `_cache_pushdown_filter` is also pushed into the read, so row
+    groups outside the query window (by their column statistics) are
+    skipped and non-matching rows dropped during the scan. The predicate
+    is never stricter than the pandas filters, which still run on the
+    result, so the returned data is unchanged — only smaller reads.
+    """
+    if fformat == "parquet":
+        schema = _pq.read_schema(full_filename)
+    else:
+        with _pa.memory_map(full_filename) as source:
+            schema = _pa.ipc.open_file(source).schema
+
+    if select_columns == "all":
+        columns = None
+    else:
+        needed = set(select_columns)
+        needed.update(_processing_info_maps.date_cols[table_name] or [])
+        needed.update(filter_cols or [])
+        columns = [column for column in schema.names if column in needed]
+
+    if fformat == "feather":
+        return _pd.read_feather(full_filename, columns=columns)
+
+    pushdown_filter = _cache_pushdown_filter(
+        schema, table_name, date_filter, start_time, end_time, filter_cols, filter_values
+    )
+    return _pd.read_parquet(full_filename, columns=columns, filters=pushdown_filter)
+
+
+def _cache_pushdown_filter(
+    schema, table_name, date_filter, start_time, end_time, filter_cols, filter_values
+):
+    """
+    pyarrow expression approximating the date filter and column-value
+    filters for one cache file, or None if nothing can be pushed down.
+
+    Window bounds are loosened so they never drop a row the real filter
+    keeps: lower bounds are inclusive, and upper bounds are end_time plus
+    a second, exclusive (so "... 00:05:00.000" strings still pass).
+    String date columns are compared as "%Y/%m/%d %H:%M:%S" strings;
+    timestamp columns (typed caches) as timestamps.
+
+    Column-value filters are applied by dynamic_data_compiler after type
+    inference and the table's finalise functions, so they are only pushed
+    down when neither depends on the rows removed: the cache must be
+    typed (written by cache_compiler; inference on an all-string cache
+    sees every row), the filter must commute with finalise (see
+    `_column_filters_commute_with_finalise`), and the values' types must
+    match the stored column's type (see `_pushdown_value_set`).
+    """
+    expressions = []
+    for column, bounded_below, bounded_above in _filters.window_columns.get(date_filter, []):
+        if column not in schema.names:
+            continue
+        bounds = _window_bounds(schema.field(column).type, start_time, end_time)
+        if bounds is None:
+            continue
+        lower, upper = bounds
+        if bounded_below:
+            expressions.append(_pa_dataset.field(column) >= lower)
+        if bounded_above:
+            expressions.append(_pa_dataset.field(column) < upper)
+
+    if (
+        filter_cols
+        and _is_typed_cache(schema)
+        and _column_filters_commute_with_finalise(table_name, filter_cols)
+    ):
+        for column, values in zip(filter_cols, filter_values):
+            if values is None or column not in schema.names:
+                continue
+            value_set = _pushdown_value_set(schema.field(column).type, values)
+            if value_set is not None:
+                expressions.append(_pa_dataset.field(column).isin(value_set))
+
+    if not expressions:
+        return None
+    return _functools.reduce(_operator.and_, expressions)
+
+
+def _is_typed_cache(schema):
+    return not all(
+        _pa.types.is_string(field.type) or _pa.types.is_large_string(field.type)
+        for field in schema
+    )
+
+
+def _window_bounds(column_type, start_time, end_time):
+    upper = end_time + _timedelta(seconds=1)
+    if _pa.types.is_string(column_type) or _pa.types.is_large_string(column_type):
+        return (
+            start_time.strftime(_defaults.nemosis_date_format),
+            upper.strftime(_defaults.nemosis_date_format),
+        )
+    if _pa.types.is_timestamp(column_type) and column_type.tz is None:
+        return _pa.scalar(start_time, column_type), _pa.scalar(upper, column_type)
+    return None
+
+
+def _column_filters_commute_with_finalise(table_name, filter_cols):
+    """True if filtering rows on filter_cols before the table's finalise
+    functions leaves the same rows as filtering after them. Filtering on
+    the columns a finalise step groups by removes whole groups, which is
+    safe; anything else (e.g. fcas4s_finalise strips strings, and an
+    ungrouped most_recent_records_before_start_time keeps one row
+    overall) is not."""
+    filter_cols = set(filter_cols)
+    for function in _processing_info_maps.finalise[table_name] or []:
+        if function is _query_wrappers.convert_genconid_effectivedate_to_datetime_format:
+            continue
+        if function is _query_wrappers.drop_duplicates_by_primary_key:
+            if filter_cols <= set(_defaults.table_primary_keys[table_name]):
+                continue
+        if function is _query_wrappers.most_recent_records_before_start_time:
+            group_cols = _defaults.effective_date_group_col[table_name]
+            if group_cols and filter_cols <= set(group_cols):
+                continue
+        return False
+    return True
+
+
+def _pushdown_value_set(column_type, values):
+    """
+    Arrow array of filter values to test a stored column against, or
+    None if the comparison could disagree with the pandas filter.
+
+    String columns (plain or dictionary-encoded) are only compared against
+    values that type inference would leave as strings (e.g. DUIDs,
+    REGIONIDs), and numeric columns against numeric values.
+    """
+    values = list(values)
+    if not values:
+        return None
+    if _pa.types.is_dictionary(column_type):
+        # ID columns in caches written with categoricals=True.
+        column_type = column_type.value_type
+    if _pa.types.is_string(column_type) or _pa.types.is_large_string(column_type):
+        if all(isinstance(value, str) and _is_plain_string(value) for value in values):
+            return _pa.array(values, _pa.string())
+    elif _pa.types.is_integer(column_type):
+        if all(_is_integer(value) for value in values):
+            try:
+                return _pa.array([int(value) for value in values], column_type)
+            except (_pa.ArrowInvalid, OverflowError):
+                return None
+    elif _pa.types.is_floating(column_type):
+        if all(_is_integer(value) or isinstance(value, float) for value in values):
+            return _pa.array([float(value) for value in values], column_type)
+    return None
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_plain_string(value):
+    """A string that type inference would leave as a string."""
+    try:
+        float(value)
+        return False
+    except ValueError:
+        pass
+    for date_format in _defaults.date_formats:
+        try:
+            _datetime.strptime(value, date_format)
+            return False
+        except ValueError:
+            pass
+    return True
+
+
 def _strip_if_string(x):
     if isinstance(x, str):
         x = x.strip()
@@ -500,24 +1219,6 @@ def _get_read_function(fformat, table_type, day):
     return func
 
 
-def _count_csv_lines(file_path):
-    with open(file_path, 'rb') as f:
-        return sum(1 for _ in f)
-
-
-def _read_mms_csv(path_and_name, dtype=None, usecols=None, nrows=None, names=None):
-    last_line_number = _count_csv_lines(path_and_name) - 1
-    data = _pd.read_csv(
-        path_and_name,
-        skiprows=[0, last_line_number],
-        dtype=dtype,
-        usecols=usecols,
-        nrows=nrows,
-        names=names,
-    )
-    return data
-
-
 def _read_constructed_csv(
     path_and_name, dtype=None, usecols=None, nrows=None, names=None
 ):
@@ -601,6 +1302,7 @@ def static_table_FCAS_elements_file(
     filter_cols=None,
     filter_values=None,
     update_static_file=False,
+    max_age=None,
 ):
     table = static_table(
         table_name,
@@ -609,6 +1311,7 @@ def static_table_FCAS_elements_file(
         filter_cols,
         filter_values,
         update_static_file,
+        max_age,
     )
     return table
 
@@ -620,6 +1323,7 @@ def static_table_xl(
     filter_cols=None,
     filter_values=None,
     update_static_file=False,
+    max_age=None,
 ):
     table = static_table(
         table_name,
@@ -628,10 +1332,42 @@ def static_table_xl(
         filter_cols,
         filter_values,
         update_static_file,
+        max_age,
     )
     return table
 
 
+def prewarm_listings(start_time, end_time, raw_data_location, max_workers=None):
+    """
+    Fetches the nemweb directory listings used when downloading data for
+    start_time to end_time into raw_data_location's listing cache, so that
+    later queries (including from new processes) can check which AEMO
+    files exist without further requests while the listings are fresh.
+    Args:
+        start_time (datetime): A native datetime. (Timezone unaware)
+                               For legacy reasons, may be a string
+                               of format 'yyyy/mm/dd HH:MM:SS'.
+        end_time (datetime):   A native datetime. (Timezone unaware)
+                               For legacy reasons, may be a string
+                               of format 'yyyy/mm/dd HH:MM:SS'.
+        raw_data_location (str): directory the listings are cached in,
+                                 the same one passed to the compilers.
+        max_workers (int): If given, listings are fetched on a pool of
+                           this many threads. Default None fetches one
+                           at a time.
+
+    Returns:
+        urls (list): the listings now cached.
+    """
+    _validate_raw_data_location(raw_data_location)
+    _validate_time_window(start_time, end_time)
+    _validate_worker_count(max_workers, "max_workers")
+    start_time = _parse_datetime_py(start_time, midnight="start")
+    end_time = _parse_datetime_py(end_time, midnight="end")
+    urls = _downloader.listing_urls(start_time, end_time)
+    return _downloader.prewarm_listings(urls, raw_data_location, max_workers)
+
+
 def _set_up_dynamic_compilers(table_name, start_time, end_time, select_columns):
     """
     Set up function for compilers that deal with dynamic data.
@@ -681,6 +1417,7 @@ def _iteration_overlaps_window(year, month, day, index, user_start, user_end):
     convention):
       - (year, month, day=None, index=None): one calendar month
       - (year, month, day, index=None):       one calendar day
+      - (year, month, day, index="HH"):       one hour of FCAS data
       - (year, month, day, index="HHMM"):     one 5-minute FCAS slot
     """
     year_i = int(year)
@@ -695,6 +1432,9 @@ def _iteration_overlaps_window(year, month, day, index, user_start, user_end):
         day_i = int(day)
         period_start = _datetime(year_i, month_i, day_i)
         period_end = period_start + _timedelta(days=1)
+    elif len(index) == 2:
+        period_start = _datetime(year_i, month_i, int(day), int(index))
+        period_end = period_start + _timedelta(hours=1)
     else:
         day_i = int(day)
         hour_i = int(index[:2])
@@ -704,7 +1444,16 @@ def _iteration_overlaps_window(year, month, day, index, user_start, user_end):
     return period_start < user_end and period_end > user_start
 
 
-def _dynamic_data_fetch_loop(
+def _dynamic_data_fetch_loop(*args, **kwargs):
+    """
+    The frames from `_iter_dynamic_data_fetch_loop`, as a list. In
+    caching mode the list is empty; the call returns once every cache
+    file has been written.
+    """
+    return list(_iter_dynamic_data_fetch_loop(*args, **kwargs))
+
+
+def _iter_dynamic_data_fetch_loop(
     start_search,
     start_time,
     end_time,
@@ -715,33 +1464,78 @@ def _dynamic_data_fetch_loop(
     fformat="parquet",
     keep_csv=False,
     keep_zip=True,
+    keep_all_sections=False,
     caching_mode=False,
     rebuild=False,
     write_kwargs={},
     user_select_columns=None,
+    max_workers=None,
+    conversion_pool=None,
+    stream_from_zip=False,
+    cache_layout="flat",
+    filter_cols=None,
+    filter_values=None,
+    categoricals=False,
+    loaded_periods=None,
+    max_pending_conversions=None,
 ):
     """
     Loops through generated dates and checks if the appropriate file exists.
 
-    If it does, reads in the data from the file and performs filtering.
+    If it does, reads in the data from the file, performs filtering and
+    yields it (unless in caching mode).
 
     If it does not, check if the CSV exists:
     1. If it does, read the data in and write any required files
        (parquet or feather).
     2. If it does not, download data then do the same as 1.
-    """
-    data_tables = []
 
+    With `max_workers` > 1 the downloads for upcoming periods run on a
+    thread pool (see `_prefetch_downloads`); the loop body below still
+    visits periods one at a time in date order, so reads, writes and
+    the coverage accounting are unchanged.
+
+    In caching mode a `conversion_pool` (see `_conversion_pool`) takes
+    over the CSV to feather/parquet step: each CSV found is handed to
+    `_convert_csv_to_cache` on the pool, and the loop waits for every
+    conversion before returning. Once `max_pending_conversions` are
+    queued the loop waits for the oldest before moving on, so extracted
+    CSVs don't pile up on disk ahead of the pool, and a failed
+    conversion stops the loop as soon as it is collected (see
+    `_collect_conversions`).
+
+    With `stream_from_zip`, chunks fetched by `downloader.run` are
+    downloaded but not extracted, and the CSV is read straight out of
+    the zip (see `_archive_to_stream` and `_find_csv_source`).
+
+    Existing feather/parquet cache files are read with only the columns
+    and (for parquet) rows that can survive the date filter and the
+    caller's `filter_cols`/`filter_values`; see `_read_cache_file`.
+
+    With `categoricals`, the columns in `defaults.categorical_columns`
+    are converted to categoricals: in caching mode before each file is
+    written (so it is stored dictionary-encoded), otherwise as each
+    chunk is collected, so the object strings never pile up.
+
+    If given, `loaded_periods` (a set) gets the (year, month) of each
+    period that data was read for.
+    """
     table_type = _defaults.table_types[table_name]
     # Uniform 1-day buffer-back on the file-fetch side, so any rows whose
     # timestamps lie just inside [start_time, end_time] but live in the prior
     # file are loaded. The post-load filter is strict on the query window, so
-    # this affects fetches, not returns. FCAS uses per-interval files
-    # (timestamp-precise filenames), so it doesn't need the look-back.
+    # this affects fetches, not returns. FCAS files hold exactly the
+    # intervals in their name (a 5 min slot, or an hour of them), so it
+    # doesn't need the look-back.
     date_gen_func = _processing_info_maps.date_gen[table_type]
-    if date_gen_func is not _date_generators.year_month_day_index_gen:
+    if date_gen_func not in (
+        _date_generators.year_month_day_index_gen,
+        _date_generators.year_month_day_hour_gen,
+    ):
         start_search = start_search - _timedelta(days=1)
     date_gen = date_gen_func(start_search, end_time)
+    if table_type == "FCAS" and fformat != "csv" and cache_layout == "flat" and not rebuild:
+        date_gen = _merging_fcas_slot_caches(date_gen, table_name, raw_data_location, fformat)
 
     # Track per-period success across the user's requested window so we
     # can emit a single coverage-gap summary at the end. Without it, a
@@ -759,7 +1553,34 @@ def _dynamic_data_fetch_loop(
     requested_periods = 0
     successful_requested_periods = 0
 
-    for year, month, day, index in date_gen:
+    # Archives this call downloaded for streaming. Only these are
+    # removed after reading when keep_zip=False, matching the
+    # downloader's rule for extracted zips.
+    fetched_archives = set()
+
+    def prefetch_period(year, month, day, index):
+        _download_period_chunks(
+            table_name, table_type, raw_data_location, fformat, year, month,
+            day, index, keep_zip=keep_zip, keep_all_sections=keep_all_sections,
+            caching_mode=caching_mode,
+            rebuild=rebuild, stream_from_zip=stream_from_zip,
+            fetched_archives=fetched_archives, cache_layout=cache_layout,
+        )
+
+    periods = _prefetch_downloads(date_gen, prefetch_period, max_workers)
+    # When prefetching, the pool has already attempted every download
+    # the loop below would make; retrying here would double up 404s.
+    downloads_prefetched = max_workers is not None and max_workers > 1
+    conversions = _deque()
+    manifest = (
+        _cache_manifest.CacheManifest(raw_data_location) if fformat != "csv" else None
+    )
+    sort_columns = None
+    if cache_layout == "partitioned":
+        sort_columns = _dataset_sort_columns(table_name)
+        write_kwargs = {"row_group_size": _PARTITIONED_ROW_GROUP_SIZE, **write_kwargs}
+
+    for year, month, day, index in periods:
         in_user_window = _iteration_overlaps_window(
             year, month, day, index, start_time, end_time
         )
@@ -770,15 +1591,20 @@ def _dynamic_data_fetch_loop(
         chunk = 0
         while check_for_next_data_chunk:
             chunk += 1
+            conversion_queued = False
 
             filename_stub, full_filename, path_and_name = _create_filename(
-                table_name, table_type, raw_data_location, fformat, day, month, year, chunk, index
+                table_name, table_type, raw_data_location, fformat, day, month, year, chunk, index,
+                cache_layout=cache_layout,
+            )
+            archive_path = _archive_to_stream(
+                stream_from_zip, table_type, year, month, day, filename_stub, raw_data_location
             )
 
-            if not (
-                _glob.glob(full_filename) or _glob.glob(path_and_name + ".[cC][sS][vV]")
-            ) or (not _glob.glob(path_and_name + ".[cC][sS][vV]") and rebuild):
-                _download_data(
+            if not downloads_prefetched and _needs_download(
+                full_filename, path_and_name, rebuild
+            ):
+                fetched = _download_data(
                     table_name,
                     table_type,
                     filename_stub,
@@ -789,11 +1615,33 @@ def _dynamic_data_fetch_loop(
                     index,
                     raw_data_location,
                     keep_zip=keep_zip,
+                    keep_all_sections=keep_all_sections,
+                    extract=archive_path is None,
                 )
+                if fetched and archive_path is not None:
+                    fetched_archives.add(archive_path)
+
+            cache_hit = (
+                fformat != "csv"
+                and not rebuild
+                and manifest.lookup(full_filename, table_name) is not None
+            )
+            if not cache_hit:
+                csv_source = _find_csv_source(path_and_name, archive_path)
 
-            if _glob.glob(full_filename) and fformat != "csv" and not rebuild:
+            if cache_hit:
                 if not caching_mode:
-                    data = _get_read_function(fformat, table_type, day)(full_filename)
+                    data = _read_cache_file(
+                        full_filename,
+                        fformat,
+                        table_name,
+                        select_columns,
+                        date_filter,
+                        start_time,
+                        end_time,
+                        filter_cols,
+                        filter_values,
+                    )
                 else:
                     data = None
                     logger.info(
@@ -801,7 +1649,7 @@ def _dynamic_data_fetch_loop(
                         + f" {raw_data_location}."
                     )
 
-            elif _glob.glob(path_and_name + ".[cC][sS][vV]"):
+            elif csv_source is not None:
 
                 if select_columns != "all":
                     read_all_columns = False
@@ -813,30 +1661,69 @@ def _dynamic_data_fetch_loop(
                 else:
                     dtypes = "all"
 
-                csv_path_and_name = _glob.glob(path_and_name + ".[cC][sS][vV]")[0]
-
-                csv_read_function = _get_read_function(
-                    fformat="csv", table_type=table_type, day=day
+                remove_archive = (
+                    isinstance(csv_source, tuple)
+                    and not keep_zip
+                    and csv_source[0] in fetched_archives
                 )
-                data = _determine_columns_and_read_csv(
-                    table_name,
-                    csv_path_and_name,
-                    csv_read_function,
-                    read_all_columns=read_all_columns,
-                    dtypes=dtypes,
-                )
-
-                if caching_mode:
-                    data = _perform_column_selection(
-                        data, select_columns, full_filename, user_select_columns
-                    )
 
-                if data is not None and fformat != "csv":
+                if conversion_pool is not None:
                     _log_file_creation_message(fformat, table_name, year, month, day, index)
-                    _write_to_format(data, fformat, full_filename, write_kwargs)
-
-                if not keep_csv:
-                    _os.remove(_glob.glob(path_and_name + ".[cC][sS][vV]")[0])
+                    conversions.append(
+                        conversion_pool.submit(
+                            _convert_csv_to_cache,
+                            table_name,
+                            table_type,
+                            day,
+                            csv_source,
+                            full_filename,
+                            fformat,
+                            read_all_columns=read_all_columns,
+                            select_columns=select_columns,
+                            user_select_columns=user_select_columns,
+                            table_columns=_defaults.table_columns[table_name],
+                            write_kwargs=write_kwargs,
+                            keep_csv=keep_csv,
+                            remove_archive=remove_archive,
+                            sort_columns=sort_columns,
+                            manifest=manifest,
+                            categoricals=categoricals and caching_mode,
+                        )
+                    )
+                    _collect_conversions(conversions, max_pending_conversions)
+                    data = None
+                    conversion_queued = True
+                else:
+                    csv_read_function = _get_read_function(
+                        fformat="csv", table_type=table_type, day=day
+                    )
+                    with _opened_csv_source(csv_source) as csv_file:
+                        data = _determine_columns_and_read_csv(
+                            table_name,
+                            csv_file,
+                            csv_read_function,
+                            read_all_columns=read_all_columns,
+                            dtypes=dtypes,
+                        )
+
+                    if caching_mode:
+                        data = _perform_column_selection(
+                            data, select_columns, full_filename, user_select_columns
+                        )
+
+                    if data is not None and fformat != "csv":
+                        # Sorted before it is returned too, so a first
+                        # query matches later ones served from the cache.
+                        data = _sort_rows(data, sort_columns)
+                        if categoricals and caching_mode:
+                            data = _encode_categorical_columns(data)
+                        _log_file_creation_message(fformat, table_name, year, month, day, index)
+                        _write_to_format(
+                            data, fformat, full_filename, write_kwargs,
+                            manifest=manifest, table_name=table_name,
+                        )
+
+                    _remove_csv_source(csv_source, keep_csv, remove_archive)
             else:
                 data = None
 
@@ -848,8 +1735,10 @@ def _dynamic_data_fetch_loop(
                 data = _perform_column_selection(
                     data, select_columns, full_filename, user_select_columns
                 )
+                if categoricals:
+                    data = _encode_categorical_columns(data)
 
-                data_tables.append(data)
+                yield data
                 period_has_data = True
             elif not caching_mode and chunk == 1:
                 # Demoted from WARNING to DEBUG: when we reach here, the
@@ -862,10 +1751,16 @@ def _dynamic_data_fetch_loop(
                 # 404 path for historical / future / missing months.
                 logger.debug(f"No cached data file present at {full_filename} (upstream download likely 404'd).")
 
-            if data is None or '#' not in filename_stub:
+            if (data is None and not conversion_queued) or '#' not in filename_stub:
                 check_for_next_data_chunk = False
         if period_has_data and in_user_window:
             successful_requested_periods += 1
+        if period_has_data and loaded_periods is not None:
+            loaded_periods.add((year, month))
+
+    # Surface the first failed conversion (if any) in the caller's process.
+    for conversion in conversions:
+        conversion.result()
 
     # Warn iff the user's requested window has a gap, AND we did get at
     # least some data (zero-data is already covered by NoDataToReturn
@@ -889,7 +1784,313 @@ def _dynamic_data_fetch_loop(
             f"pre-dates AEMO data."
         )
 
-    return data_tables
+
+def _collect_conversions(conversions, max_pending=None):
+    """
+    Takes the finished futures out of `conversions` (a deque, oldest
+    first), re-raising the first failure, then waits on the oldest until
+    no more than `max_pending` are left.
+    """
+    for conversion in [c for c in conversions if c.done()]:
+        conversions.remove(conversion)
+        conversion.result()
+    while max_pending is not None and len(conversions) > max_pending:
+        conversions.popleft().result()
+
+
+@_contextmanager
+def _conversion_pool(n_processes):
+    """
+    Process pool for cache_compiler's CSV to feather/parquet step, or
+    None when n_processes is None or 1 (convert on the calling process).
+
+    Uses the "spawn" start method on every platform: the fetch loop may
+    have download threads running, and forking a multi-threaded process
+    can deadlock. Pending conversions are cancelled if the loop raises.
+    """
+    if n_processes is None or n_processes == 1:
+        yield None
+        return
+    pool = _ProcessPoolExecutor(
+        max_workers=n_processes,
+        mp_context=_multiprocessing.get_context("spawn"),
+    )
+    try:
+        yield pool
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _convert_csv_to_cache(
+    table_name,
+    table_type,
+    day,
+    csv_source,
+    full_filename,
+    fformat,
+    read_all_columns,
+    select_columns,
+    user_select_columns,
+    table_columns,
+    write_kwargs,
+    keep_csv,
+    remove_archive=False,
+    sort_columns=None,
+    manifest=None,
+    categoricals=False,
+):
+    """
+    Process-pool worker for cache_compiler: read one raw AEMO CSV (see
+    `_find_csv_source`) with inferred types, apply the column
+    selection, write it to `fformat` and then remove the source as
+    `_remove_csv_source` decides.
+
+    `table_columns` is passed in rather than read from
+    `defaults.table_columns` because a spawned worker re-imports
+    nemosis and would not see columns the caller added at runtime.
+
+    With `categoricals`, ID columns are stored dictionary-encoded (see
+    `value_parser._encode_categorical_columns`).
+    """
+    csv_read_function = _get_read_function(fformat="csv", table_type=table_type, day=day)
+    with _opened_csv_source(csv_source) as csv_file:
+        data = _determine_columns_and_read_csv(
+            table_name,
+            csv_file,
+            csv_read_function,
+            read_all_columns=read_all_columns,
+            dtypes="all",
+            table_columns=table_columns,
+        )
+    data = _perform_column_selection(
+        data, select_columns, full_filename, user_select_columns
+    )
+    data = _sort_rows(data, sort_columns)
+    if categoricals:
+        data = _encode_categorical_columns(data)
+    _write_to_format(
+        data, fformat, full_filename, write_kwargs,
+        manifest=manifest, table_name=table_name,
+    )
+    _remove_csv_source(csv_source, keep_csv, remove_archive)
+
+
+def _archive_to_stream(
+    stream_from_zip, table_type, year, month, day, filename_stub, raw_data_location
+):
+    """
+    Local path of the archive to read a chunk's CSV from when streaming,
+    or None if the chunk should be extracted to disk as usual.
+
+    Only the MMS-format archives fetched by `downloader.run` (MMS
+    tables and monthly BIDDING) hold the table's CSV as-is; the other
+    table types build their CSVs while unpacking (FCAS joins an hour of
+    5 min files from two bundles), so those keep extracting.
+    """
+    if not stream_from_zip:
+        return None
+    if not (table_type == "MMS" or (table_type == "BIDDING" and day is None)):
+        return None
+    return _downloader.mms_archive_path(year, month, filename_stub, raw_data_location)
+
+
+def _find_csv_source(path_and_name, archive_path=None):
+    """
+    Where to read a chunk's raw CSV from: the extracted CSV on disk if
+    there is one, otherwise (when streaming) an (archive_path, member)
+    pair for the matching CSV inside the downloaded zip, otherwise None.
+    """
+    csv_on_disk = _csv_on_disk(path_and_name)
+    if csv_on_disk is not None:
+        return csv_on_disk
+    if archive_path is None or not _os.path.isfile(archive_path):
+        return None
+    member_name = _os.path.basename(path_and_name).upper() + ".CSV"
+    try:
+        with _zipfile.ZipFile(archive_path) as archive:
+            for member in archive.namelist():
+                if member.rsplit("/", 1)[-1].upper() == member_name:
+                    return archive_path, member
+    except _zipfile.BadZipFile as e:
+        logger.warning(f"Could not read {archive_path} ({e})")
+    return None
+
+
+@_contextmanager
+def _opened_csv_source(csv_source):
+    """Yield something the CSV read functions accept for a source from
+    `_find_csv_source`: the path itself, or an open zip member stream."""
+    if isinstance(csv_source, tuple):
+        archive_path, member = csv_source
+        with _zipfile.ZipFile(archive_path) as archive:
+            with archive.open(member) as stream:
+                yield stream
+    else:
+        yield csv_source
+
+
+def _remove_csv_source(csv_source, keep_csv, remove_archive):
+    """Once read, remove an extracted CSV unless keep_csv, or a streamed
+    archive if remove_archive."""
+    if isinstance(csv_source, tuple):
+        if remove_archive:
+            _os.remove(csv_source[0])
+    elif not keep_csv:
+        _os.remove(csv_source)
+
+
+def _csv_on_disk(path_and_name):
+    """
+    Path of a chunk's extracted CSV, or None. Archives extract to
+    `.CSV` (MMS) or `.csv` (current reports, and CSVs the downloader
+    writes itself), so both are stat'ed rather than globbing for every
+    case mix, which lists the whole cache directory.
+    """
+    for extension in (".CSV", ".csv"):
+        if _os.path.isfile(path_and_name + extension):
+            return path_and_name + extension
+    return None
+
+
+def _merging_fcas_slot_caches(periods, table_name, raw_data_location, fformat):
+    """
+    Yield the FCAS `periods` (hours), first merging each hour's cache
+    files from versions that cached FCAS data per 5 min slot
+    (FCAS_YYYYMMDDHHMM) into the hour's cache file, so they are read
+    rather than downloaded again. An hour is only merged if all 12 of
+    its slot files are present, with the same columns. The slot files
+    are left in place.
+    """
+    manifest = _cache_manifest.CacheManifest(raw_data_location)
+    for year, month, day, hour in periods:
+        _, full_filename, _ = _create_filename(
+            table_name, "FCAS", raw_data_location, fformat, day, month, year, 1, hour
+        )
+        slot_filenames = [
+            _create_filename(
+                table_name, "FCAS", raw_data_location, fformat, day, month, year, 1,
+                f"{hour}{minute:02d}",
+            )[1]
+            for minute in range(0, 60, 5)
+        ]
+        if not _os.path.isfile(full_filename) and all(
+            _os.path.isfile(slot_filename) for slot_filename in slot_filenames
+        ):
+            read_function = _get_read_function(fformat, "FCAS", day)
+            slots = [read_function(slot_filename) for slot_filename in slot_filenames]
+            if all(list(slot.columns) == list(slots[0].columns) for slot in slots):
+                logger.info(f"Merging 5 min {table_name} cache files into {full_filename}")
+                _write_to_format(
+                    _pd.concat(slots, ignore_index=True), fformat, full_filename, {},
+                    manifest=manifest, table_name=table_name,
+                )
+        yield year, month, day, hour
+
+
+def _needs_download(full_filename, path_and_name, rebuild):
+    """True if neither the cache file nor the raw CSV for a chunk is on
+    disk, or if a rebuild was requested and the raw CSV is missing."""
+    csv_on_disk = _csv_on_disk(path_and_name) is not None
+    return not (_os.path.isfile(full_filename) or csv_on_disk) or (
+        not csv_on_disk and rebuild
+    )
+
+
+def _download_period_chunks(
+    table_name, table_type, raw_data_location, fformat, year, month, day, index,
+    keep_zip=True, caching_mode=False, rebuild=False, stream_from_zip=False,
+    fetched_archives=None, cache_layout="flat", keep_all_sections=False,
+):
+    """
+    Download (and unzip) every chunk of one date_gen period that the
+    fetch loop would go on to download itself.
+
+    Mirrors the loop's chunk logic: a further chunk is only tried while
+    the filename is a multi-file `PUBLIC_ARCHIVE#...#FILE0N#` stub and
+    the previous chunk produced something the loop would read. Once
+    this has run, the loop finds the CSVs on disk and skips the
+    network for the period.
+    """
+    chunk = 0
+    while True:
+        chunk += 1
+        filename_stub, full_filename, path_and_name = _create_filename(
+            table_name, table_type, raw_data_location, fformat, day, month, year, chunk, index,
+            cache_layout=cache_layout,
+        )
+        archive_path = _archive_to_stream(
+            stream_from_zip, table_type, year, month, day, filename_stub, raw_data_location
+        )
+        if _needs_download(full_filename, path_and_name, rebuild):
+            fetched = _download_data(
+                table_name,
+                table_type,
+                filename_stub,
+                day,
+                month,
+                year,
+                chunk,
+                index,
+                raw_data_location,
+                keep_zip=keep_zip,
+                keep_all_sections=keep_all_sections,
+                extract=archive_path is None,
+            )
+            if fetched and archive_path is not None and fetched_archives is not None:
+                fetched_archives.add(archive_path)
+        cache_is_read = (
+            _os.path.isfile(full_filename)
+            and fformat != "csv"
+            and not rebuild
+            and not caching_mode
+        )
+        if '#' not in filename_stub or not (
+            cache_is_read or _find_csv_source(path_and_name, archive_path)
+        ):
+            return
+
+
+def _prefetch_downloads(periods, download_period, max_workers):
+    """
+    Yield `periods` in order, with `download_period(*period)` run for
+    upcoming periods on a pool of `max_workers` threads.
+
+    A period is only yielded once its own download has finished. At
+    most 2 * max_workers periods are in flight ahead of the consumer,
+    so a long backfill doesn't extract every CSV to disk before the
+    first one is converted. Download failures are already turned into
+    warnings by the downloader; anything else raised by a worker is
+    re-raised here, in the caller's thread.
+
+    With max_workers None or 1 the periods are passed straight through
+    and the caller's loop downloads them itself, as before.
+    """
+    if max_workers is None or max_workers == 1:
+        yield from periods
+        return
+
+    _downloader.size_connection_pool(max_workers)
+    periods = iter(periods)
+    executor = _ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="nemosis-download"
+    )
+    in_flight = _deque()
+    try:
+        for period in periods:
+            in_flight.append((period, executor.submit(download_period, *period)))
+            if len(in_flight) >= 2 * max_workers:
+                break
+        while in_flight:
+            period, future = in_flight.popleft()
+            future.result()
+            next_period = next(periods, None)
+            if next_period is not None:
+                in_flight.append(
+                    (next_period, executor.submit(download_period, *next_period))
+                )
+            yield period
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 def _perform_column_selection(data, select_columns, full_filename, user_select_columns=None):
@@ -912,22 +2113,79 @@ def _perform_column_selection(data, select_columns, full_filename, user_select_c
 
 
 def _create_filename(
-    table_name, table_type, raw_data_location, fformat, day, month, year, chunk, index
+    table_name, table_type, raw_data_location, fformat, day, month, year, chunk, index,
+    cache_layout="flat",
 ):
     """
     Gather:
     - the file name, based on file naming rules
     - potential file path (if data exists in cache)
 
+    With cache_layout="partitioned" the cache file moves into the
+    table's hive-partitioned dataset (see `_partitioned_cache_filename`);
+    the raw CSVs and zips stay in raw_data_location either way.
+
     Returns: filename_stub, full_filename and path_and_name
     """
     filename_stub, path_and_name = _processing_info_maps.write_filename[table_type](
         table_name, month, year, day, chunk, index, raw_data_location
     )
-    full_filename = path_and_name + f".{fformat}"
+    if cache_layout == "partitioned":
+        full_filename = _partitioned_cache_filename(
+            raw_data_location, table_name, year, month, filename_stub, fformat
+        )
+    else:
+        full_filename = path_and_name + f".{fformat}"
     return filename_stub, full_filename, path_and_name
 
 
+def _partitioned_cache_filename(
+    raw_data_location, table_name, year, month, filename_stub, fformat
+):
+    """
+    Path of one part file in a table's partitioned dataset:
+
+        <raw_data_location>/table=DISPATCHLOAD/year=2018/month=01/
+            part-PUBLIC_DVD_DISPATCHLOAD_201801010000.parquet
+
+    Each AEMO archive (or chunk of a multi-file archive) keeps its own
+    part file, so caches can still be built and rebuilt one archive at
+    a time. '#' in the newer archive names is replaced, as tools that
+    treat dataset paths as URLs read it as a fragment marker.
+    """
+    part_name = "part-" + filename_stub.replace("#", "-") + f".{fformat}"
+    return _os.path.join(
+        raw_data_location,
+        f"table={table_name}",
+        f"year={year}",
+        f"month={month}",
+        part_name,
+    )
+
+
+def _dataset_sort_columns(table_name):
+    """Sort order for partitioned cache files: the table's primary date
+    column, then its primary key. Keeps each row group's statistics
+    tight, so date and key filters can skip most of the file."""
+    columns = []
+    date_col = _defaults.primary_date_columns.get(table_name)
+    if date_col is not None:
+        columns.append(date_col)
+    for column in _defaults.table_primary_keys.get(table_name, []):
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def _sort_rows(data, sort_columns):
+    if not sort_columns:
+        return data
+    by = [column for column in sort_columns if column in data.columns]
+    if not by:
+        return data
+    return data.sort_values(by, kind="stable", ignore_index=True)
+
+
 def _validate_select_columns(data, select_columns, full_filename, user_select_columns=None):
     """
     Checks whether select_columns are in the file. If at least one is,
@@ -1093,6 +2351,53 @@ def _validate_time_window(start_time, end_time):
         )
 
 
+def _validate_stream_from_zip(stream_from_zip, fformat, keep_csv):
+    """Streaming never writes the raw CSV, so it can't be kept or used
+    as the cache format."""
+    if not stream_from_zip:
+        return
+    if fformat == "csv":
+        raise UserInputError(
+            "stream_from_zip=True requires fformat='feather' or 'parquet'."
+        )
+    if keep_csv:
+        raise UserInputError("stream_from_zip=True cannot be used with keep_csv=True.")
+
+
+def _validate_cache_layout(cache_layout, fformat):
+    if cache_layout not in ("flat", "partitioned"):
+        raise UserInputError(
+            f"cache_layout must be 'flat' or 'partitioned', got {cache_layout!r}."
+        )
+    if cache_layout == "partitioned" and fformat != "parquet":
+        raise UserInputError("cache_layout='partitioned' requires fformat='parquet'.")
+
+
+def _validate_worker_count(value, argument_name):
+    """Pool-size arguments (max_workers, n_processes) must be None
+    (no pool) or a positive int."""
+    if value is None:
+        return
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise UserInputError(
+            f"{argument_name} must be a positive integer or None, got {value!r}."
+        )
+
+
+def _validate_max_age(max_age):
+    """static_table's max_age as seconds: None, a non-negative number of
+    seconds or a timedelta."""
+    if max_age is None:
+        return None
+    if isinstance(max_age, _timedelta):
+        max_age = max_age.total_seconds()
+    if isinstance(max_age, bool) or not isinstance(max_age, (int, float)) or max_age < 0:
+        raise UserInputError(
+            f"max_age must be a non-negative number of seconds, a timedelta or None, got {max_age!r}."
+        )
+    return max_age
+
+
 def _validate_filter_args(filter_cols, filter_values):
     """Validate filter_cols / filter_values shape before downstream code zips
     them. Without this:
@@ -1140,6 +2445,8 @@ def _log_file_creation_message(fformat, table_name, year, month, day, index):
     logstr = f"Creating {fformat} file for " + f"{table_name}, {year}, {month}"
     if day is None:
         output = logstr
+    elif index is None:
+        output = logstr + f" {day}"
     else:
         output = logstr + f" {day}, {index}"
 
@@ -1147,80 +2454,100 @@ def _log_file_creation_message(fformat, table_name, year, month, day, index):
 
 
 def _determine_columns_and_read_csv(
-    table_name, csv_file, read_csv_func, dtypes, read_all_columns=False
+    table_name, csv_file, read_csv_func, dtypes, read_all_columns=False,
+    table_columns=None,
 ):
     """
     Used by read_data_and_create_file
     Determining columns:
-    - If the table is an MMS table, check header of CSV for actual columns.
-      Then remove any columns from lookup table if not in actual columns.
-      This is done as AEMO has added and removed columns over time.
+    - If the table is an MMS table, read only the lookup table's columns
+      that are actually in the CSV's header (a callable usecols, so the
+      header is checked by the same pass that reads the data). This is
+      done as AEMO has added and removed columns over time.
     - If the table is not an MMS table, use columns from the lookup table.
 
     Reading csv:
     - To preserve compatability with previous versions of NEMOSIS and
       thus any existing data caches, read in all columns as strings.
 
+    `table_columns` overrides the lookup table's columns for this table
+    (used by the cache_compiler process pool, see _convert_csv_to_cache).
+
     Returns: data, columns
     """
+    if table_columns is None:
+        table_columns = _defaults.table_columns[table_name]
     if dtypes == "all":
         type = None
     else:
         type = str
+    # The MMS reader casts columns with a known type straight to it.
+    type_kwargs = {}
+    if type is None and read_csv_func is _read_mms_csv:
+        type_kwargs = {"column_types": _defaults.column_types}
     if (
         _defaults.table_types[table_name] in ["MMS", "BIDDING", "DAILY_REGION_SUMMARY", "NEXT_DAY_DISPATCHLOAD",
                                               "INTERMITTENT_GEN_SCADA"]
         and not read_all_columns
     ):
-        headers = read_csv_func(csv_file, nrows=1).columns.tolist()
-        columns = [
-            column
-            for column in _defaults.table_columns[table_name]
-            if column in headers
-        ]
-        data = read_csv_func(csv_file, usecols=columns, dtype=type)
+        wanted = set(table_columns)
+        data = read_csv_func(
+            csv_file, usecols=lambda column: column in wanted, dtype=type, **type_kwargs
+        )
     elif (
         _defaults.table_types[table_name] in ["MMS", "BIDDING", "DAILY_REGION_SUMMARY", "NEXT_DAY_DISPATCHLOAD"]
         and read_all_columns
     ):
-        data = read_csv_func(csv_file, dtype=type)
+        data = read_csv_func(csv_file, dtype=type, **type_kwargs)
     else:
-        columns = _defaults.table_columns[table_name]
+        columns = table_columns
         data = read_csv_func(csv_file, names=columns, dtype=type)
     return data
 
 
-def _write_to_format(data, fformat, full_filename, write_kwargs):
+def _write_to_format(
+    data, fformat, full_filename, write_kwargs, manifest=None, table_name=None
+):
     """
     Used by read_data_and_create_file
     Writes the DataFrame to a non-CSV format if a non-CSV format is specified.
+
+    The file is written to a temporary name in the same directory and
+    then moved into place with os.replace, so an interrupted run (or a
+    failed write, e.g. disk full) leaves either the previous cache file
+    or nothing at `full_filename` — never a half-written one.
+
+    If a `cache_manifest.CacheManifest` is given, the file is recorded in
+    it once in place.
     """
     write_function = {"feather": data.to_feather, "parquet": data.to_parquet}
-    # Remove files of the same name - deals with case of corrupted files.
-    if _os.path.isfile(full_filename) and fformat != "csv":
-        _os.unlink(full_filename)
+    directory, filename = _os.path.split(full_filename)
+    _os.makedirs(directory, exist_ok=True)
+    temp_filename = _os.path.join(directory, f".{filename}.{_uuid.uuid4().hex}.tmp")
     # Write to required format
     try:
         if fformat == "feather":
-            write_function[fformat](full_filename, **write_kwargs)
+            write_function[fformat](temp_filename, **write_kwargs)
         elif fformat == "parquet":
-            write_function[fformat](full_filename, index=False, **write_kwargs)
-        return
-    except Exception:
+            write_function[fformat](temp_filename, index=False, **write_kwargs)
+        _os.replace(temp_filename, full_filename)
+    except BaseException:
         # tidy up incomplete file
-        if _os.path.isfile(full_filename):
-            _os.unlink(full_filename)
+        if _os.path.isfile(temp_filename):
+            _os.unlink(temp_filename)
         raise
+    if manifest is not None:
+        manifest.record(full_filename, table_name, fformat, data)
 
 
 def _download_data(
     table_name, table_type, filename_stub, day, month, year, chunk, index, raw_data_location,
-    keep_zip=True,
+    keep_zip=True, extract=True, keep_all_sections=False,
 ):
     """
     Dispatch table to downloader to be downloaded.
 
-    Returns: nothing
+    Returns: the downloader's fetched flag (True, False or None, below).
 
     Logging is honest about whether we actually contacted AEMO: the
     `run*` functions return True if a network fetch occurred, False if
@@ -1234,13 +2561,23 @@ def _download_data(
     step is being repeated (see #TBD discussion in user-testing
     exploration).
     """
+    # Only downloader.run / run_bid_tables take `extract`; see
+    # _archive_to_stream for when it is False.
+    download_kwargs = {} if extract else {"extract": False}
+    # Only the downloaders of multi-report daily files take
+    # `keep_all_sections`; for other table types it has nothing to keep.
+    if keep_all_sections and table_type in _MULTI_REPORT_TABLE_TYPES:
+        download_kwargs["keep_all_sections"] = True
     fetched = _processing_info_maps.downloader[table_type](
         year, month, day, chunk, index, filename_stub, raw_data_location,
-        keep_zip=keep_zip,
+        keep_zip=keep_zip, **download_kwargs,
     )
 
     if chunk == 1 and fetched is not None:
-        verb = "Downloading and extracting data" if fetched else "Extracting cached zip"
+        if extract:
+            verb = "Downloading and extracting data" if fetched else "Extracting cached zip"
+        else:
+            verb = "Downloading data" if fetched else "Reusing cached zip"
         if day is None:
             logger.info(
                 f"{verb} for table {table_name}, "
@@ -1257,7 +2594,7 @@ def _download_data(
                 + f"year {year}, month {month}, day {day},"
                 + f"time {index}."
             )
-    return
+    return fetched
 
   
 # GUI wrappers and mappers below
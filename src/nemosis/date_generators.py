@@ -69,6 +69,22 @@ def year_month_day_index_gen(start_time, end_time):
                         yield str(year), month, str(day).zfill(2), index
 
 
+def year_month_day_hour_gen(start_time, end_time):
+    """
+    One iteration per hour from start_time's hour to end_time's, for
+    tables cached an hour per file (FCAS 4 second data, whose 5 min
+    files are combined by downloader.run_fcas4s_hour). The index is the
+    hour ("HH"). end_time's hour is included even when end_time is on
+    the hour, as the window includes end_time and a sample stamped then
+    is in that hour's first file.
+    """
+    hour = datetime(start_time.year, start_time.month, start_time.day, start_time.hour)
+    last_hour = datetime(end_time.year, end_time.month, end_time.day, end_time.hour)
+    while hour <= last_hour:
+        yield str(hour.year), str(hour.month).zfill(2), str(hour.day).zfill(2), str(hour.hour).zfill(2)
+        hour += timedelta(hours=1)
+
+
 def bid_table_gen(start_time, end_time):
 
     end_year = end_time.year
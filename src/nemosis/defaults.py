@@ -883,6 +883,234 @@ primary_date_columns = {
     "ROOFTOP_PV_ACTUAL": "INTERVAL_DATETIME"
 }
 
+# Data type of each dynamic table column, following the AEMO MMS Data
+# Model: DATE columns are "datetime", NUMBER columns with decimal places
+# "float" and without "int", and VARCHAR columns "string". A column name
+# means the same thing in every table it appears in, so one map covers
+# them all. dynamic_data_compiler converts these columns straight to their
+# type (see value_parser._infer_column_data_types), and cache_compiler
+# parses the numeric ones that way; columns not listed here (e.g. added
+# by users to table_columns) still have their type inferred from the data.
+# "int" columns that have gaps come back as float64, as pandas has no
+# missing value for int64.
+column_types = {
+    "SETTLEMENTDATE": "datetime",
+    "EFFECTIVEDATE": "datetime",
+    "LASTCHANGED": "datetime",
+    "INTERVAL_DATETIME": "datetime",
+    "RUN_DATETIME": "datetime",
+    "START_DATE": "datetime",
+    "END_DATE": "datetime",
+    "OFFERDATE": "datetime",
+    "GENCONID_EFFECTIVEDATE": "datetime",
+    "TIMESTAMP": "datetime",
+    "INTERVENTION": "int",
+    "VERSIONNO": "int",
+    "GENCONID_VERSIONNO": "int",
+    "RUNNO": "int",
+    "DISPATCHINTERVAL": "int",
+    "PERIODID": "int",
+    "DISPATCHMODE": "int",
+    "AGCSTATUS": "int",
+    "SEMIDISPATCHCAP": "int",
+    "APCFLAG": "int",
+    "MARKETSUSPENDEDFLAG": "int",
+    "DISPATCH": "int",
+    "PREDISPATCH": "int",
+    "STPASA": "int",
+    "MTPASA": "int",
+    "LOSSSEGMENT": "int",
+    "MWBREAKPOINT": "int",
+    "REGISTEREDCAPACITY": "int",
+    "MAXCAPACITY": "int",
+    "MAX_RAMP_RATE_UP": "int",
+    "MAX_RAMP_RATE_DOWN": "int",
+    "MINIMUMLOAD": "int",
+    "T1": "int",
+    "T2": "int",
+    "T3": "int",
+    "T4": "int",
+    "BANDAVAIL1": "int",
+    "BANDAVAIL2": "int",
+    "BANDAVAIL3": "int",
+    "BANDAVAIL4": "int",
+    "BANDAVAIL5": "int",
+    "BANDAVAIL6": "int",
+    "BANDAVAIL7": "int",
+    "BANDAVAIL8": "int",
+    "BANDAVAIL9": "int",
+    "BANDAVAIL10": "int",
+    "ELEMENTNUMBER": "int",
+    "VARIABLENUMBER": "int",
+    "VALUEQUALITY": "int",
+    "AVAILABILITY": "float",
+    "AVAILABLEGENERATION": "float",
+    "AVAILABLELOAD": "float",
+    "CLEAREDSUPPLY": "float",
+    "CONSTRAINTVALUE": "float",
+    "DEMANDCOEFFICIENT": "float",
+    "DEMANDFORECAST": "float",
+    "DEMAND_AND_NONSCHEDGEN": "float",
+    "DISPATCHABLEGENERATION": "float",
+    "DISPATCHABLELOAD": "float",
+    "DISTRIBUTIONLOSSFACTOR": "float",
+    "EEP": "float",
+    "ENABLEMENTMAX": "float",
+    "ENABLEMENTMIN": "float",
+    "EXCESSGENERATION": "float",
+    "FACTOR": "float",
+    "FROMREGIONLOSSSHARE": "float",
+    "FROM_REGION_TLF": "float",
+    "GENERICCONSTRAINTWEIGHT": "float",
+    "HIGHBREAKPOINT": "float",
+    "INITIALMW": "float",
+    "INITIALSUPPLY": "float",
+    "LHS": "float",
+    "LHSFACTOR": "float",
+    "LOSSCONSTANT": "float",
+    "LOSSFLOWCOEFFICIENT": "float",
+    "LOWBREAKPOINT": "float",
+    "LOWER1SEC": "float",
+    "LOWER1SECLOCALDISPATCH": "float",
+    "LOWER1SECRRP": "float",
+    "LOWER5MIN": "float",
+    "LOWER5MINLOCALDISPATCH": "float",
+    "LOWER5MINRRP": "float",
+    "LOWER60SEC": "float",
+    "LOWER60SECLOCALDISPATCH": "float",
+    "LOWER60SECRRP": "float",
+    "LOWER6SEC": "float",
+    "LOWER6SECLOCALDISPATCH": "float",
+    "LOWER6SECRRP": "float",
+    "LOWERREG": "float",
+    "LOWERREGENABLEMENTMAX": "float",
+    "LOWERREGENABLEMENTMIN": "float",
+    "LOWERREGLOCALDISPATCH": "float",
+    "LOWERREGRRP": "float",
+    "MARGINALVALUE": "float",
+    "MARKETPRICEFLOOR": "float",
+    "MAXAVAIL": "float",
+    "METEREDMWFLOW": "float",
+    "MWFLOW": "float",
+    "MWLOSSES": "float",
+    "NETINTERCHANGE": "float",
+    "POWER": "float",
+    "PRICEBAND1": "float",
+    "PRICEBAND10": "float",
+    "PRICEBAND2": "float",
+    "PRICEBAND3": "float",
+    "PRICEBAND4": "float",
+    "PRICEBAND5": "float",
+    "PRICEBAND6": "float",
+    "PRICEBAND7": "float",
+    "PRICEBAND8": "float",
+    "PRICEBAND9": "float",
+    "QI": "float",
+    "RAISE1SEC": "float",
+    "RAISE1SECLOCALDISPATCH": "float",
+    "RAISE1SECRRP": "float",
+    "RAISE5MIN": "float",
+    "RAISE5MINLOCALDISPATCH": "float",
+    "RAISE5MINRRP": "float",
+    "RAISE60SEC": "float",
+    "RAISE60SECLOCALDISPATCH": "float",
+    "RAISE60SECRRP": "float",
+    "RAISE6SEC": "float",
+    "RAISE6SECLOCALDISPATCH": "float",
+    "RAISE6SECRRP": "float",
+    "RAISEREG": "float",
+    "RAISEREGENABLEMENTMAX": "float",
+    "RAISEREGENABLEMENTMIN": "float",
+    "RAISEREGLOCALDISPATCH": "float",
+    "RAISEREGRRP": "float",
+    "RAMPDOWNRATE": "float",
+    "RAMPUPRATE": "float",
+    "RHS": "float",
+    "ROP": "float",
+    "RRP": "float",
+    "SCADAVALUE": "float",
+    "SCADA_VALUE": "float",
+    "SEMISCHEDULE_CLEAREDMW": "float",
+    "SEMISCHEDULE_COMPLIANCEMW": "float",
+    "TOTALCLEARED": "float",
+    "TOTALDEMAND": "float",
+    "TOTALINTERMITTENTGENERATION": "float",
+    "TO_REGION_TLF": "float",
+    "TRANSMISSIONLOSSFACTOR": "float",
+    "UIGF": "float",
+    "VALUE": "float",
+    "VIOLATIONDEGREE": "float",
+    "VOLL": "float",
+    "DUID": "string",
+    "REGIONID": "string",
+    "INTERCONNECTORID": "string",
+    "LINKID": "string",
+    "CONSTRAINTID": "string",
+    "GENCONID": "string",
+    "PARTICIPANTID": "string",
+    "PARTICIPANTCLASSID": "string",
+    "NAME": "string",
+    "CONNECTIONPOINTID": "string",
+    "STATIONID": "string",
+    "DISPATCHTYPE": "string",
+    "SCHEDULE_TYPE": "string",
+    "STARTTYPE": "string",
+    "AGCCAPABILITY": "string",
+    "NORMALLYONFLAG": "string",
+    "BIDTYPE": "string",
+    "DIRECTION": "string",
+    "CONSTRAINTTYPE": "string",
+    "DESCRIPTION": "string",
+    "LIMITTYPE": "string",
+    "REASON": "string",
+    "ICTYPE": "string",
+    "FROMREGION": "string",
+    "TOREGION": "string",
+    "REGIONFROM": "string",
+    "REGIONTO": "string",
+    "PRICE_STATUS": "string",
+    "SCADA_TYPE": "string",
+    "SCADA_QUALITY": "string",
+    "TYPE": "string",
+}
+
+# Identifier and code columns with few distinct values relative to the
+# number of rows (a year of BIDPEROFFER_D repeats a few hundred DUIDs
+# millions of times). cache_compiler stores these dictionary-encoded, and
+# dynamic_data_compiler returns them as pandas categoricals when called
+# with categoricals=True. Free-text "string" columns (NAME, DESCRIPTION,
+# REASON) are left out.
+categorical_columns = [
+    "DUID",
+    "REGIONID",
+    "INTERCONNECTORID",
+    "LINKID",
+    "CONSTRAINTID",
+    "GENCONID",
+    "PARTICIPANTID",
+    "PARTICIPANTCLASSID",
+    "CONNECTIONPOINTID",
+    "STATIONID",
+    "DISPATCHTYPE",
+    "SCHEDULE_TYPE",
+    "STARTTYPE",
+    "AGCCAPABILITY",
+    "NORMALLYONFLAG",
+    "BIDTYPE",
+    "DIRECTION",
+    "CONSTRAINTTYPE",
+    "LIMITTYPE",
+    "ICTYPE",
+    "FROMREGION",
+    "TOREGION",
+    "REGIONFROM",
+    "REGIONTO",
+    "PRICE_STATUS",
+    "SCADA_TYPE",
+    "SCADA_QUALITY",
+    "TYPE",
+]
+
 reg_exemption_list_tabs = {
     "Generators and Scheduled Loads": ["Generators and Scheduled Loads", "PU and Scheduled Loads"],
     "FCAS Providers": ["Ancillary Services"],
@@ -1,15 +1,25 @@
 import os
+import json
 import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import zipfile
 import io
-from urllib.parse import urljoin, urldefrag
+from bisect import bisect_left
+from functools import lru_cache
+from urllib.parse import urljoin, urldefrag, urlsplit
 
-import pandas as pd
-from cachetools import cached, TTLCache
+from cachetools import TTLCache
 
 from . import defaults, custom_errors
+from .listing_cache import ListingCache
+from .mms_csv import split_mms_sections
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +39,78 @@ session.headers.update({
     )
 })
 
+# requests' default adapter keeps at most 10 connections per host; any
+# more concurrent downloads than that get their connection thrown away
+# afterwards (with a urllib3 "pool is full" warning) instead of reused.
+_DEFAULT_POOL_SIZE = 10
+_pool_size = _DEFAULT_POOL_SIZE
+_pool_size_lock = threading.Lock()
+
+
+def size_connection_pool(max_workers):
+    """Grow the shared session's per-host connection pool so that
+    `max_workers` threads downloading at once can all keep their
+    connections alive. Never shrinks the pool."""
+    global _pool_size
+    with _pool_size_lock:
+        if max_workers <= _pool_size:
+            return
+        for prefix in ("https://", "http://"):
+            session.mount(prefix, HTTPAdapter(pool_maxsize=max_workers))
+        _pool_size = max_workers
+
+
+# Several queries can run at once in one process (e.g. the async
+# compilers, each with its own max_workers pool), so their combined
+# requests to a host are capped by MAX_CONNECTIONS_PER_HOST when it is
+# set. None leaves concurrency to max_workers alone.
+MAX_CONNECTIONS_PER_HOST = None
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+@contextmanager
+def _host_slot(url):
+    """Hold one of `url`'s host's MAX_CONNECTIONS_PER_HOST slots."""
+    limit = MAX_CONNECTIONS_PER_HOST
+    if not limit:
+        yield
+        return
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None or slot[0] != limit:
+            slot = (limit, threading.BoundedSemaphore(limit))
+            _host_slots[host] = slot
+    with slot[1]:
+        yield
+
+
+# Downloads run concurrently when the compilers are given max_workers.
+# Two threads can still be asked for the same destination file (e.g.
+# a multi-chunk archive and its neighbour), so each destination path
+# gets a lock held across its download and extraction. Re-entrant
+# because download_unzip_csv holds it while calling download_to_path.
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def _lock_for_path(path):
+    with _path_locks_guard:
+        return _path_locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+# Nemweb drops connections and answers 5xx / 429 often enough on long
+# scans that one bad response shouldn't abort a multi-year compile.
+# download_to_path retries these up to DOWNLOAD_RETRIES times, waiting
+# RETRY_BACKOFF_SECONDS, then twice that, and so on (or longer if a 429
+# says so with Retry-After), and resumes a dropped download from the
+# bytes already received rather than starting over. Any other 4xx is
+# raised straight away. Set DOWNLOAD_RETRIES to 0 to turn retries off.
+DOWNLOAD_RETRIES = 4
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 
 # ---------------------------------------------------------------------------
 # Parent-directory HTML cache (powers the missing-file pre-check below)
@@ -45,6 +127,24 @@ session.headers.update({
 # exposed at module scope so tests can clear it between cases — see the
 # autouse `_clear_downloader_html_cache` fixture in tests/conftest.py.
 _html_cache: TTLCache = TTLCache(maxsize=2**10, ttl=60 * 60)
+# TTLCache isn't thread-safe on its own; see max_workers above.
+_html_cache_lock = threading.Lock()
+
+# Callers that know their cache directory (the fetch loop, via the
+# download's destination) also keep listings there in a ListingCache,
+# so a new process starts warm. A listing fetched less than
+# LISTING_TTL_SECONDS ago is used as it is, as is the listing of a
+# monthly archive AEMO has finished publishing (see
+# `_listing_never_changes`), however old. A listing up to
+# LISTING_STALE_SECONDS old is still used to confirm a file *is* listed,
+# while a background thread fetches a fresh copy; whether a file is
+# missing is only ever answered from a fresh listing, fetched there and
+# then if need be, so a file published since is never skipped.
+LISTING_TTL_SECONDS = 60 * 60
+LISTING_STALE_SECONDS = 24 * 60 * 60
+# Background refreshes in flight, by URL, so each is only started once.
+_listing_refreshes = {}
+_listing_refreshes_lock = threading.Lock()
 
 # Nemweb's directory-listed archive trees. Other AEMO endpoints (e.g.
 # the hashed PUBLIC_ARCHIVE# files under aemo_mms_url) don't have a
@@ -55,22 +155,194 @@ _NEMWEB_HTML_PRECHECK_PREFIXES = (
 )
 
 
-@cached(_html_cache)
-def download_html(url):
+def download_html(url, cache_dir=None):
     """Fetch `url` and return its body as text. Cached at module scope
-    for ~1 hour — see `_html_cache` for the rationale."""
-    r = session.get(url)
-    r.raise_for_status()
-    return r.text
+    for ~1 hour — see `_html_cache` for the rationale — and, given a
+    `cache_dir`, in that directory's listing cache."""
+    return _cached_html(url, cache_dir)[0]
 
 
-def download_html_as_soup(url):
+def download_html_as_soup(url, cache_dir=None):
     """BeautifulSoup-parsed view of `url`'s HTML body. Backed by the
-    same TTL cache as `download_html`."""
-    return BeautifulSoup(download_html(url), "html.parser")
+    same caches as `download_html`."""
+    return BeautifulSoup(download_html(url, cache_dir), "html.parser")
+
+
+def _cached_html(url, cache_dir, allow_stale=False):
+    """(body, fresh) for the listing at `url`. With `allow_stale`, a
+    listing from `cache_dir` older than LISTING_TTL_SECONDS (but not
+    LISTING_STALE_SECONDS) is returned with fresh=False, for the caller
+    to refresh (see `_refresh_listing_in_background`); otherwise it is
+    fetched again."""
+    with _html_cache_lock:
+        body = _html_cache.get(url)
+    if body is not None:
+        return body, True
+    if cache_dir is not None:
+        cached = ListingCache(cache_dir).get(url)
+        if cached is not None:
+            body, age = cached
+            if age < LISTING_TTL_SECONDS or _listing_never_changes(url):
+                with _html_cache_lock:
+                    _html_cache[url] = body
+                return body, True
+            if allow_stale and age < LISTING_STALE_SECONDS:
+                return body, False
+    return _fetch_listing(url, cache_dir), True
+
+
+def _fetch_listing(url, cache_dir):
+    with _host_slot(url):
+        r = session.get(url)
+    r.raise_for_status()
+    body = r.text
+    with _html_cache_lock:
+        _html_cache[url] = body
+    if cache_dir is not None:
+        ListingCache(cache_dir).store(url, body)
+    return body
+
+
+def _listing_never_changes(url):
+    """True for the listing of a monthly MMSDM archive directory at
+    least `asof_index.PUBLICATION_LAG_MONTHS` old, which AEMO has
+    finished publishing, so a cached copy never goes stale."""
+    match = re.search(r"/MMSDM_(\d{4})_(\d{2})/", url)
+    if match is None:
+        return False
+    from .asof_index import past_publication_lag
+
+    year, month = int(match.group(1)), int(match.group(2))
+    return past_publication_lag(datetime(year + month // 12, month % 12 + 1, 1))
+
+
+def _refresh_listing_in_background(url, cache_dir):
+    def refresh():
+        try:
+            _fetch_listing(url, cache_dir)
+        except Exception as e:
+            logger.debug(f"Could not refresh listing {url} ({e})")
+        finally:
+            with _listing_refreshes_lock:
+                _listing_refreshes.pop(url, None)
+
+    with _listing_refreshes_lock:
+        if url in _listing_refreshes:
+            return
+        # Not a daemon, so the interpreter waits for it at exit and a
+        # short-lived job still saves the listing it fetched.
+        thread = threading.Thread(target=refresh)
+        _listing_refreshes[url] = thread
+    thread.start()
+
+
+def _listing_index(url, cache_dir, allow_stale=False):
+    """(_LinkIndex, fresh) for the listing at `url`; see `_cached_html`."""
+    body, fresh = _cached_html(url, cache_dir, allow_stale)
+    return _link_index(url, body), fresh
+
 
+@lru_cache(maxsize=2**7)
+def _link_index(url, body):
+    # Keyed on the body too, so a refreshed listing gets a new index. The
+    # body string comes back from _html_cache as the same object on every
+    # call, so a hit is an identity check rather than a comparison.
+    return _LinkIndex(url, body)
+
+
+class _LinkIndex:
+    """
+    The links in a directory listing, parsed once so lookups don't
+    re-parse the HTML and scan every <a> tag. The Reports/Current pages
+    hold thousands of links and the daily tables look one up per day.
+
+    `urls` holds each href made absolute against the listing URL, without
+    its fragment, for membership tests. For finding a link by a stub
+    (e.g. "PUBLIC_DAILY_20240101" or "BIDMOVE_COMPLETE_20240101"),
+    `_suffixes` holds every tail of each link's file name that starts at
+    the beginning or after a "_", sorted, so the stubs' usual form is
+    found by bisection.
+    """
+
+    def __init__(self, url, body):
+        soup = BeautifulSoup(body, "html.parser")
+        self.hrefs = [a["href"] for a in soup.find_all("a", href=True)]
+        self.urls = frozenset(urldefrag(urljoin(url, href))[0] for href in self.hrefs)
+        suffixes = []
+        for position, href in enumerate(self.hrefs):
+            name = href.rstrip("/").rsplit("/", 1)[-1]
+            suffixes.append((name, position))
+            start = name.find("_") + 1
+            while start:
+                suffixes.append((name[start:], position))
+                start = name.find("_", start) + 1
+        suffixes.sort()
+        self._suffixes = suffixes
+
+    def __contains__(self, absolute_url):
+        return urldefrag(absolute_url)[0] in self.urls
+
+    def find(self, stub_link):
+        """The first link, in page order, containing `stub_link`, or None."""
+        first = None
+        i = bisect_left(self._suffixes, (stub_link,))
+        while i < len(self._suffixes) and self._suffixes[i][0].startswith(stub_link):
+            position = self._suffixes[i][1]
+            first = position if first is None else min(first, position)
+            i += 1
+        if first is None:
+            # Stubs not starting at a "_" boundary (or matching the path
+            # rather than the file name) are still found, the slow way.
+            first = next(
+                (p for p, href in enumerate(self.hrefs) if stub_link in href), None
+            )
+        return None if first is None else self.hrefs[first]
+
+
+def listing_urls(start_time, end_time):
+    """
+    The nemweb directory listings NEMOSIS reads when fetching data for
+    `start_time` to `end_time`: the monthly MMS archive directories the
+    missing-file pre-check looks in, and the current data pages the
+    daily tables find their files on.
+    """
+    from .date_generators import year_and_month_gen
+
+    urls = []
+    for year, month, _, _ in year_and_month_gen(start_time, end_time):
+        archive = format_aemo_url(defaults.aemo_mms_url, year, month, "")
+        urls.append(urljoin(archive, "./"))
+    for page in defaults.current_data_page_urls.values():
+        urls.append(defaults.nem_web_domain_url + page)
+    return urls
+
+
+def prewarm_listings(urls, cache_dir, max_workers=None):
+    """
+    Fetch each listing in `urls` into `cache_dir`'s listing cache, unless
+    it is already there and fresh. Listings that can't be fetched are
+    logged and skipped. Returns the URLs now cached.
+    """
+    def warm(url):
+        try:
+            _cached_html(url, cache_dir)
+            return url
+        except Exception as e:
+            logger.warning(f"Could not fetch listing {url} ({e})")
+            return None
+
+    if max_workers:
+        size_connection_pool(max_workers)
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            warmed = list(pool.map(warm, urls))
+    else:
+        warmed = [warm(url) for url in urls]
+    return [url for url in warmed if url is not None]
 
-def _pre_check_file_is_missing(file_url):
+
+def _pre_check_file_is_missing(file_url, cache_dir=None):
     """Return True if `file_url`'s parent directory listing is reachable
     and the file is NOT linked from it, False if it IS linked, or None
     when no parent listing is available (non-nemweb URL, non-archive
@@ -78,7 +350,10 @@ def _pre_check_file_is_missing(file_url):
 
     A True answer lets the caller skip a guaranteed-404 round-trip.
     A None answer means the caller should fall through to a real
-    request and let any 404 surface the normal way.
+    request and let any 404 surface the normal way. A stale listing from
+    `cache_dir` can answer False (and is then refreshed in the
+    background) but not True, so a file it doesn't list is looked for
+    again in a freshly fetched listing.
     """
     if not any(file_url.startswith(prefix) for prefix in _NEMWEB_HTML_PRECHECK_PREFIXES):
         return None
@@ -87,25 +362,30 @@ def _pre_check_file_is_missing(file_url):
 
     parent_url = urljoin(file_url, "./")
     try:
-        soup = download_html_as_soup(parent_url)
+        links, fresh = _listing_index(parent_url, cache_dir, allow_stale=True)
+        if not fresh:
+            if file_url in links:
+                _refresh_listing_in_background(parent_url, cache_dir)
+                return False
+            # May have been published since the stale listing was fetched.
+            links, fresh = _listing_index(parent_url, cache_dir)
     except Exception:
         # Parent listing unreachable — fall through to a real request.
         return None
 
-    target = urldefrag(file_url)[0]
-    for a_tag in soup.find_all("a", href=True):
-        absolute = urljoin(parent_url, a_tag["href"])
-        if urldefrag(absolute)[0] == target:
-            return False
-    return True
+    return file_url not in links
 
 
-def run(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
+def run(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True, extract=True):
     """
     Returns True if a network fetch occurred, False if a cached zip
     was reused, or None if the attempt failed (in which case a warning
     has already been emitted). Callers use this to log honestly about
     whether AEMO was contacted (see _download_data).
+
+    With extract=False the archive is only downloaded (to
+    `mms_archive_path`), for callers that read the CSV straight out of
+    the zip; keep_zip is then the caller's business.
     """
 
     url = defaults.aemo_mms_url
@@ -114,109 +394,124 @@ def run(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=Tr
 
     # Perform the download, unzipping saving of the file
     try:
-        return download_unzip_csv(url_formatted, down_load_to, keep_zip=keep_zip)
+        return download_unzip_csv(
+            url_formatted, down_load_to, keep_zip=keep_zip, extract=extract
+        )
     except Exception as e:
         if chunk == 1:
             logger.warning(f"{filename_stub} not downloaded ({e})")
         return None
 
 
-def run_bid_tables(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
+def run_bid_tables(
+    year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True, extract=True,
+    keep_all_sections=False,
+):
+    # Monthly bid archives hold one table each, so keep_all_sections only
+    # applies to the daily BIDMOVE_COMPLETE files.
     if day is None:
-        return run(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=keep_zip)
+        return run(
+            year, month, day, chunk, index, filename_stub, down_load_to,
+            keep_zip=keep_zip, extract=extract,
+        )
     else:
         try:
             filename_stub = "BIDMOVE_COMPLETE_{year}{month}{day}".format(year=year, month=month, day=day)
             download_url = _get_current_url(
                 filename_stub,
-                defaults.current_data_page_urls["BIDDING"])
+                defaults.current_data_page_urls["BIDDING"],
+                down_load_to)
             return _download_and_unpack_bid_move_complete_files(
-                download_url, down_load_to, keep_zip=keep_zip
+                download_url, down_load_to, keep_zip=keep_zip,
+                keep_all_sections=keep_all_sections,
             )
         except Exception as e:
             logger.warning(f"{filename_stub} not downloaded ({e})")
             return None
 
 
-def run_next_day_region_tables(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
+def run_next_day_region_tables(
+    year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True,
+    keep_all_sections=False,
+):
     try:
         filename_stub = "PUBLIC_DAILY_{year}{month}{day}".format(year=year, month=month, day=day)
         download_url = _get_current_url(
             filename_stub,
-            defaults.current_data_page_urls["DAILY_REGION_SUMMARY"])
+            defaults.current_data_page_urls["DAILY_REGION_SUMMARY"],
+            down_load_to)
         return _download_and_unpack_next_region_tables(
-            download_url, down_load_to, keep_zip=keep_zip
+            download_url, down_load_to, keep_zip=keep_zip,
+            keep_all_sections=keep_all_sections,
         )
     except Exception as e:
         logger.warning(f"{filename_stub} not downloaded ({e})")
         return None
 
 
-def run_next_dispatch_tables(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
+def run_next_dispatch_tables(
+    year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True,
+    keep_all_sections=False,
+):
     try:
         filename_stub = "PUBLIC_NEXT_DAY_DISPATCH_{year}{month}{day}".format(year=year, month=month, day=day)
         download_url = _get_current_url(
             filename_stub,
-            defaults.current_data_page_urls["NEXT_DAY_DISPATCHLOAD"])
-        return _download_and_unpack_next_dispatch_load_files_complete_files(download_url, down_load_to, keep_zip=keep_zip)
+            defaults.current_data_page_urls["NEXT_DAY_DISPATCHLOAD"],
+            down_load_to)
+        return _download_and_unpack_next_dispatch_load_files_complete_files(
+            download_url, down_load_to, keep_zip=keep_zip,
+            keep_all_sections=keep_all_sections,
+        )
     except Exception as e:
         logger.warning(f"{filename_stub} not downloaded ({e})")
         return None
 
 
-def run_intermittent_gen_scada(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
+def run_intermittent_gen_scada(
+    year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True,
+    keep_all_sections=False,
+):
     try:
         download_url = _get_current_url(
             filename_stub,
-            defaults.current_data_page_urls["INTERMITTENT_GEN_SCADA"])
-        return _download_and_unpack_intermittent_gen_scada_file(download_url, down_load_to, keep_zip=keep_zip)
+            defaults.current_data_page_urls["INTERMITTENT_GEN_SCADA"],
+            down_load_to)
+        return _download_and_unpack_intermittent_gen_scada_file(
+            download_url, down_load_to, keep_zip=keep_zip,
+            keep_all_sections=keep_all_sections,
+        )
     except Exception as e:
         logger.warning(f"{filename_stub} not downloaded ({e})")
         return None
 
 
-def _get_current_url(filename_stub, current_page_url):
+def _get_current_url(filename_stub, current_page_url, cache_dir=None):
     sub_url = _get_matching_link(
         url=defaults.nem_web_domain_url + current_page_url,
-        stub_link=filename_stub)
+        stub_link=filename_stub,
+        cache_dir=cache_dir)
     return defaults.nem_web_domain_url + sub_url
 
 
 def _download_and_unpack_bid_move_complete_files(
-    download_url, down_load_to, keep_zip=True
+    download_url, down_load_to, keep_zip=True, keep_all_sections=False
 ):
     zip_local_path, downloaded = download_to_dir(download_url, down_load_to)
+    others = None
+    if keep_all_sections:
+        others = lambda file_name, header: _section_path(
+            down_load_to, "PUBLIC_BIDMOVE_COMPLETE", header, file_name[24:32]
+        )
     try:
-        with zipfile.ZipFile(zip_local_path) as zipped_file:
-
-            file_name = zipped_file.namelist()[
-                0
-            ]  # Just one file so we can pull it out of the list using 0
-            start_row_second_table = _find_start_row_nth_table(
-                zipped_file, file_name, 2
-            )
-            csv_file = zipped_file.open(file_name)
-            BIDDAYOFFER_D = pd.read_csv(
-                csv_file, header=1, nrows=start_row_second_table - 3, dtype=str
-            )
-            BIDDAYOFFER_D.to_csv(
-                os.path.join(
-                    down_load_to,
-                    "PUBLIC_DVD_BIDDAYOFFER_D_" + file_name[24:32] + ".csv",
-                ),
-                index=False,
-            )
-            csv_file = zipped_file.open(file_name)
-            BIDPEROFFER_D = pd.read_csv(
-                csv_file, header=start_row_second_table - 1, dtype=str
-            )[:-1]
-            BIDPEROFFER_D.to_csv(
-                os.path.join(
-                    down_load_to,
-                    "PUBLIC_DVD_BIDPEROFFER_D_" + file_name[24:32] + ".csv",
-                ),
-                index=False,
-            )
+        _unpack_report_sections(zip_local_path, lambda file_name: {
+            1: os.path.join(
+                down_load_to, "PUBLIC_DVD_BIDDAYOFFER_D_" + file_name[24:32] + ".csv"
+            ),
+            2: os.path.join(
+                down_load_to, "PUBLIC_DVD_BIDPEROFFER_D_" + file_name[24:32] + ".csv"
+            ),
+        }, others=others)
     finally:
         if downloaded and not keep_zip and os.path.isfile(zip_local_path):
             os.unlink(zip_local_path)
@@ -224,33 +519,20 @@ def _download_and_unpack_bid_move_complete_files(
 
 
 def _download_and_unpack_next_region_tables(
-    download_url, down_load_to, keep_zip=True
+    download_url, down_load_to, keep_zip=True, keep_all_sections=False
 ):
     zip_local_path, downloaded = download_to_dir(download_url, down_load_to)
+    others = None
+    if keep_all_sections:
+        others = lambda file_name, header: _section_path(
+            down_load_to, "PUBLIC_DAILY", header, file_name[13:21]
+        )
     try:
-        with zipfile.ZipFile(zip_local_path) as zipped_file:
-
-            file_name = zipped_file.namelist()[
-                0
-            ]  # Just one file so we can pull it out of the list using 0
-            start_row_second_table = _find_start_row_nth_table(
-                zipped_file, file_name, 2
-            )
-            start_row_third_table = _find_start_row_nth_table(
-                zipped_file, file_name, 3
-            )
-            csv_file = zipped_file.open(file_name)
-            DAILY_REGION_SUMMARY = pd.read_csv(
-                csv_file, header=start_row_second_table - 1,
-                nrows=start_row_third_table - start_row_second_table - 1, dtype=str
-            )
-            DAILY_REGION_SUMMARY.to_csv(
-                os.path.join(
-                    down_load_to,
-                    "PUBLIC_DAILY_REGION_SUMMARY_" + file_name[13:21] + ".csv",
-                ),
-                index=False,
-            )
+        _unpack_report_sections(zip_local_path, lambda file_name: {
+            2: os.path.join(
+                down_load_to, "PUBLIC_DAILY_REGION_SUMMARY_" + file_name[13:21] + ".csv"
+            ),
+        }, others=others)
     finally:
         if downloaded and not keep_zip and os.path.isfile(zip_local_path):
             os.unlink(zip_local_path)
@@ -258,29 +540,20 @@ def _download_and_unpack_next_region_tables(
 
 
 def _download_and_unpack_next_dispatch_load_files_complete_files(
-    download_url, down_load_to, keep_zip=True
+    download_url, down_load_to, keep_zip=True, keep_all_sections=False
 ):
     zip_local_path, downloaded = download_to_dir(download_url, down_load_to)
+    others = None
+    if keep_all_sections:
+        others = lambda file_name, header: _section_path(
+            down_load_to, "PUBLIC_NEXT_DAY_DISPATCH", header, file_name[25:33]
+        )
     try:
-        with zipfile.ZipFile(zip_local_path) as zipped_file:
-
-            file_name = zipped_file.namelist()[
-                0
-            ]  # Just one file so we can pull it out of the list using 0
-            start_row_second_table = _find_start_row_nth_table(
-                zipped_file, file_name, 2
-            )
-            csv_file = zipped_file.open(file_name)
-            NEXT_DAY_DISPATCHLOAD = pd.read_csv(
-                csv_file, header=1, nrows=start_row_second_table - 3, dtype=str
-            )
-            NEXT_DAY_DISPATCHLOAD.to_csv(
-                os.path.join(
-                    down_load_to,
-                    "PUBLIC_NEXT_DAY_DISPATCHLOAD_" + file_name[25:33] + ".csv",
-                ),
-                index=False,
-            )
+        _unpack_report_sections(zip_local_path, lambda file_name: {
+            1: os.path.join(
+                down_load_to, "PUBLIC_NEXT_DAY_DISPATCHLOAD_" + file_name[25:33] + ".csv"
+            ),
+        }, others=others)
     finally:
         if downloaded and not keep_zip and os.path.isfile(zip_local_path):
             os.unlink(zip_local_path)
@@ -288,79 +561,198 @@ def _download_and_unpack_next_dispatch_load_files_complete_files(
 
 
 def _download_and_unpack_intermittent_gen_scada_file(
-    download_url, down_load_to, keep_zip=True
+    download_url, down_load_to, keep_zip=True, keep_all_sections=False
 ):
     zip_local_path, downloaded = download_to_dir(download_url, down_load_to)
+    others = None
+    if keep_all_sections:
+        others = lambda file_name, header: _section_path(
+            down_load_to, "PUBLIC_NEXT_DAY_INTERMITTENT_GEN_SCADA", header, file_name[39:47]
+        )
     try:
-        with zipfile.ZipFile(zip_local_path) as zipped_file:
-
-            file_name = zipped_file.namelist()[
-                0
-            ]  # Just one file so we can pull it out of the list using 0
-            start_row_second_table = _find_start_row_nth_table(
-                zipped_file, file_name, 1
-            )
-            csv_file = zipped_file.open(file_name)
-            data = pd.read_csv(
-                csv_file, header=1, dtype=str
-            )[:-1]
-            data.to_csv(
-                os.path.join(
-                    down_load_to,
-                    "PUBLIC_NEXT_DAY_INTERMITTENT_GEN_SCADA_" + file_name[39:47] + ".csv",
-                ),
-                index=False,
-            )
+        _unpack_report_sections(zip_local_path, lambda file_name: {
+            1: os.path.join(
+                down_load_to,
+                "PUBLIC_NEXT_DAY_INTERMITTENT_GEN_SCADA_" + file_name[39:47] + ".csv",
+            ),
+        }, others=others)
     finally:
         if downloaded and not keep_zip and os.path.isfile(zip_local_path):
             os.unlink(zip_local_path)
     return downloaded
 
 
-def _find_start_row_nth_table(sub_folder_zipfile, file_name, n):
-    row = 0
-    table_start_rows_found = 0
-    with sub_folder_zipfile.open(file_name) as f:
-        for line in f:
-            row += 1
-            if str(line)[2] == "I":
-                table_start_rows_found += 1
-                table_start_row = row
-                if table_start_rows_found == n:
-                    return table_start_row
-    raise custom_errors.DataFormatError(
-        "The data in table BIDMOVE_COMPLETE was not in the expected format. \n"
-        + "Please contact the NEMOSIS package maintainers."
-    )
+def _unpack_report_sections(zip_local_path, outputs, others=None):
+    """
+    Copy sections of the CSV in an AEMO multi-report zip to their own CSV
+    files, decompressing it once. `outputs` is called with the CSV's name
+    and returns {section position (1-based): destination path}. If given,
+    `others` is called as others(file_name, header) for each remaining
+    section and returns a destination path for it, or None to skip it.
+    Each file is written to a .part file and only moved into place once
+    all of them are complete.
+    """
+    with zipfile.ZipFile(zip_local_path) as zipped_file:
+        # Just one file so we can pull it out of the list using 0
+        file_name = zipped_file.namelist()[0]
+        required = outputs(file_name)
+        destinations = dict(required)
+        sinks = {}
+
+        def route(position, header):
+            if position not in destinations and others is not None:
+                path = others(file_name, header)
+                # Two sections can't share a file, nor take a required one's.
+                if path is not None and path not in destinations.values():
+                    destinations[position] = path
+            if position not in destinations:
+                return None
+            sinks[position] = open(destinations[position] + ".part", "wb")
+            return sinks[position]
 
+        try:
+            try:
+                with zipped_file.open(file_name) as f:
+                    split_mms_sections(f, route)
+            finally:
+                for sink in sinks.values():
+                    sink.close()
+            missing = sorted(set(required) - set(sinks))
+            if missing:
+                raise custom_errors.DataFormatError(
+                    f"The data in {file_name} was not in the expected format "
+                    f"(no section {missing[0]}). \n"
+                    + "Please contact the NEMOSIS package maintainers."
+                )
+            for position, path in destinations.items():
+                os.replace(path + ".part", path)
+        finally:
+            for path in destinations.values():
+                if os.path.isfile(path + ".part"):
+                    os.unlink(path + ".part")
+
+
+def _section_path(down_load_to, prefix, header, date):
+    """
+    Where keep_all_sections puts a section of a multi-report file that no
+    NEMOSIS table reads: named after the file's prefix, the section's
+    report, sub-report and version, and the file's date, e.g.
+    PUBLIC_DAILY_DUNIT_3_20260515.csv.
+    """
+    # Blank sub-reports are left out.
+    parts = [part for part in header[1:4] if part]
+    return os.path.join(
+        down_load_to, "_".join([prefix] + parts + [date]) + ".csv"
+    )
 
 
-def run_fcas4s(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
+def run_fcas4s_hour(year, month, day, chunk, index, filename_stub, down_load_to, keep_zip=True):
     """
-    Returns True if a network fetch occurred, False if a cached zip
-    was reused, or None if both fallback URLs failed (in which case a
-    warning has already been emitted unless the CSV was already on
-    disk from a prior call).
+    Writes filename_stub + ".csv" in down_load_to: every 5 min FCAS 4
+    second file for the hour `index` ("HH"), in time order, as one CSV,
+    so the hour is read and cached once rather than slot by slot.
+
+    The 5 min files come in 30 minute bundles. Slots are visited latest
+    first, trying the current then the archive URL for a slot's zip only
+    if no bundle fetched so far (or 5 min CSV left on disk by an earlier
+    version) holds it, so each bundle is fetched and opened once.
+
+    Returns True if a network fetch occurred, False if only cached zips
+    or CSVs were used, or None if no file for the hour was found (in
+    which case a warning has been emitted).
     """
-
-    # Add the year and month information to the generic AEMO data url
-    url_formatted_latest = defaults.fcas_4_url.format(year, month, day, index)
-    url_formatted_hist = defaults.fcas_4_url_hist.format(
-        year, year, month, year, month, day, index
-    )
-    # Perform the download, unzipping saving of the file
+    prefix = f"FCAS_{year}{month}{day}{index}"
+    sources = {}
+    archives = []
+    fetched = False
     try:
-        return download_unzip_csv(url_formatted_latest, down_load_to, keep_zip=keep_zip)
-    except Exception:
+        for minute in range(55, -1, -5):
+            slot_stub = f"{prefix}{minute:02d}"
+            if slot_stub in sources:
+                continue
+            csv_on_disk = os.path.join(down_load_to, slot_stub + ".csv")
+            if os.path.isfile(csv_on_disk):
+                sources[slot_stub] = (csv_on_disk, None)
+                continue
+            bundle = _fetch_fcas4s_bundle(
+                year, month, day, slot_stub[-4:], down_load_to
+            )
+            if bundle is None:
+                continue
+            zip_local_path, downloaded, members = bundle
+            archives.append((zip_local_path, downloaded))
+            fetched = fetched or downloaded
+            for stub, member in members.items():
+                if stub.startswith(prefix):
+                    sources.setdefault(stub, (zip_local_path, member))
+
+        if not sources:
+            logger.warning(f"{filename_stub} not downloaded (no FCAS files found for the hour)")
+            return None
+        slots_missing = 12 - len(sources)
+        if slots_missing > 0:
+            logger.warning(f"{filename_stub}: {slots_missing} of 12 5 min FCAS files not found")
+        _write_fcas4s_csv(sources, os.path.join(down_load_to, filename_stub + ".csv"))
+    finally:
+        if not keep_zip:
+            for zip_local_path, downloaded in archives:
+                if downloaded and os.path.isfile(zip_local_path):
+                    os.unlink(zip_local_path)
+    return fetched
+
+
+def _fetch_fcas4s_bundle(year, month, day, index, down_load_to):
+    """
+    The zip holding the 5 min FCAS file for a slot, from the current or
+    archive URL, as (local path, whether it was downloaded, {file stub:
+    member name} of its CSVs), or None if neither URL has it.
+    """
+    urls = [
+        defaults.fcas_4_url.format(year, month, day, index),
+        defaults.fcas_4_url_hist.format(year, year, month, year, month, day, index),
+    ]
+    for url in urls:
         try:
-            return download_unzip_csv(url_formatted_hist, down_load_to, keep_zip=keep_zip)
+            zip_local_path, downloaded = download_to_dir(url, down_load_to)
+            with zipfile.ZipFile(zip_local_path) as z:
+                members = {}
+                for member in z.namelist():
+                    stub, extension = os.path.splitext(os.path.basename(member))
+                    if extension.lower() == ".csv":
+                        members[stub.upper()] = member
+            return zip_local_path, downloaded, members
         except Exception as e:
-            # FCAS csvs are bundled in 30 minute bundles
-            # Check if the csv exists before warning
-            file_check = os.path.join(down_load_to, filename_stub + ".csv")
-            if not os.path.isfile(file_check):
-                logger.warning(f"{filename_stub} not downloaded {(e)}")
-            return None
+            logger.debug(f"FCAS bundle {url} not available ({e})")
+    return None
+
+
+def _write_fcas4s_csv(sources, path_and_name):
+    """Concatenates an hour's 5 min CSVs ({file stub: (path, zip member
+    or None)}) in time order, via a temporary file so a partly written
+    CSV is never mistaken for a finished one."""
+    partial = path_and_name + ".part"
+    archives = {}
+    try:
+        with open(partial, "wb") as out:
+            for stub in sorted(sources):
+                path, member = sources[stub]
+                if member is None:
+                    with open(path, "rb") as f:
+                        content = f.read()
+                else:
+                    if path not in archives:
+                        archives[path] = zipfile.ZipFile(path)
+                    content = archives[path].read(member)
+                out.write(content)
+                if content and not content.endswith(b"\n"):
+                    out.write(b"\n")
+        os.replace(partial, path_and_name)
+    finally:
+        for archive in archives.values():
+            archive.close()
+        if os.path.isfile(partial):
+            os.unlink(partial)
+
 
 def download_to_dir(url, down_load_to, force_redo=False):
     """
@@ -379,32 +771,58 @@ def download_to_dir(url, down_load_to, force_redo=False):
     # PUBLIC_DVD_* filenames don't contain `#`, so the replace is a
     # no-op for the older path. See issue #74.
     url = url.replace('#', '%2523')
-    filename = url.split('/')[-1].split('?')[0]
-    path = os.path.join(down_load_to, filename)
+    path = _local_path_for_url(url, down_load_to)
     downloaded = download_to_path(url, path, force_redo=force_redo)
     return path, downloaded
 
 
-def download_to_path(url, path_and_name, force_redo=False):
+def _local_path_for_url(url, down_load_to):
+    """Where `download_to_dir` saves `url` inside `down_load_to`."""
+    url = url.replace('#', '%2523')
+    filename = url.split('/')[-1].split('?')[0]
+    return os.path.join(down_load_to, filename)
+
+
+def download_to_path(url, path_and_name, force_redo=False, revalidate=False):
     """
     Download a file from `url` to `path_and_name`. Returns True if a
     new network fetch occurred, False if the destination already
     existed and was re-used.
 
     Idempotent — if the destination already exists, the function
-    short-circuits unless `force_redo=True`. On a write failure
-    mid-stream, the partial output file is removed before the
-    exception propagates.
+    short-circuits unless `force_redo=True`. Dropped connections, 5xx
+    and 429 responses are retried with exponential backoff, resuming
+    from the bytes already received (see `DOWNLOAD_RETRIES`). The file
+    is written to `path_and_name + ".part"` and renamed into place when
+    complete. If the retries run out the partial file is kept, with the
+    ETag or Last-Modified of the response it came from, and the next
+    call resumes it with an If-Range request, so a changed remote file
+    is fetched whole rather than spliced onto the old bytes. Other
+    failures remove the partial file before the exception propagates.
+
+    `revalidate=True` keeps the response's ETag and Last-Modified next
+    to the file (see `_validators_path`), and if the file already exists
+    asks for it again with a conditional GET: a 304 leaves the file as
+    it is and returns False. `force_redo=True` still downloads
+    unconditionally.
     """
     # See `download_to_dir` for why this is `%2523` and not `%23`.
     # Repeated here because `download_to_path` is also called directly
     # (e.g. from `download_csv`); the replace is idempotent (`%2523`
     # contains no `#`) so double-encoding via `download_to_dir` is safe.
     url = url.replace('#', '%2523')
+    with _lock_for_path(path_and_name):
+        return _download_to_path_locked(url, path_and_name, force_redo, revalidate)
+
+
+def _download_to_path_locked(url, path_and_name, force_redo, revalidate=False):
+    conditional_headers = None
     if os.path.isfile(path_and_name) and not force_redo:
-        return False
+        if not revalidate:
+            return False
+        conditional_headers = _conditional_headers(_read_validators(path_and_name, url))
 
-    if _pre_check_file_is_missing(url):
+    if _pre_check_file_is_missing(url, os.path.dirname(path_and_name) or None):
         # The parent directory's HTML listing told us this file doesn't
         # exist. Synthesise a 404 HTTPError so the caller's existing 404
         # handling (added in PR #85) fires uniformly whether the answer
@@ -418,21 +836,201 @@ def download_to_path(url, path_and_name, force_redo=False):
             response=synthetic,
         )
 
-    with session.get(url, stream=True) as response:
-        response.raise_for_status()
+    # Streamed into a .part file that is only renamed into place once
+    # complete, so the destination never holds a truncated download.
+    part_path = path_and_name + ".part"
+    if os.path.isfile(part_path) and not _if_range_header(_read_validators(part_path, url)):
+        # Left by an interrupted run with nothing to tell whether the
+        # remote file has changed since, so it can't be resumed.
+        _discard_part(part_path)
+    attempt = 0
+    while True:
         try:
-            with open(path_and_name, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=2**13):
-                    file.write(chunk)
+            # Conditional only while nothing has been received; a resumed
+            # request is already known to be fetching a changed file.
+            response_headers = _stream_to_part(
+                url, part_path,
+                None if os.path.isfile(part_path) else conditional_headers,
+            )
+            break
         except Exception as e:
-            logger.error(f"Failed to write file to {path_and_name}: {e}")
-            if os.path.isfile(path_and_name):
-                os.unlink(path_and_name)
-            raise
+            if attempt >= DOWNLOAD_RETRIES or not _is_transient(e):
+                if not isinstance(e, requests.RequestException):
+                    logger.error(f"Failed to write file to {path_and_name}: {e}")
+                if not (_is_transient(e) and _if_range_header(_read_validators(part_path, url))):
+                    _discard_part(part_path)
+                raise
+            delay = _retry_delay(e, attempt)
+            attempt += 1
+            logger.warning(
+                f"Download of {url} failed ({e}), retry {attempt} of "
+                f"{DOWNLOAD_RETRIES} in {delay:g}s"
+            )
+            time.sleep(delay)
+    if response_headers is None:
+        logger.info(f"{path_and_name} is unchanged on AEMO's server")
+        _write_validators(path_and_name, dict(_read_validators(path_and_name, url)))
+        return False
+    os.replace(part_path, path_and_name)
+    _discard_part(part_path)
+    if revalidate:
+        _write_validators(path_and_name, {
+            "url": url,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+        })
     return True
 
 
-def download_unzip_csv(url, down_load_to, keep_zip=True):
+def _stream_to_part(url, part_path, conditional_headers=None):
+    """Stream `url` into `part_path`, continuing from the end of an
+    existing partial file with a Range request. The Range is sent with
+    If-Range, using the validator saved beside the partial file when it
+    was started, so the server sends the whole file again if it has
+    changed since; that, a server that ignores the Range, or a partial
+    file with no validator saved starts it again from the beginning.
+
+    Returns the response headers, or None if `conditional_headers` were
+    sent and the server answered 304 Not Modified."""
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    if_range = _if_range_header(_read_validators(part_path, url)) if offset else None
+    if if_range:
+        headers = {"Range": f"bytes={offset}-", "If-Range": if_range}
+    else:
+        offset = 0
+        headers = dict(conditional_headers or {})
+    with _host_slot(url), session.get(url, stream=True, headers=headers or None) as response:
+        if not (offset and response.status_code == 416):
+            if response.status_code == 304 and conditional_headers:
+                return None
+            response.raise_for_status()
+            resuming = offset and response.status_code == 206
+            if not resuming:
+                _write_part_validators(part_path, url, response.headers)
+            with open(part_path, "ab" if resuming else "wb") as file:
+                for chunk in response.iter_content(chunk_size=2**13):
+                    file.write(chunk)
+            return response.headers
+    # 416: nothing past `offset`, so the partial file can't be trusted as
+    # a prefix of the current file; fetch it whole (outside the host slot
+    # this request held).
+    _discard_part(part_path)
+    return _stream_to_part(url, part_path)
+
+
+def _write_part_validators(part_path, url, response_headers):
+    """Saves the validators of the response a partial file is started
+    from, which a later resume sends back as If-Range."""
+    validators = {
+        "url": url,
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+    }
+    if _if_range_header(validators):
+        _write_validators(part_path, validators)
+    elif os.path.isfile(_validators_path(part_path)):
+        os.unlink(_validators_path(part_path))
+
+
+def _if_range_header(validators):
+    """The If-Range value for resuming a partial file with these
+    validators, or None if there is none. If-Range only accepts a strong
+    ETag, so a weak one falls back to Last-Modified."""
+    etag = validators.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return validators.get("last_modified")
+
+
+def _discard_part(part_path):
+    for path in (part_path, _validators_path(part_path)):
+        if os.path.isfile(path):
+            os.unlink(path)
+
+
+# ---------------------------------------------------------------------------
+# Validators for conditional re-downloads
+# ---------------------------------------------------------------------------
+#
+# Files fetched with revalidate=True (the static tables) keep the ETag and
+# Last-Modified AEMO sent with them, plus when they were last checked, in
+# a small JSON file beside them. The next revalidation sends them back as
+# If-None-Match / If-Modified-Since, so an unchanged file costs one 304.
+
+
+def _validators_path(path_and_name):
+    return path_and_name + ".validators.json"
+
+
+def _read_validators(path_and_name, url):
+    """The stored validators for `path_and_name` as a dict, or {} if
+    there are none or they were stored for a different URL."""
+    try:
+        with open(_validators_path(path_and_name)) as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(validators, dict) or validators.get("url") != url:
+        return {}
+    return validators
+
+
+def _write_validators(path_and_name, validators):
+    validators["checked"] = time.time()
+    part_path = _validators_path(path_and_name) + ".part"
+    try:
+        with open(part_path, "w") as f:
+            json.dump(validators, f)
+        os.replace(part_path, _validators_path(path_and_name))
+    except OSError as e:
+        # Only costs a full download next time.
+        logger.warning(f"Could not save validators for {path_and_name} ({e})")
+
+
+def _conditional_headers(validators):
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def seconds_since_validated(path_and_name):
+    """Seconds since `path_and_name` was last downloaded or confirmed
+    unchanged with AEMO, falling back to the file's modification time
+    when no validators were stored for it."""
+    try:
+        with open(_validators_path(path_and_name)) as f:
+            checked = json.load(f)["checked"]
+    except (OSError, ValueError, KeyError, TypeError):
+        checked = os.path.getmtime(path_and_name)
+    return time.time() - checked
+
+
+def _is_transient(error):
+    if isinstance(error, requests.HTTPError):
+        return (
+            error.response is not None
+            and error.response.status_code in RETRY_STATUS_CODES
+        )
+    return isinstance(error, (
+        requests.ConnectionError,
+        requests.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    ))
+
+
+def _retry_delay(error, attempt):
+    delay = RETRY_BACKOFF_SECONDS * 2**attempt
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return delay
+
+
+def download_unzip_csv(url, down_load_to, keep_zip=True, extract=True):
     """
     Download a zipped csv from a URL, extract its contents into
     `down_load_to`, and (per `keep_zip`) retain the zip on disk.
@@ -448,43 +1046,55 @@ def download_unzip_csv(url, down_load_to, keep_zip=True):
     (from a previous call, or another concurrent process) are left
     alone.
 
+    `extract=False` skips extraction (and so ignores `keep_zip`): the
+    zip is left in place for a caller that reads it directly.
+
     Returns True if a network fetch occurred, False if a cached zip
     already on disk was reused. Callers use this to log honestly
     about whether AEMO was contacted.
     """
-    zip_local_path, downloaded = download_to_dir(url, down_load_to)
-    try:
-        with zipfile.ZipFile(zip_local_path) as z:
-            z.extractall(down_load_to)
-    finally:
-        if downloaded and not keep_zip and os.path.isfile(zip_local_path):
-            os.unlink(zip_local_path)
+    with _lock_for_path(_local_path_for_url(url, down_load_to)):
+        zip_local_path, downloaded = download_to_dir(url, down_load_to)
+        if not extract:
+            return downloaded
+        try:
+            with zipfile.ZipFile(zip_local_path) as z:
+                z.extractall(down_load_to)
+        finally:
+            if downloaded and not keep_zip and os.path.isfile(zip_local_path):
+                os.unlink(zip_local_path)
     return downloaded
 
 
-def download_csv(url, path_and_name):
+def download_csv(url, path_and_name, force_redo=False, revalidate=False):
     """
     This function downloads a csv using a url,
     and saves it to a specified location.
     """
-    download_to_path(url, path_and_name)
+    return download_to_path(url, path_and_name, force_redo, revalidate)
 
 
-def download_elements_file(url, path_and_name):
+def download_elements_file(url, path_and_name, force_redo=False, revalidate=False):
     soup = download_html_as_soup(url)
     links = soup.find_all("a")
     last_file_name = links[-1].text
     link = url + last_file_name
 
-    download_to_path(link, path_and_name)
-    
+    return download_to_path(link, path_and_name, force_redo, revalidate)
 
-def download_xlsx(url, path_and_name):
+
+def download_xlsx(url, path_and_name, force_redo=False, revalidate=False):
     """
     Download an Excel (.xlsx) file from a URL and save it to the
     specified path. Used for AEMO's NEM Registration and Exemption List.
     """
-    download_to_path(url, path_and_name)
+    return download_to_path(url, path_and_name, force_redo, revalidate)
+
+
+def mms_archive_path(year, month, filename_stub, down_load_to):
+    """Local path `run` downloads the MMS archive for `filename_stub` to."""
+    url = format_aemo_url(defaults.aemo_mms_url, year, month, filename_stub)
+    return _local_path_for_url(url, down_load_to)
 
 
 def format_aemo_url(url, year, month, filename_stub):
@@ -501,10 +1111,16 @@ def status_code_return(url):
     return r.status_code
 
 
-def _get_matching_link(url, stub_link):
-    soup = download_html_as_soup(url)
-    links = [link.get("href") for link in soup.find_all("a")]
-    for link in links:
-        if stub_link in link:
-            return link
+def _get_matching_link(url, stub_link, cache_dir=None):
+    links, fresh = _listing_index(url, cache_dir, allow_stale=True)
+    link = links.find(stub_link)
+    if not fresh:
+        if link is not None:
+            _refresh_listing_in_background(url, cache_dir)
+        else:
+            # May have been published since the stale listing was fetched.
+            links, fresh = _listing_index(url, cache_dir)
+            link = links.find(stub_link)
+    if link is not None:
+        return link
     logger.warning(f"{stub_link} not downloaded because no match for {stub_link} was found on {url}")
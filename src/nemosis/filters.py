@@ -2,18 +2,19 @@ import logging
 from datetime import datetime, timedelta
 import numpy as np
 
-from nemosis.value_parser import _parse_datetime_np
+from nemosis.value_parser import _is_text_column, _parse_datetime_np
 
 logger = logging.getLogger(__name__)
 
 def filter_on_start_and_end_date(data, start_time, end_time):
     data["START_DATE"] = _parse_datetime_np(data["START_DATE"])
-    data["END_DATE"] = np.where(
-        data["END_DATE"] == "2999/12/31 00:00:00",
-        "2100/12/31 00:00:00",
-        data["END_DATE"],
-    )
-    data["END_DATE"] = _parse_datetime_np(data["END_DATE"])
+    if _is_text_column(data["END_DATE"]):
+        data["END_DATE"] = np.where(
+            data["END_DATE"] == "2999/12/31 00:00:00",
+            "2100/12/31 00:00:00",
+            data["END_DATE"],
+        )
+        data["END_DATE"] = _parse_datetime_np(data["END_DATE"])
     data = data[(data["START_DATE"] < end_time) & (data["END_DATE"] > start_time)]
     return data
 
@@ -41,19 +42,18 @@ def filter_on_run_datetime(data, start_time, end_time):
 
 
 def filter_on_timestamp(data, start_time, end_time):
-    try:
-        data["TIMESTAMP"] = _parse_datetime_np(data["TIMESTAMP"])
-    except ValueError as e:
-        logger.error(e)
-        # if date format is wrong, str may be too short
-        med_str_len = np.median(data["TIMESTAMP"].str.len())
-        not_data = data.loc[data["TIMESTAMP"].str.len() < med_str_len, :]
-        data = data.loc[data["TIMESTAMP"].str.len() >= med_str_len, :]
-        data["TIMESTAMP"] = _parse_datetime_np(data["TIMESTAMP"])
+    # Parsed once, with values that don't match the column's format (e.g.
+    # truncated strings) coming back as NaT, rather than parsing, failing
+    # and parsing the remaining rows again.
+    timestamps = _parse_datetime_np(data["TIMESTAMP"], errors="coerce")
+    malformed = (timestamps.isna() & data["TIMESTAMP"].notna()).to_numpy()
+    if malformed.any():
         logger.warning("Rows with incorrect data formats omitted")
-        logger.warning(not_data.head())
-    finally:
-        data = data[(data["TIMESTAMP"] > start_time) & (data["TIMESTAMP"] <= end_time)]
+        logger.warning(data.loc[malformed, :].head())
+        data = data.loc[~malformed, :].copy()
+        timestamps = timestamps[~malformed]
+    data["TIMESTAMP"] = timestamps
+    data = data[(data["TIMESTAMP"] > start_time) & (data["TIMESTAMP"] <= end_time)]
     return data
 
 
@@ -99,6 +99,24 @@ def filter_on_column_value(data, filter_cols, filter_values):
     return data
 
 
+# Columns each date filter above compares against the query window, as
+# (column, bounded below by start_time, bounded above by end_time). Used
+# to push a looser version of the filter down into cached parquet reads
+# so rows (and whole row groups) it would drop are never loaded; the
+# filter itself still runs on what is read. Only filters on columns in
+# AEMO's "%Y/%m/%d %H:%M:%S" format are listed, since string-typed
+# caches are compared lexicographically. filter_on_timestamp (FCAS data
+# mixes formats) and the nemlite helpers are deliberately absent.
+window_columns = {
+    filter_on_settlementdate: [("SETTLEMENTDATE", True, True)],
+    filter_on_run_datetime: [("RUN_DATETIME", True, True)],
+    filter_on_interval_datetime: [("INTERVAL_DATETIME", True, True)],
+    filter_on_effective_date: [("EFFECTIVEDATE", False, True)],
+    filter_on_last_changed: [("LASTCHANGED", False, True)],
+    filter_on_start_and_end_date: [("START_DATE", False, True), ("END_DATE", True, False)],
+}
+
+
 # Not tested, just for nemlite integration.
 def construct_interval_datetime_from_period_id(data):
     data["SETTLEMENTDATE"] = np.vectorize(date_2_interval_datetime)(
@@ -0,0 +1,74 @@
+"""Nemweb directory listings kept in a NEMOSIS cache directory.
+
+`downloader.download_html` keeps the listings it fetches in memory for an
+hour, which helps a long scan but not a scheduler that starts many short
+lived processes a day: each of them fetched the same archive directory
+listings again before it could answer its first missing-file pre-check.
+
+`ListingCache` keeps them in a SQLite table, `nemosis_listings.sqlite` in
+the cache directory, with one row per listing URL: its body and when it
+was fetched. Deciding whether a listing is still fresh is left to
+`downloader`, which owns the TTLs.
+"""
+import logging
+import os
+import sqlite3
+import time
+
+from nemosis.cache_manifest import _closing_transaction
+
+logger = logging.getLogger(__name__)
+
+LISTINGS_NAME = "nemosis_listings.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    url TEXT PRIMARY KEY,
+    fetched REAL NOT NULL,
+    body TEXT NOT NULL
+)
+"""
+
+
+class ListingCache:
+    """
+    The listings kept in one cache directory. Failures to read or write
+    the SQLite file are logged and treated as a miss, since any listing
+    can be fetched again.
+    """
+
+    def __init__(self, raw_data_location):
+        self.path = os.path.join(raw_data_location, LISTINGS_NAME)
+
+    def get(self, url):
+        """The listing at `url` as a (body, seconds since fetched) tuple,
+        or None if it isn't cached."""
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT body, fetched FROM listings WHERE url = ?", (url,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read listing cache {self.path} ({e})")
+            return None
+        if row is None:
+            return None
+        body, fetched = row
+        return body, time.time() - fetched
+
+    def store(self, url, body):
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO listings (url, fetched, body) VALUES (?, ?, ?)",
+                    (url, time.time(), body),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update listing cache {self.path} ({e})")
+
+    def _connect(self):
+        # As in CacheManifest: a connection per call, so threads never
+        # share one.
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(_SCHEMA)
+        return _closing_transaction(connection)
@@ -0,0 +1,276 @@
+"""Reader for AEMO MMS Data Model CSV files.
+
+Every MMS CSV follows the same record layout, keyed on the first field:
+
+    C,NEMP.WORLD,DVD_DISPATCHPRICE,...     <- file header comment
+    I,DISPATCH,PRICE,5,SETTLEMENTDATE,...  <- column names
+    D,DISPATCH,PRICE,5,"2018/05/01 00:05:00",...
+    ...
+    C,"END OF REPORT",1234                 <- trailer
+
+`read_mms_csv` reads the `C` and `I` rows itself, then hands the rest of
+the file to pyarrow's multithreaded CSV parser in a single pass, with
+the `I` row as column names. The trailer is dropped by the parser's
+invalid-row handler (it has the wrong number of fields), so the file is
+never scanned just to find its last line. Column selection and string
+typing are applied while parsing.
+
+The returned frame matches what `pd.read_csv` produces for the same
+data section: string columns are object dtype with NaN for empty
+fields, and with `dtype=None` integer and float columns are inferred
+the way pandas does (integer columns with gaps become float64). Columns
+whose type is already known (`column_types`, normally
+`defaults.column_types`) are cast straight to it instead.
+
+Files holding several reports one after another, each with its own `I`
+row, are split into one file per report by `split_mms_sections`.
+"""
+import csv
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+from nemosis.value_parser import _is_text_column
+
+logger = logging.getLogger(__name__)
+
+# pandas' default na_values, so empty / "NaN" / "NULL" fields come back
+# missing exactly as they did when these files were read by pd.read_csv.
+_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+
+def read_mms_csv(
+    source, dtype=None, usecols=None, nrows=None, names=None, column_types=None
+):
+    """
+    Read the data section of an AEMO MMS CSV into a DataFrame.
+
+    Args:
+        source (str or binary file object): path to the CSV, or an open
+            binary stream positioned at its start (e.g. a zip member).
+        dtype: None to infer numeric columns, or str to keep every
+            column as strings.
+        usecols (list or callable): columns to read, by name, or a
+            callable returning True for the names to keep. As with
+            pd.read_csv, columns come back in file order.
+        nrows (int): read only this many data rows.
+        names (list): column names to use in place of the `I` row.
+        column_types (dict): with dtype=None, maps column names to
+            "float", "int" or "string" to skip inference for them.
+            "datetime" columns are left as strings. Columns that don't
+            parse as their declared type are inferred as usual.
+
+    `nrows` and `names` are rarely used and are handed to pd.read_csv
+    rather than the pyarrow parser. So is any file pyarrow rejects
+    (e.g. rows with missing trailing fields, which pandas pads).
+
+    Returns:
+        data (pd.DataFrame)
+    """
+    column_types = (column_types or {}) if dtype is None else {}
+    if nrows is not None or names is not None:
+        return _read_with_pandas(source, dtype, usecols, nrows, names, column_types)
+
+    stream, close_stream = _open_binary(source)
+    try:
+        start = stream.tell() if stream.seekable() else None
+        header = _read_header(stream)
+        include_columns = _resolve_usecols(header, usecols)
+        if not include_columns:
+            # pyarrow reads every column when include_columns is empty.
+            return pd.DataFrame()
+        try:
+            table = pa_csv.read_csv(
+                stream,
+                read_options=pa_csv.ReadOptions(column_names=header),
+                parse_options=pa_csv.ParseOptions(
+                    invalid_row_handler=_skip_comment_rows
+                ),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=include_columns,
+                    column_types={column: pa.string() for column in include_columns},
+                    null_values=_NULL_VALUES,
+                    strings_can_be_null=True,
+                ),
+            )
+        except pa.ArrowInvalid as e:
+            if start is None:
+                raise
+            logger.debug(f"Falling back to pandas to read {source} ({e})")
+            stream.seek(start)
+            return _read_with_pandas(stream, dtype, usecols, nrows, names, column_types)
+    finally:
+        if close_stream:
+            stream.close()
+
+    # pd.read_csv leaves every column of a header-only file as object.
+    if dtype is None and table.num_rows:
+        table = _infer_numeric_columns(table, column_types)
+    return _to_pandas(table)
+
+
+def split_mms_sections(stream, route):
+    """
+    Walk an MMS CSV holding several reports (e.g. a BIDMOVE_COMPLETE or
+    PUBLIC_DAILY file) once, copying each `I`-headed section to its own
+    writer.
+
+    Args:
+        stream (binary file object): the CSV, e.g. an open zip member.
+        route (callable): called at each `I` row as
+            route(position, header), with the section's 1-based position
+            in the file and the row's fields (I, report, sub-report,
+            version, column names...). Returns a binary file object to
+            copy the `I` row and the section's `D` rows to, or None to
+            skip the section.
+
+    `C` rows are dropped. Rows are copied unchanged, so a section read
+    back with pd.read_csv gives the frame pd.read_csv reads for it from
+    the original file.
+
+    Returns:
+        headers (list): the fields of each section's `I` row, in file
+        order.
+    """
+    headers = []
+    sink = None
+    for line in stream:
+        kind = line[:1]
+        if kind == b"D":
+            if sink is not None:
+                sink.write(line)
+        elif kind == b"I":
+            header = next(csv.reader([line.decode("utf-8")]))
+            headers.append(header)
+            sink = route(len(headers), header)
+            if sink is not None:
+                sink.write(line)
+    return headers
+
+
+def _open_binary(source):
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        return open(source, "rb"), True
+    return source, False
+
+
+def _read_header(stream):
+    """Consume the leading `C` comment row and the `I` row, returning
+    the column names from the latter, named the way pd.read_csv names
+    them: blank fields become "Unnamed: <position>" and repeats get a
+    ".1", ".2", ... suffix."""
+    stream.readline()
+    header_line = stream.readline().decode("utf-8")
+    header = []
+    seen = {}
+    for position, column in enumerate(next(csv.reader([header_line]))):
+        if column == "":
+            column = f"Unnamed: {position}"
+        if column in seen:
+            seen[column] += 1
+            column = f"{column}.{seen[column]}"
+        else:
+            seen[column] = 0
+        header.append(column)
+    return header
+
+
+def _resolve_usecols(header, usecols):
+    if usecols is None:
+        return list(header)
+    if callable(usecols):
+        return [column for column in header if usecols(column)]
+    missing = [column for column in usecols if column not in header]
+    if missing:
+        raise ValueError(
+            f"Usecols do not match columns, columns expected but not found: {missing}"
+        )
+    wanted = set(usecols)
+    return [column for column in header if column in wanted]
+
+
+def _skip_comment_rows(row):
+    # The "C" trailer (and any other comment row) has a different field
+    # count to the data rows, which is what routes it here.
+    if row.text.startswith("C"):
+        return "skip"
+    return "error"
+
+
+def _infer_numeric_columns(table, column_types):
+    """Cast string columns that pandas would have read as numbers:
+    all-integer columns to int64 (float64 if any are missing, since
+    int64 can't hold NaN), other numeric columns to float64. Columns in
+    column_types only try their declared type ("string" and "datetime"
+    columns are left alone)."""
+    columns = []
+    for name, column in zip(table.column_names, table.columns):
+        targets = _DECLARED_TARGETS.get(column_types.get(name), (pa.int64(), pa.float64()))
+        for target in targets:
+            try:
+                cast = pc.cast(column, target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+            if target == pa.int64() and cast.null_count:
+                cast = pc.cast(cast, pa.float64())
+            column = cast
+            break
+        columns.append(column)
+    return pa.table(columns, names=table.column_names)
+
+
+_DECLARED_TARGETS = {
+    "int": (pa.int64(), pa.float64()),
+    "float": (pa.float64(),),
+    "string": (),
+    "datetime": (),
+}
+
+
+def _to_pandas(table):
+    data = table.to_pandas()
+    for column in data.columns:
+        if _is_text_column(data[column]):
+            # Arrow nulls arrive as None; pd.read_csv gives NaN.
+            values = data[column]
+            data[column] = values.where(values.notna(), np.nan)
+    return data
+
+
+def _read_with_pandas(source, dtype, usecols, nrows, names, column_types):
+    """The original two-pass read: count lines to locate the trailer,
+    then pd.read_csv skipping the first and last rows."""
+    if column_types:
+        dtype = {
+            column: str
+            for column, column_type in column_types.items()
+            if column_type in ("string", "datetime")
+        }
+    stream, close_stream = _open_binary(source)
+    try:
+        start = stream.tell()
+        last_line_number = sum(1 for _ in stream) - 1
+        stream.seek(start)
+        data = pd.read_csv(
+            stream,
+            skiprows=[0, last_line_number],
+            dtype=dtype,
+            usecols=usecols,
+            nrows=nrows,
+            names=names,
+        )
+    finally:
+        if close_stream:
+            stream.close()
+    for column in data.columns:
+        if column_types.get(column) == "float" and pd.api.types.is_numeric_dtype(data[column]):
+            data[column] = data[column].astype("float64")
+    return data
@@ -256,7 +256,7 @@ date_gen = {
     "INTERMITTENT_GEN_SCADA": date_generators.current_gen,
     "BIDDING": date_generators.bid_table_gen,
     "DAILY_REGION_SUMMARY": date_generators.current_gen,
-    "FCAS": date_generators.year_month_day_index_gen,
+    "FCAS": date_generators.year_month_day_hour_gen,
 }
 
 write_filename = {
@@ -274,5 +274,5 @@ downloader = {
     "INTERMITTENT_GEN_SCADA": downloader.run_intermittent_gen_scada,
     "BIDDING": downloader.run_bid_tables,
     "DAILY_REGION_SUMMARY": downloader.run_next_day_region_tables,
-    "FCAS": downloader.run_fcas4s,
+    "FCAS": downloader.run_fcas4s_hour,
 }
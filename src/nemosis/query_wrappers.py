@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from nemosis import defaults
@@ -48,24 +49,41 @@ def fcas4s_finalise(data, start_time, table_name):
 
 
 def most_recent_records_before_start_time(data, start_time, table_name):
+    """
+    Keep every record dated from start_time on, plus the record(s) in
+    effect at start_time: for each group in effective_date_group_col,
+    the records with the group's latest date before start_time (or, for
+    tables without group columns, the single latest record).
+
+    The latest date per group is found by numbering the groups once and
+    taking a grouped max over those numbers, and the matching rows are
+    picked out with a mask, rather than sorting every earlier record and
+    merging the per-group maximum back on
+    (see scripts/benchmark_most_recent_records.py). The
+    earlier records come after the later ones, ordered by group and
+    then by their order in data, with a fresh index.
+    """
     date_col = defaults.primary_date_columns[table_name]
     group_cols = defaults.effective_date_group_col[table_name]
-    records_from_after_start = data[data[date_col] >= start_time].copy()
-    records_from_before_start = data[data[date_col] < start_time].copy()
-    records_from_before_start = records_from_before_start.sort_values(date_col)
+    dates = data[date_col]
+    records_from_after_start = data[(dates >= start_time).to_numpy()]
+    before_start = (dates < start_time).to_numpy()
+    records_from_before_start = data[before_start]
+    dates = dates[before_start]
     if len(group_cols) > 0:
-        most_recent_from_before_start = records_from_before_start.groupby(
-            group_cols, as_index=False
-        ).last()
-        group_cols = group_cols + [date_col]
-        most_recent_from_before_start = pd.merge(
-            most_recent_from_before_start.loc[:, group_cols],
-            records_from_before_start,
-            "inner",
-            group_cols,
-        )
+        # Group numbers in sorted key order; rows with a missing key get
+        # -1 and are dropped, as groupby drops them.
+        group_numbers = records_from_before_start.groupby(
+            group_cols, sort=True, observed=True
+        ).ngroup().to_numpy()
+        latest = dates.groupby(group_numbers).transform("max")
+        is_latest = (dates == latest).to_numpy() & (group_numbers >= 0)
+        most_recent_from_before_start = records_from_before_start[is_latest].take(
+            np.argsort(group_numbers[is_latest], kind="stable")
+        ).reset_index(drop=True)
     else:
-        most_recent_from_before_start = records_from_before_start.tail(1)
+        positions = np.flatnonzero((dates == dates.max()).to_numpy())
+        most_recent_from_before_start = records_from_before_start.iloc[positions[-1:]]
 
     mod_table = pd.concat(
         [records_from_after_start, most_recent_from_before_start], sort=False
@@ -82,3 +100,70 @@ def convert_genconid_effectivedate_to_datetime_format(data, start_time, table_na
     if "GENCONID_EFFECTIVEDATE" in data.columns:
         data["GENCONID_EFFECTIVEDATE"] = _parse_datetime_np(data["GENCONID_EFFECTIVEDATE"])
     return data
+
+
+class IncrementalFinalise:
+    """
+    Applies a table's finalise functions (processing_info_maps.finalise)
+    to data that arrives one chunk at a time, for iter_dynamic_data.
+    Concatenating the frames returned by `update` and then `flush` gives
+    the same rows, in the same order, as concatenating the chunks and
+    calling the functions once.
+
+    Most finalise functions work row by row and are applied to each
+    chunk as is. The two that look across chunks keep state instead:
+
+    - most_recent_records_before_start_time: rows from start_time on
+      pass straight through; rows from before it are held back (these
+      tables are small, slowly changing configuration tables) and
+      reduced to the most recent records when flushed.
+    - drop_duplicates_by_primary_key: the primary keys of every row
+      passed through are remembered, and later rows with a seen key are
+      dropped, as drop_duplicates(keep="first") would.
+    """
+
+    def __init__(self, functions, start_time, table_name):
+        self.functions = list(functions or [])
+        self.start_time = start_time
+        self.table_name = table_name
+        self._before_start = []
+        self._seen_keys = None
+
+    def update(self, data):
+        """The finalised rows of one chunk that can be released now."""
+        return self._apply(data, self.functions)
+
+    def flush(self):
+        """The rows held back until every chunk has been seen, finalised,
+        or None if there are none."""
+        if most_recent_records_before_start_time not in self.functions:
+            return None
+        if not self._before_start:
+            return None
+        data = pd.concat(self._before_start, sort=False)
+        self._before_start = []
+        data = most_recent_records_before_start_time(data, self.start_time, self.table_name)
+        position = self.functions.index(most_recent_records_before_start_time)
+        return self._apply(data, self.functions[position + 1:])
+
+    def _apply(self, data, functions):
+        for function in functions:
+            if function is most_recent_records_before_start_time:
+                date_col = defaults.primary_date_columns[self.table_name]
+                self._before_start.append(data[data[date_col] < self.start_time])
+                data = data[data[date_col] >= self.start_time].copy()
+            elif function is drop_duplicates_by_primary_key:
+                data = self._drop_seen_keys(data)
+            else:
+                data = function(data, self.start_time, self.table_name)
+        return data
+
+    def _drop_seen_keys(self, data):
+        primary_keys = defaults.table_primary_keys[self.table_name]
+        data = data.drop_duplicates(primary_keys)
+        if self._seen_keys is None:
+            self._seen_keys = set()
+        keys = pd.MultiIndex.from_frame(data[primary_keys])
+        unseen = [key not in self._seen_keys for key in keys]
+        self._seen_keys.update(keys)
+        return data[unseen]
@@ -1,29 +1,120 @@
+import functools
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 
 from nemosis import defaults as _defaults
 
 
-def _parse_datetime_np(series):
+def _is_text_column(series):
+    """
+    True for columns holding strings: object columns, and pandas' string
+    dtypes (the default for text from pandas 3). Categorical columns are
+    not, although pandas counts categoricals of strings as string dtype.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def _parse_datetime_np(series, errors="raise"):
     """
     Attempts to parse a column into a datetime
     If unable to (because the data is not a datetime), will raise a ValueError
+
+    The format is detected from a few of the column's values (see
+    _detect_date_format) and the column is parsed once, with that
+    format. Columns that are already datetimes are returned unchanged,
+    so a column parsed by a date filter isn't parsed again by type
+    inference.
+
     Args:
         series: a numpy array (pandas column)
+        errors (str): "raise", or "coerce" to return NaT for values
+            that don't match the column's format instead of raising.
 
     Returns:
         series (np.Array)
     """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    date_format = _detect_date_format(series, errors)
+    if date_format is not None:
+        return pd.to_datetime(series, format=date_format, errors=errors)
+    return _parse_datetime_trying_formats(series, errors)
 
+
+def _parse_datetime_trying_formats(series, errors="raise"):
+    """Tries each of defaults.date_formats in turn over the whole column,
+    for columns whose format can't be detected from a sample (e.g. no
+    string values)."""
     try:
         # this first format is the most common
-        return pd.to_datetime(series, format=_defaults.date_formats[0])
+        return pd.to_datetime(series, format=_defaults.date_formats[0], errors=errors)
     except ValueError as e:
         try:
             # this format with milliseconds is used in some bidding columns
-            return pd.to_datetime(series, format=_defaults.date_formats[1])
+            return pd.to_datetime(series, format=_defaults.date_formats[1], errors=errors)
         except ValueError as e:
             # this format is used in some 4-second FCAS data
-            return pd.to_datetime(series, format=_defaults.date_formats[2])
+            return pd.to_datetime(series, format=_defaults.date_formats[2], errors=errors)
+
+
+# Values checked against each date format when detecting a column's
+# format, spread evenly over the column.
+_DATE_FORMAT_SAMPLE_SIZE = 5
+
+_DIGITS_TO_ONES = str.maketrans("0123456789", "1111111111")
+
+
+def _detect_date_format(series, errors="raise"):
+    """
+    The entry of defaults.date_formats that the column's values are in,
+    judged from a small sample of its non-missing values, or None if the
+    sample doesn't settle it: no string values, values in no known
+    format, or (with errors="raise") values in different formats. With
+    errors="coerce" the most common format in the sample is used.
+    """
+    present = np.flatnonzero(pd.notna(series.to_numpy()))
+    if len(present) == 0:
+        return None
+    positions = present[
+        np.linspace(0, len(present) - 1, _DATE_FORMAT_SAMPLE_SIZE).astype(int)
+    ]
+    formats = []
+    for value in series.iloc[np.unique(positions)]:
+        if not isinstance(value, str):
+            return None
+        formats.append(
+            _date_format_of_shape(
+                value.translate(_DIGITS_TO_ONES), tuple(_defaults.date_formats)
+            )
+        )
+    if errors == "coerce":
+        formats = [date_format for date_format in formats if date_format is not None]
+        return max(set(formats), key=formats.count) if formats else None
+    if formats[0] is not None and formats.count(formats[0]) == len(formats):
+        return formats[0]
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _date_format_of_shape(shape, date_formats):
+    """
+    The date format matching a value whose digits have all been replaced
+    by "1" (which is a valid year, month, day, hour, ... in every
+    field), so every value with the same layout - e.g. every
+    "2018/05/01 00:05:00" - shares one cache entry and is checked
+    against the formats only once per process.
+    """
+    for date_format in date_formats:
+        try:
+            datetime.strptime(shape, date_format)
+        except ValueError:
+            continue
+        return date_format
+    return None
 
 
 def _parse_column(series):
@@ -47,19 +138,112 @@ def _parse_column(series):
             return series
 
 
-def _infer_column_data_types(data):
+def _parse_declared_column(series, column_type):
+    """
+    Converts a column to its type from defaults.column_types without
+    trying the other types first. Data that doesn't fit the declared
+    type (e.g. an unexpected date format) falls back to _parse_column.
+
+    Args:
+        series: a numpy array (pandas column)
+        column_type (str): "datetime", "float", "int" or "string"
+
+    Returns:
+        series (np.Array)
+    """
+    if column_type == "string":
+        return series
+    try:
+        if column_type == "datetime":
+            return _parse_datetime_np(series)
+        numeric = pd.to_numeric(series)
+        if column_type == "float":
+            return numeric.astype("float64")
+        return numeric
+    except (ValueError, TypeError):
+        return _parse_column(series)
+
+
+def _infer_column_data_types(data, table_name=None):
     """
     Infer datatype of DataFrame assuming inference need only be carried out
-    for any columns with dtype "object". Adapted from StackOverflow.
+    for string columns. Adapted from StackOverflow.
 
-    If the column is an object type, attempt conversions to (in order of):
+    If table_name is given, columns listed in defaults.column_types are
+    converted straight to their declared type. Any other column is
+    inferred: if it holds strings (see _is_text_column), attempt
+    conversions to (in order of):
     1. datetime
     2. numeric
 
+    Columns that already have a type (e.g. read from a typed cache built
+    by cache_compiler, or parsed by a date filter) are left alone, apart
+    from integer columns declared as float, which are cast.
+
     Returns: Data with inferred types.
     """
 
     for col in data:
-        data[col] = _parse_column(data[col])
+        column_type = None
+        if table_name is not None:
+            column_type = _defaults.column_types.get(col)
+        if not _is_text_column(data[col]):
+            if column_type == "float" and pd.api.types.is_integer_dtype(data[col]):
+                data[col] = data[col].astype("float64")
+        elif column_type is None:
+            data[col] = _parse_column(data[col])
+        else:
+            data[col] = _parse_declared_column(data[col], column_type)
+
+    return data
+
+
+def _encode_categorical_columns(data):
+    """
+    Converts the string columns listed in defaults.categorical_columns to
+    pandas categoricals, which store each distinct value once. Columns
+    that are already categorical, or that aren't strings, are left alone.
 
+    Returns: data with categorical ID columns.
+    """
+    for col in data.columns:
+        if col in _defaults.categorical_columns and _is_text_column(data[col]):
+            data[col] = data[col].astype("category")
+    return data
+
+
+def _decode_categorical_columns(data):
+    """
+    Converts any categorical columns back to object, e.g. after reading a
+    dictionary-encoded cache for a caller that didn't ask for
+    categoricals.
+
+    Returns: data without categorical columns.
+    """
+    for col in data.columns:
+        if isinstance(data[col].dtype, pd.CategoricalDtype):
+            data[col] = data[col].astype(object)
     return data
+
+
+def _concat_data_tables(data_tables):
+    """
+    pd.concat for chunks that may hold categorical columns. pandas only
+    keeps a column categorical through a concat when every chunk has the
+    same categories, so each categorical column is first given the union
+    of its categories across chunks (a relabelling of the codes, not a
+    copy of the strings).
+
+    Returns: all_data (pd.DataFrame)
+    """
+    categories = {}
+    for data in data_tables:
+        for col in data.columns:
+            if isinstance(data[col].dtype, pd.CategoricalDtype):
+                categories.setdefault(col, set()).update(data[col].cat.categories)
+    for col, values in categories.items():
+        values = sorted(values)
+        for data in data_tables:
+            if col in data.columns and isinstance(data[col].dtype, pd.CategoricalDtype):
+                data[col] = data[col].cat.set_categories(values)
+    return pd.concat(data_tables, sort=False)
@@ -0,0 +1,174 @@
+"""Coverage for the as-of snapshots (`nemosis.asof_index`) used by
+tables searched from the start of the data model.
+
+Each query is compared against the same query without
+asof_snapshots=True, which scans every archive from the start of the
+data model. The fixture tree only has a few months of archives, so most
+tests move the start of the data model to April 2021 (or 2018), making
+the months they have the complete history.
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from nemosis import (
+    asof_index, data_fetch_methods, defaults, dynamic_data_compiler, processing_info_maps,
+)
+
+
+ALL_SEARCH_TABLES = sorted(
+    table for table, search_type in processing_info_maps.search_type.items()
+    if search_type == "all"
+)
+
+
+@pytest.fixture
+def history_from(monkeypatch):
+    def set_start(start):
+        monkeypatch.setattr(defaults, "nem_data_model_start_time", start)
+    return set_start
+
+
+def _with_snapshots(*args, **kwargs):
+    return dynamic_data_compiler(*args, asof_snapshots=True, **kwargs)
+
+
+def _snapshots(cache_dir, table_name):
+    return sorted(
+        path.name for path in (cache_dir / asof_index.DIRECTORY_NAME / table_name).glob("*/*.parquet")
+    )
+
+
+@pytest.mark.parametrize("table_name", ALL_SEARCH_TABLES)
+def test_snapshot_matches_full_scan(nemosis_fixture, history_from, table_name):
+    history_from("2021/04/01 00:00:00")
+    kwargs = dict(
+        start_time="2021/05/01 00:00:00", end_time="2021/05/02 00:00:00",
+        table_name=table_name,
+    )
+    expected = dynamic_data_compiler(raw_data_location=str(nemosis_fixture / "full"), **kwargs)
+    cache_dir = nemosis_fixture / "indexed"
+    built = _with_snapshots(raw_data_location=str(cache_dir), **kwargs)
+    reused = _with_snapshots(raw_data_location=str(cache_dir), **kwargs)
+
+    assert _snapshots(cache_dir, table_name) == ["202105.parquet"]
+    pd.testing.assert_frame_equal(built, expected)
+    pd.testing.assert_frame_equal(reused, expected)
+
+
+def test_snapshot_reused_without_reading_early_archives(nemosis_fixture, history_from, monkeypatch):
+    history_from("2021/04/01 00:00:00")
+    kwargs = dict(
+        start_time="2021/05/03 00:00:00", end_time="2021/05/04 00:00:00",
+        table_name="GENCONDATA", raw_data_location=str(nemosis_fixture),
+    )
+    first = _with_snapshots(**kwargs)
+
+    periods = []
+    loop = data_fetch_methods._iter_dynamic_data_fetch_loop
+
+    def spy(start_search, *args, **loop_kwargs):
+        periods.append(start_search)
+        return loop(start_search, *args, **loop_kwargs)
+
+    monkeypatch.setattr(data_fetch_methods, "_iter_dynamic_data_fetch_loop", spy)
+    second = _with_snapshots(**kwargs)
+
+    pd.testing.assert_frame_equal(first, second)
+    # Only the loop over the query's own month ran.
+    assert [(p.year, p.month) for p in periods] == [(2021, 5)]
+
+
+def test_later_snapshot_built_from_earlier_one(nemosis_fixture, history_from):
+    history_from("2018/04/01 00:00:00")
+    cache_dir = nemosis_fixture / "indexed"
+    _with_snapshots(
+        "2018/05/10 00:00:00", "2018/05/11 00:00:00", "PARTICIPANT", str(cache_dir)
+    )
+    kwargs = dict(
+        start_time="2018/06/10 00:00:00", end_time="2018/06/11 00:00:00",
+        table_name="PARTICIPANT",
+    )
+    data = _with_snapshots(raw_data_location=str(cache_dir), **kwargs)
+    expected = dynamic_data_compiler(raw_data_location=str(nemosis_fixture / "full"), **kwargs)
+    assert _snapshots(cache_dir, "PARTICIPANT") == ["201805.parquet", "201806.parquet"]
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_snapshot_not_saved_with_months_missing(nemosis_fixture):
+    # From 2015, most months before the cutoff aren't in the fixture
+    # tree, as if their downloads had failed.
+    kwargs = dict(
+        start_time="2021/05/01 00:00:00", end_time="2021/05/02 00:00:00",
+        table_name="GENCONDATA",
+    )
+    expected = dynamic_data_compiler(raw_data_location=str(nemosis_fixture / "full"), **kwargs)
+    cache_dir = nemosis_fixture / "indexed"
+    data = _with_snapshots(raw_data_location=str(cache_dir), **kwargs)
+
+    assert _snapshots(cache_dir, "GENCONDATA") == []
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_snapshot_not_saved_inside_publication_lag(nemosis_fixture, history_from, monkeypatch):
+    history_from("2021/04/01 00:00:00")
+    monkeypatch.setattr(
+        asof_index, "past_publication_lag", lambda cutoff: cutoff < datetime(2021, 5, 1)
+    )
+    _with_snapshots(
+        "2021/05/01 00:00:00", "2021/05/02 00:00:00", "GENCONDATA", str(nemosis_fixture)
+    )
+    assert _snapshots(nemosis_fixture, "GENCONDATA") == []
+
+
+def test_snapshots_off_by_default(nemosis_fixture, history_from):
+    history_from("2021/04/01 00:00:00")
+    dynamic_data_compiler(
+        "2021/05/01 00:00:00", "2021/05/02 00:00:00", "GENCONDATA", str(nemosis_fixture)
+    )
+    assert not (nemosis_fixture / asof_index.DIRECTORY_NAME).exists()
+
+
+def test_past_publication_lag():
+    cutoff = datetime(2021, 5, 1)
+    assert not asof_index.past_publication_lag(cutoff, now=datetime(2021, 6, 30))
+    assert asof_index.past_publication_lag(cutoff, now=datetime(2021, 7, 1))
+
+
+def test_snapshots_keyed_by_columns(nemosis_fixture, history_from):
+    history_from("2021/04/01 00:00:00")
+    kwargs = dict(
+        start_time="2021/05/01 00:00:00", end_time="2021/05/02 00:00:00",
+        table_name="DUDETAIL", raw_data_location=str(nemosis_fixture),
+    )
+    _with_snapshots(**kwargs)
+    narrow = _with_snapshots(
+        select_columns=["EFFECTIVEDATE", "DUID", "VERSIONNO", "REGISTEREDCAPACITY"], **kwargs
+    )
+    assert len(_snapshots(nemosis_fixture, "DUDETAIL")) == 2
+    assert list(narrow.columns) == ["EFFECTIVEDATE", "DUID", "VERSIONNO", "REGISTEREDCAPACITY"]
+
+
+def test_csv_format_does_not_write_snapshots(nemosis_fixture, history_from):
+    history_from("2021/04/01 00:00:00")
+    _with_snapshots(
+        "2021/05/01 00:00:00", "2021/05/02 00:00:00", "DUDETAIL",
+        str(nemosis_fixture), fformat="csv",
+    )
+    assert not (nemosis_fixture / asof_index.DIRECTORY_NAME).exists()
+
+
+def test_reduce_to_snapshot_keeps_latest_and_future_records():
+    data = pd.DataFrame({
+        "EFFECTIVEDATE": [
+            "2021/01/01 00:00:00", "2021/03/01 00:00:00", "2021/03/01 00:00:00",
+            "2021/02/01 00:00:00", "2021/06/01 00:00:00", None,
+        ],
+        "GENCONID": ["A", "A", "A", "B", "B", "B"],
+        "VERSIONNO": ["1", "1", "2", "1", "1", "1"],
+    })
+    snapshot = asof_index.reduce_to_snapshot(
+        data, "GENCONDATA", pd.Timestamp("2021-05-01").to_pydatetime()
+    )
+    assert snapshot.index.tolist() == [1, 2, 3, 4]
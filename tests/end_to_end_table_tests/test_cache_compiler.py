@@ -4,9 +4,14 @@ that writes typed feather / parquet files to disk for downstream consumers.
 Verifies (a) the round-trip through cache → dynamic_data_compiler preserves
 typed columns, (b) `select_columns` narrows the cached file itself, not
 just the returned frame, (c) cache directory is auto-created when missing,
-(d) keep_csv / keep_zip defaults and opt-in paths, and (e) partial cache
-files are cleaned up when a feather/parquet write fails mid-flight.
+(d) keep_csv / keep_zip defaults and opt-in paths, (e) partial cache
+files are cleaned up when a feather/parquet write fails mid-flight, and
+(f) the `n_processes` conversion pool writes the same files as a serial
+run, without queueing conversions far ahead of the downloads.
 """
+from concurrent.futures import Future
+from contextlib import contextmanager
+
 import pandas as pd
 import pytest
 
@@ -268,3 +273,169 @@ def test_write_to_format_cleans_up_partial_file_on_failure(tmp_path, monkeypatch
     assert not target.exists(), (
         f"partial {fformat} file should have been cleaned up after the write failure"
     )
+    assert list(tmp_path.iterdir()) == [], "temporary file should be removed too"
+
+
+@pytest.mark.parametrize("fformat", ["feather", "parquet"])
+def test_write_to_format_failure_keeps_previous_file(tmp_path, monkeypatch, fformat):
+    """Writes go to a temporary file that is moved into place only once
+    complete, so a failed rewrite leaves the existing cache file intact
+    rather than deleting or truncating it."""
+    target = tmp_path / f"x.{fformat}"
+    original = pd.DataFrame({"a": [1, 2, 3]})
+    data_fetch_methods._write_to_format(original, fformat, str(target), {})
+
+    method = "to_feather" if fformat == "feather" else "to_parquet"
+
+    def fake_write(self, path, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"partial-bytes-from-failed-write")
+        raise IOError("simulated disk full mid-write")
+
+    monkeypatch.setattr(pd.DataFrame, method, fake_write)
+
+    with pytest.raises(IOError, match="simulated disk full"):
+        data_fetch_methods._write_to_format(original * 2, fformat, str(target), {})
+    monkeypatch.undo()
+
+    read = pd.read_feather if fformat == "feather" else pd.read_parquet
+    pd.testing.assert_frame_equal(read(target), original)
+    assert [p.name for p in tmp_path.iterdir()] == [target.name]
+
+
+@pytest.mark.parametrize("fformat", ["feather", "parquet"])
+def test_n_processes_matches_serial(nemosis_fixture, fformat):
+    """Converting on a process pool must produce the same files, with
+    the same types, as converting on the calling process. The window
+    spans the multi-chunk PUBLIC_ARCHIVE# archives from August 2024."""
+    serial_dir = nemosis_fixture / "serial"
+    pooled_dir = nemosis_fixture / "pooled"
+    for cache_dir, n_processes in ((serial_dir, None), (pooled_dir, 2)):
+        cache_compiler(
+            start_time="2024/07/31 23:00:00", end_time="2024/09/01 01:00:00",
+            table_name="DISPATCHPRICE",
+            raw_data_location=str(cache_dir),
+            fformat=fformat,
+            n_processes=n_processes,
+        )
+
+    read = pd.read_feather if fformat == "feather" else pd.read_parquet
+    serial_files = sorted(p.name for p in serial_dir.glob(f"*.{fformat}"))
+    pooled_files = sorted(p.name for p in pooled_dir.glob(f"*.{fformat}"))
+    assert serial_files and serial_files == pooled_files
+    for name in serial_files:
+        pd.testing.assert_frame_equal(read(serial_dir / name), read(pooled_dir / name))
+    assert not list(pooled_dir.glob("*.[Cc][Ss][Vv]")), "keep_csv=False default"
+    assert not list(pooled_dir.glob(".*.tmp")), "no temporary files left behind"
+
+
+def test_n_processes_respects_runtime_column_additions(nemosis_fixture, monkeypatch):
+    """Spawned workers re-import nemosis, so columns a user appends to
+    defaults.table_columns at runtime must be passed to them explicitly."""
+    monkeypatch.setitem(
+        defaults.table_columns, "DISPATCHPRICE",
+        defaults.table_columns["DISPATCHPRICE"] + ["LASTCHANGED"],
+    )
+    cache_compiler(
+        start_time=START, end_time=END,
+        table_name="DISPATCHPRICE",
+        raw_data_location=str(nemosis_fixture),
+        n_processes=2,
+    )
+    parquet_files = list(nemosis_fixture.glob("*.parquet"))
+    assert parquet_files
+    for path in parquet_files:
+        assert "LASTCHANGED" in pd.read_parquet(path).columns, path
+
+
+# ---------------------------------------------------------------------------
+# The conversion queue. These swap the process pool for an in-process one
+# whose futures only run when collected, so the loop's waits are visible.
+# ---------------------------------------------------------------------------
+
+class _LazyFuture(Future):
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self._call = (fn, args, kwargs)
+
+    def run(self):
+        fn, args, kwargs = self._call
+        try:
+            self.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            self.set_exception(e)
+
+    def result(self, timeout=None):
+        if not self.done():
+            self.run()
+        return super().result(timeout)
+
+
+class _LazyPool:
+    def __init__(self):
+        self.pending = []
+        self.run_now = False
+
+    def submit(self, fn, *args, **kwargs):
+        future = _LazyFuture(fn, args, kwargs)
+        if self.run_now:
+            future.run()
+        self.pending.append(future)
+        return future
+
+
+@pytest.fixture
+def lazy_pool(monkeypatch):
+    """Replaces the conversion pool, and records how many conversions
+    were still queued each time a download started."""
+    pool = _LazyPool()
+    queued_at_download = []
+    real_download = data_fetch_methods._download_data
+
+    def recording_download(*args, **kwargs):
+        queued_at_download.append(sum(not f.done() for f in pool.pending))
+        return real_download(*args, **kwargs)
+
+    @contextmanager
+    def conversion_pool(n_processes):
+        yield pool
+
+    monkeypatch.setattr(data_fetch_methods, "_conversion_pool", conversion_pool)
+    monkeypatch.setattr(data_fetch_methods, "_download_data", recording_download)
+    return pool, queued_at_download
+
+
+def test_n_processes_bounds_queued_conversions(nemosis_fixture, lazy_pool):
+    pool, queued_at_download = lazy_pool
+    # n_processes=1 (normally no pool at all) keeps the bound, 2, below
+    # the number of files in the window.
+    cache_compiler(
+        start_time="2024/07/31 23:00:00", end_time="2024/09/01 01:00:00",
+        table_name="DISPATCHPRICE",
+        raw_data_location=str(nemosis_fixture),
+        n_processes=1,
+    )
+    assert len(pool.pending) > 2
+    assert max(queued_at_download) == 2
+    assert all(f.done() for f in pool.pending)
+
+
+def test_failed_conversion_stops_downloads(nemosis_fixture, lazy_pool, monkeypatch):
+    pool, queued_at_download = lazy_pool
+    pool.run_now = True
+
+    def failing_conversion(*_args, **_kwargs):
+        raise RuntimeError("conversion failed")
+
+    monkeypatch.setattr(data_fetch_methods, "_convert_csv_to_cache", failing_conversion)
+    with pytest.raises(RuntimeError, match="conversion failed"):
+        cache_compiler(
+            start_time="2024/07/31 23:00:00", end_time="2024/09/01 01:00:00",
+            table_name="DISPATCHPRICE",
+            raw_data_location=str(nemosis_fixture),
+            n_processes=2,
+        )
+    # Raised once the first conversion was collected, before the next
+    # period was downloaded.
+    assert len(pool.pending) == 1
+    assert len(queued_at_download) == 1
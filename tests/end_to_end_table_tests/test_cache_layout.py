@@ -0,0 +1,85 @@
+"""Coverage for `cache_layout="partitioned"`, which caches each table as
+a hive-partitioned parquet dataset
+(`table=<TABLE>/year=<YYYY>/month=<MM>/part-<archive>.parquet`) rather
+than one flat file per archive.
+
+Queries must return the same rows as the flat layout; only the order
+differs, since part files are sorted by date and primary key. The
+window used here spans the July → August 2024 switch to the multi-chunk
+`PUBLIC_ARCHIVE#...#FILE01#` archives.
+"""
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from nemosis import cache_compiler, defaults, dynamic_data_compiler
+
+
+START = "2024/07/31 23:00:00"
+END = "2024/09/01 01:00:00"
+SORT_COLUMNS = ["SETTLEMENTDATE", "REGIONID", "INTERVENTION"]
+
+
+def _sorted(data):
+    return data.sort_values(SORT_COLUMNS, ignore_index=True)
+
+
+def test_partitioned_result_matches_flat(nemosis_fixture):
+    flat = dynamic_data_compiler(START, END, "DISPATCHPRICE", str(nemosis_fixture / "flat"))
+    partitioned = dynamic_data_compiler(
+        START, END, "DISPATCHPRICE", str(nemosis_fixture / "partitioned"),
+        cache_layout="partitioned",
+    )
+    pd.testing.assert_frame_equal(_sorted(flat), _sorted(partitioned))
+
+
+def test_partitioned_files_layout(nemosis_fixture):
+    dynamic_data_compiler(
+        START, END, "DISPATCHPRICE", str(nemosis_fixture), cache_layout="partitioned"
+    )
+    dataset = nemosis_fixture / "table=DISPATCHPRICE"
+    parts = {p.relative_to(dataset).as_posix() for p in dataset.rglob("*.parquet")}
+    assert "year=2024/month=07/part-PUBLIC_DVD_DISPATCHPRICE_202407010000.parquet" in parts
+    assert "year=2024/month=08/part-PUBLIC_ARCHIVE-DISPATCHPRICE-FILE01-202408010000.parquet" in parts
+    assert not list(nemosis_fixture.glob("*.parquet"))
+
+
+def test_second_query_reads_partitioned_cache(nemosis_fixture, monkeypatch):
+    first = dynamic_data_compiler(
+        START, END, "DISPATCHPRICE", str(nemosis_fixture), cache_layout="partitioned"
+    )
+    for f in nemosis_fixture.glob("*.zip"):
+        f.unlink()
+    monkeypatch.setattr(defaults, "aemo_mms_url", "http://127.0.0.1:1/dead/{}/{}/{}/{}.zip")
+
+    second = dynamic_data_compiler(
+        START, END, "DISPATCHPRICE", str(nemosis_fixture), cache_layout="partitioned"
+    )
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.parametrize("n_processes", [None, 2])
+def test_cache_compiler_writes_sorted_dataset(nemosis_fixture, n_processes):
+    cache_compiler(
+        START, END, "DISPATCHPRICE", str(nemosis_fixture),
+        cache_layout="partitioned", n_processes=n_processes,
+    )
+    dataset = nemosis_fixture / "table=DISPATCHPRICE"
+    parts = sorted(dataset.rglob("*.parquet"))
+    assert parts
+    for part in parts:
+        data = pd.read_parquet(part)
+        pd.testing.assert_frame_equal(data, _sorted(data))
+        assert pq.ParquetFile(part).metadata.row_group(0).column(0).is_stats_set
+
+
+def test_dataset_readable_with_partition_pruning(nemosis_fixture):
+    cache_compiler(
+        START, END, "DISPATCHPRICE", str(nemosis_fixture), cache_layout="partitioned"
+    )
+    august = pd.read_parquet(
+        nemosis_fixture / "table=DISPATCHPRICE", filters=[("month", "=", 8)]
+    )
+    assert not august.empty
+    assert set(august["year"]) == {2024}
+    assert august["SETTLEMENTDATE"].between("2024/08/01", "2024/09/01 00:00:00").all()
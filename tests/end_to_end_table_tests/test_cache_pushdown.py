@@ -0,0 +1,166 @@
+"""Coverage for the column and row filters pushed into cached parquet
+reads (`data_fetch_methods._read_cache_file`).
+
+Each test builds a cache, then compiles the same query twice from it:
+once as normal, and once with the cache read swapped for a plain
+`pd.read_parquet` of the whole file. The pushdown only exists to read
+less, so the two frames must be identical.
+"""
+import pandas as pd
+import pytest
+
+from nemosis import cache_compiler, data_fetch_methods, defaults, dynamic_data_compiler
+
+
+def _read_whole_file(full_filename, fformat, *args, **kwargs):
+    if fformat == "feather":
+        return pd.read_feather(full_filename)
+    return pd.read_parquet(full_filename)
+
+
+def _compile_with_and_without_pushdown(monkeypatch, **kwargs):
+    pushed = dynamic_data_compiler(**kwargs)
+    with monkeypatch.context() as mp:
+        mp.setattr(data_fetch_methods, "_read_cache_file", _read_whole_file)
+        unpushed = dynamic_data_compiler(**kwargs)
+    return pushed, unpushed
+
+
+@pytest.fixture
+def read_parquet_calls(monkeypatch):
+    calls = []
+    read_parquet = pd.read_parquet
+
+    def spy(path, *args, **kwargs):
+        data = read_parquet(path, *args, **kwargs)
+        calls.append((kwargs, len(data), len(read_parquet(path))))
+        return data
+
+    monkeypatch.setattr(pd, "read_parquet", spy)
+    return calls
+
+
+@pytest.mark.parametrize("typed_cache", [False, True])
+def test_settlementdate_window_and_duid_filter(nemosis_fixture, monkeypatch, typed_cache):
+    query = dict(
+        start_time="2018/05/01 00:30:00",
+        end_time="2018/05/01 01:00:00",
+        table_name="DISPATCHLOAD",
+        raw_data_location=str(nemosis_fixture),
+        select_columns=["SETTLEMENTDATE", "DUID", "INTERVENTION", "INITIALMW"],
+        filter_cols=["DUID", "INTERVENTION"],
+        filter_values=(["AGLHAL"], [0]),
+    )
+    if typed_cache:
+        cache_compiler(
+            "2018/05/01 00:00:00", "2018/05/01 01:00:00", "DISPATCHLOAD", str(nemosis_fixture)
+        )
+    else:
+        dynamic_data_compiler(**query)
+
+    pushed, unpushed = _compile_with_and_without_pushdown(monkeypatch, **query)
+
+    pd.testing.assert_frame_equal(pushed, unpushed)
+    assert len(pushed) == 6
+    assert set(pushed["DUID"]) == {"AGLHAL"}
+
+
+def test_reads_fewer_rows_and_columns(nemosis_fixture, read_parquet_calls):
+    cache_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 01:00:00", "DISPATCHLOAD", str(nemosis_fixture)
+    )
+    read_parquet_calls.clear()
+
+    dynamic_data_compiler(
+        start_time="2018/05/01 00:30:00",
+        end_time="2018/05/01 01:00:00",
+        table_name="DISPATCHLOAD",
+        raw_data_location=str(nemosis_fixture),
+        select_columns=["SETTLEMENTDATE", "DUID", "INITIALMW"],
+        filter_cols=["DUID"],
+        filter_values=(["AGLHAL"],),
+    )
+
+    assert read_parquet_calls
+    for kwargs, _, _ in read_parquet_calls:
+        assert kwargs["columns"] == ["SETTLEMENTDATE", "DUID", "INITIALMW"]
+        assert kwargs["filters"] is not None
+    rows_read = sum(rows for _, rows, _ in read_parquet_calls)
+    rows_in_files = sum(rows for _, _, rows in read_parquet_calls)
+    assert 0 < rows_read < rows_in_files
+
+
+def test_value_filters_stay_in_pandas_for_untyped_cache(nemosis_fixture, read_parquet_calls):
+    """Type inference runs before filter_cols, so on an all-string cache
+    the filtered-out rows still decide each column's dtype."""
+    query = dict(
+        start_time="2018/05/01 00:00:00",
+        end_time="2018/05/01 01:00:00",
+        table_name="DISPATCHLOAD",
+        raw_data_location=str(nemosis_fixture),
+        select_columns=["SETTLEMENTDATE", "DUID", "INITIALMW"],
+        filter_cols=["DUID"],
+        filter_values=(["AGLHAL"],),
+    )
+    dynamic_data_compiler(**query)
+    read_parquet_calls.clear()
+
+    dynamic_data_compiler(**query)
+
+    assert read_parquet_calls
+    for kwargs, _, _ in read_parquet_calls:
+        assert "DUID" not in str(kwargs["filters"])
+
+
+def test_effective_date_table(nemosis_fixture, monkeypatch):
+    monkeypatch.setattr(defaults, "nem_data_model_start_time", "2021/05/01 00:00:00")
+    query = dict(
+        start_time="2021/05/01 00:00:00",
+        end_time="2021/05/01 01:00:00",
+        table_name="DUDETAIL",
+        raw_data_location=str(nemosis_fixture),
+        select_columns=["DUID", "EFFECTIVEDATE", "VERSIONNO", "REGISTEREDCAPACITY"],
+        filter_cols=["DUID"],
+        filter_values=(["HDWF2"],),
+    )
+    dynamic_data_compiler(**query)
+
+    pushed, unpushed = _compile_with_and_without_pushdown(monkeypatch, **query)
+
+    pd.testing.assert_frame_equal(pushed, unpushed)
+    assert set(pushed["DUID"]) == {"HDWF2"}
+
+
+def test_integer_filter_on_typed_cache(nemosis_fixture, monkeypatch):
+    cache_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 01:00:00", "DISPATCHPRICE", str(nemosis_fixture)
+    )
+    query = dict(
+        start_time="2018/05/01 00:00:00",
+        end_time="2018/05/01 01:00:00",
+        table_name="DISPATCHPRICE",
+        raw_data_location=str(nemosis_fixture),
+        filter_cols=["INTERVENTION"],
+        filter_values=([0],),
+    )
+
+    pushed, unpushed = _compile_with_and_without_pushdown(monkeypatch, **query)
+
+    pd.testing.assert_frame_equal(pushed, unpushed)
+    assert len(pushed) == 12 * pushed["REGIONID"].nunique()
+
+
+def test_feather_cache_reads_selected_columns(nemosis_fixture, monkeypatch):
+    query = dict(
+        start_time="2018/05/01 00:00:00",
+        end_time="2018/05/01 01:00:00",
+        table_name="DISPATCHPRICE",
+        raw_data_location=str(nemosis_fixture),
+        select_columns=["SETTLEMENTDATE", "REGIONID", "RRP"],
+        fformat="feather",
+    )
+    dynamic_data_compiler(**query)
+
+    pushed, unpushed = _compile_with_and_without_pushdown(monkeypatch, **query)
+
+    pd.testing.assert_frame_equal(pushed, unpushed)
@@ -66,3 +66,51 @@ def test_start_market_day_returns_0405_row_from_current_file(nemosis_fixture):
     assert set(data["SETTLEMENTDATE"].unique()) == {pd.Timestamp("2026-05-15 04:05:00")}
     assert set(data["REGIONID"]) == {"SA1", "NSW1"}
     assert not data.duplicated(["SETTLEMENTDATE", "REGIONID"]).any()
+
+
+def test_keep_all_sections_writes_other_sections(nemosis_fixture):
+    dynamic_data_compiler(
+        start_time="2026/05/15 04:00:00",
+        end_time="2026/05/15 05:00:00",
+        table_name="DAILY_REGION_SUMMARY",
+        raw_data_location=str(nemosis_fixture),
+        keep_all_sections=True,
+    )
+
+    kept = sorted(p.name for p in nemosis_fixture.glob("PUBLIC_DAILY_*_20260515.csv"))
+    assert kept == [
+        "PUBLIC_DAILY_DISPATCH_CASESOLUTION_1_20260515.csv",
+        "PUBLIC_DAILY_DISPATCH_REGIONFCASREQUIREMENT_1_20260515.csv",
+        "PUBLIC_DAILY_DREGION_3_20260515.csv",
+        "PUBLIC_DAILY_DUNIT_2_20260515.csv",
+        "PUBLIC_DAILY_DUNIT_3_20260515.csv",
+    ]
+    # The fixture keeps only the headers of sections NEMOSIS doesn't read.
+    units = pd.read_csv(nemosis_fixture / "PUBLIC_DAILY_DUNIT_3_20260515.csv")
+    assert list(units.columns[:7]) == [
+        "I", "DUNIT", "Unnamed: 2", "3", "SETTLEMENTDATE", "RUNNO", "DUID"
+    ]
+
+
+def test_keep_all_sections_off_by_default(nemosis_fixture):
+    dynamic_data_compiler(
+        start_time="2026/05/15 04:00:00",
+        end_time="2026/05/15 05:00:00",
+        table_name="DAILY_REGION_SUMMARY",
+        raw_data_location=str(nemosis_fixture),
+    )
+
+    assert not list(nemosis_fixture.glob("PUBLIC_DAILY_D*.csv"))
+
+
+def test_positional_arguments_keep_their_meaning(nemosis_fixture):
+    # keep_all_sections comes after the original parameters, so a caller
+    # passing parse_data_types positionally still sets it.
+    data = dynamic_data_compiler(
+        "2026/05/15 04:00:00", "2026/05/15 05:00:00", "DAILY_REGION_SUMMARY",
+        str(nemosis_fixture), ["SETTLEMENTDATE", "REGIONID", "TOTALDEMAND"],
+        None, None, "parquet", False, True, False,
+    )
+
+    assert data["TOTALDEMAND"].dtype == object
+    assert not list(nemosis_fixture.glob("PUBLIC_DAILY_D*.csv"))
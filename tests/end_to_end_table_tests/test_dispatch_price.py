@@ -21,7 +21,7 @@ semantics.
 import pandas as pd
 import pytest
 
-from nemosis import dynamic_data_compiler
+from nemosis import cache_compiler, dynamic_data_compiler
 
 from _boundaries import assert_boundary_shape, boundary_cases
 
@@ -134,6 +134,25 @@ def test_sub_stride_window_returns_empty(nemosis_fixture):
     assert data.empty
 
 
+@pytest.mark.parametrize("cache", ["dynamic", "cache_compiler"])
+def test_column_types_are_the_same_in_every_era(nemosis_fixture, cache):
+    """Prices are declared float in defaults.column_types, so a period
+    where a price happens to be a whole number (e.g. LOWER5MINRRP in
+    2018-05) still comes back float64, and eras concatenate cleanly."""
+    dtypes = []
+    for start in ("2018/05/01 00:00:00", "2024/08/01 00:00:00"):
+        end = start[:11] + "01:00:00"
+        if cache == "cache_compiler":
+            cache_compiler(start, end, "DISPATCHPRICE", str(nemosis_fixture))
+        data = dynamic_data_compiler(start, end, "DISPATCHPRICE", str(nemosis_fixture))
+        dtypes.append(data.dtypes)
+    # 1-second FCAS prices only exist in the later era.
+    shared = dtypes[0].index
+    pd.testing.assert_series_equal(dtypes[0], dtypes[1][shared])
+    assert dtypes[0]["LOWER5MINRRP"] == "float64"
+    assert dtypes[0]["INTERVENTION"] == "int64"
+
+
 @pytest.mark.parametrize(
     "case", boundary_cases("DISPATCHPRICE"), ids=lambda c: c.id
 )
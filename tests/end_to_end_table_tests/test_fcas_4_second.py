@@ -0,0 +1,227 @@
+"""Coverage for FCAS_4_SECOND, fetched as an hour of 5 min files at a time.
+
+AEMO's FCAS causer pays data is one headerless CSV per 5 minutes,
+bundled into 30 minute zips. The committed fixture tree has no FCAS
+data, so these tests build small bundles (named after their first
+slot, each holding that slot and the next five) and serve them from a
+local server that counts requests, to check that only the bundles a
+query needs are fetched, each once, and that an hour is cached as a
+single file.
+"""
+import http.server
+import io
+import threading
+import zipfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from nemosis import cache_compiler, defaults, dynamic_data_compiler
+
+DAY = datetime(2018, 5, 1)
+ELEMENTS = ["1", "2"]
+SAMPLES_PER_SLOT = 3
+
+
+def _slot_csv(slot_start):
+    # Like AEMO's, a slot's first sample is stamped at its start.
+    rows = []
+    for sample in range(SAMPLES_PER_SLOT):
+        timestamp = slot_start + timedelta(seconds=4 * sample)
+        for element in ELEMENTS:
+            rows.append(f"{timestamp:%Y/%m/%d %H:%M:%S},{element},2,{sample + 10.5},0\n")
+    return "".join(rows).encode()
+
+
+def _write_bundles(directory, day, bundles_missing=()):
+    for bundle in range(48):
+        bundle_start = day + timedelta(minutes=30 * bundle)
+        if bundle_start in bundles_missing:
+            continue
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as z:
+            for slot in range(6):
+                slot_start = bundle_start + timedelta(minutes=5 * slot)
+                z.writestr(f"FCAS_{slot_start:%Y%m%d%H%M}.csv", _slot_csv(slot_start))
+        (directory / f"FCAS_{bundle_start:%Y%m%d%H%M}.zip").write_bytes(buffer.getvalue())
+
+
+@pytest.fixture
+def fcas_server(tmp_path, monkeypatch):
+    """Serves tmp_path/bundles as both the current and archive FCAS
+    URLs, and counts the requests for each file."""
+    bundles = tmp_path / "bundles"
+    bundles.mkdir()
+    requests = Counter()
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(bundles), **kwargs)
+
+        def do_GET(self):
+            requests[self.path.rsplit("/", 1)[-1]] += 1
+            self.path = "/" + self.path.rsplit("/", 1)[-1]
+            super().do_GET()
+
+        def log_message(self, *_args, **_kwargs):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(defaults, "fcas_4_url", base + "/current/FCAS_{}{}{}{}.zip")
+    monkeypatch.setattr(defaults, "fcas_4_url_hist", base + "/hist/{}/{}_{}/FCAS_{}{}{}{}.zip")
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    try:
+        yield bundles, cache, requests
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+
+def _fetched(bundles, requests):
+    """{bundle name: request count} for the bundles that exist, leaving
+    out the requests for slots that aren't the first of a bundle."""
+    return {name: count for name, count in requests.items() if (bundles / name).exists()}
+
+
+def test_hour_cached_as_one_file(fcas_server):
+    bundles, cache, requests = fcas_server
+    _write_bundles(bundles, DAY)
+
+    data = dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 00:59:00", "FCAS_4_SECOND", str(cache)
+    )
+
+    # (00:00, 00:59]: every sample of the 12 slots from 00:00 to 00:55
+    # except the one stamped 00:00.
+    assert len(data) == (12 * SAMPLES_PER_SLOT - 1) * len(ELEMENTS)
+    assert data["TIMESTAMP"].min() == DAY + timedelta(seconds=4)
+    assert data["TIMESTAMP"].max() == DAY + timedelta(minutes=55, seconds=8)
+    assert sorted(p.name for p in cache.glob("*.parquet")) == ["FCAS_2018050100.parquet"]
+    # Only the hour's two bundles are fetched, once each, and no 5 min
+    # CSVs are left behind.
+    assert _fetched(bundles, requests) == {
+        "FCAS_201805010000.zip": 1, "FCAS_201805010030.zip": 1,
+    }
+    assert not list(cache.glob("*.csv"))
+
+
+def test_only_hours_in_window_fetched(fcas_server):
+    bundles, cache, requests = fcas_server
+    _write_bundles(bundles, DAY)
+    _write_bundles(bundles, DAY + timedelta(days=1))
+
+    data = dynamic_data_compiler(
+        "2018/05/01 22:10:00", "2018/05/01 23:30:00", "FCAS_4_SECOND", str(cache)
+    )
+
+    assert data["TIMESTAMP"].min() == DAY + timedelta(hours=22, minutes=10, seconds=4)
+    assert data["TIMESTAMP"].max() == DAY + timedelta(hours=23, minutes=30)
+    assert sorted(_fetched(bundles, requests)) == [
+        "FCAS_201805012200.zip", "FCAS_201805012230.zip",
+        "FCAS_201805012300.zip", "FCAS_201805012330.zip",
+    ]
+
+
+def test_sample_at_end_time_on_the_hour_kept(fcas_server):
+    bundles, cache, requests = fcas_server
+    _write_bundles(bundles, DAY)
+    _write_bundles(bundles, DAY + timedelta(days=1))
+
+    data = dynamic_data_compiler(
+        "2018/05/01 23:00:00", "2018/05/02 00:00:00", "FCAS_4_SECOND", str(cache)
+    )
+
+    # The window includes end_time, and the sample stamped then is in
+    # the first file of end_time's hour.
+    end_time = DAY + timedelta(days=1)
+    assert data["TIMESTAMP"].max() == end_time
+    assert len(data[data["TIMESTAMP"] == end_time]) == len(ELEMENTS)
+    assert len(data) == 12 * SAMPLES_PER_SLOT * len(ELEMENTS)
+    assert sorted(p.name for p in cache.glob("*.parquet")) == [
+        "FCAS_2018050123.parquet", "FCAS_2018050200.parquet",
+    ]
+
+
+def test_cached_hours_not_fetched_again(fcas_server):
+    bundles, cache, requests = fcas_server
+    _write_bundles(bundles, DAY)
+    first = dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 12:00:00", "FCAS_4_SECOND", str(cache)
+    )
+    requests.clear()
+    second = dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 12:00:00", "FCAS_4_SECOND", str(cache)
+    )
+    assert not requests
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_keep_zip_false_removes_bundles(fcas_server):
+    bundles, cache, _ = fcas_server
+    _write_bundles(bundles, DAY)
+    cache_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 01:00:00", "FCAS_4_SECOND", str(cache),
+        keep_zip=False,
+    )
+    assert (cache / "FCAS_2018050100.parquet").exists()
+    assert not list(cache.glob("*.zip"))
+
+
+def test_missing_bundle_warns_once(fcas_server, caplog):
+    bundles, cache, _ = fcas_server
+    _write_bundles(bundles, DAY, bundles_missing=[DAY + timedelta(hours=12)])
+    data = dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 23:59:00", "FCAS_4_SECOND", str(cache)
+    )
+    assert len(data) == ((288 - 6) * SAMPLES_PER_SLOT - 1) * len(ELEMENTS)
+    warnings = [r.message for r in caplog.records if "FCAS files not found" in r.message]
+    assert warnings == ["FCAS_2018050112: 6 of 12 5 min FCAS files not found"]
+
+
+def test_five_minute_csvs_on_disk_are_reused(fcas_server):
+    bundles, cache, requests = fcas_server
+    _write_bundles(bundles, DAY)
+    # Left by a version that extracted each 5 min file.
+    for slot in range(6):
+        slot_start = DAY + timedelta(minutes=5 * slot)
+        (cache / f"FCAS_{slot_start:%Y%m%d%H%M}.csv").write_bytes(_slot_csv(slot_start))
+
+    dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 01:00:00", "FCAS_4_SECOND", str(cache)
+    )
+    assert requests["FCAS_201805010000.zip"] == 0
+    assert len(pd.read_parquet(cache / "FCAS_2018050100.parquet")) == (
+        12 * SAMPLES_PER_SLOT * len(ELEMENTS)
+    )
+
+
+def test_five_minute_cache_files_are_merged(fcas_server):
+    bundles, cache, requests = fcas_server
+    _write_bundles(bundles, DAY)
+    expected = dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 01:00:00", "FCAS_4_SECOND", str(cache)
+    )
+    # Rewrite the hour as the per slot cache files an earlier version
+    # would have left, with no bundles to fall back on.
+    hour = pd.read_parquet(cache / "FCAS_2018050100.parquet")
+    slots = pd.to_datetime(hour["TIMESTAMP"], format="%Y/%m/%d %H:%M:%S").dt.floor("5min")
+    for slot_start, slot in hour.groupby(slots):
+        slot.to_parquet(cache / f"FCAS_{slot_start:%Y%m%d%H%M}.parquet", index=False)
+    (cache / "FCAS_2018050100.parquet").unlink()
+    for path in list(cache.glob("*.zip")) + list(bundles.iterdir()):
+        path.unlink()
+    requests.clear()
+
+    data = dynamic_data_compiler(
+        "2018/05/01 00:00:00", "2018/05/01 01:00:00", "FCAS_4_SECOND", str(cache)
+    )
+
+    assert not requests
+    pd.testing.assert_frame_equal(data, expected)
+    assert (cache / "FCAS_2018050100.parquet").exists()
@@ -14,10 +14,15 @@ the underlying sheet and migrated the data to a weekly archive on
 nemweb — see issue #92. The handler now raises early; coverage is the
 deprecation-error tests below.
 """
+import json
+from datetime import timedelta
+
+import pandas as pd
 import pytest
+import requests
 
-from nemosis import static_table
-from nemosis.custom_errors import UserInputError
+from nemosis import defaults, downloader, static_table
+from nemosis.custom_errors import NoDataToReturn, UserInputError
 
 
 def test_elements_fcas_returns_non_empty_frame(nemosis_fixture):
@@ -97,3 +102,139 @@ def test_generators_filter_narrows(nemosis_fixture):
 # FCAS Providers filter test removed — the table is deprecated (see
 # issue #92), so there's no longer a happy path to filter against.
 # The deprecation-error tests above cover the new behaviour.
+
+
+# ---------------------------------------------------------------------------
+# Refreshing a cached static file — update_static_file forces a new
+# download; max_age checks with AEMO using the Last-Modified / ETag kept
+# beside the file, and only downloads it again if it has changed. The mock
+# server (SimpleHTTPRequestHandler) sends Last-Modified and answers 304
+# to an If-Modified-Since at or after it.
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def response_statuses(monkeypatch):
+    statuses = []
+    real_get = downloader.session.get
+
+    def recording_get(*args, **kwargs):
+        response = real_get(*args, **kwargs)
+        statuses.append(response.status_code)
+        return response
+
+    monkeypatch.setattr(downloader.session, "get", recording_get)
+    return statuses
+
+
+def _variables_file(cache):
+    return cache / defaults.names["VARIABLES_FCAS_4_SECOND"]
+
+
+def test_update_static_file_downloads_again(nemosis_fixture):
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    original = _variables_file(nemosis_fixture).read_bytes()
+    _variables_file(nemosis_fixture).write_bytes(original[: len(original) // 2])
+
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), update_static_file=True)
+
+    assert _variables_file(nemosis_fixture).read_bytes() == original
+
+
+def test_max_age_unchanged_file_costs_one_not_modified(nemosis_fixture, response_statuses):
+    first = static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    modified = _variables_file(nemosis_fixture).stat().st_mtime_ns
+    response_statuses.clear()
+
+    second = static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), max_age=0)
+
+    assert response_statuses == [304]
+    assert _variables_file(nemosis_fixture).stat().st_mtime_ns == modified
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_max_age_not_reached_skips_the_check(nemosis_fixture, response_statuses):
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    response_statuses.clear()
+
+    static_table(
+        "VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), max_age=timedelta(hours=1)
+    )
+
+    assert response_statuses == []
+
+
+def test_max_age_changed_file_is_downloaded_again(nemosis_fixture, response_statuses):
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    original = _variables_file(nemosis_fixture).read_bytes()
+    _variables_file(nemosis_fixture).write_bytes(original[: len(original) // 2])
+    # As if AEMO has published a newer file since this one was fetched.
+    validators_path = downloader._validators_path(str(_variables_file(nemosis_fixture)))
+    with open(validators_path) as f:
+        validators = json.load(f)
+    validators["last_modified"] = "Mon, 01 Jan 2001 00:00:00 GMT"
+    with open(validators_path, "w") as f:
+        json.dump(validators, f)
+    response_statuses.clear()
+
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), max_age=0)
+
+    assert response_statuses == [200]
+    assert _variables_file(nemosis_fixture).read_bytes() == original
+
+
+@pytest.fixture
+def aemo_unreachable(monkeypatch):
+    def failing_get(*_args, **_kwargs):
+        raise requests.ConnectionError("AEMO is unreachable")
+
+    monkeypatch.setattr(downloader, "DOWNLOAD_RETRIES", 0)
+    return lambda: monkeypatch.setattr(downloader.session, "get", failing_get)
+
+
+def test_failed_check_serves_cached_file(nemosis_fixture, aemo_unreachable, caplog):
+    first = static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    original = _variables_file(nemosis_fixture).read_bytes()
+    aemo_unreachable()
+
+    with caplog.at_level("WARNING", logger="nemosis.data_fetch_methods"):
+        second = static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), max_age=0)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert _variables_file(nemosis_fixture).read_bytes() == original
+    assert "using the cached copy" in caplog.text
+
+
+def test_failed_forced_refresh_raises(nemosis_fixture, aemo_unreachable):
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    original = _variables_file(nemosis_fixture).read_bytes()
+    aemo_unreachable()
+
+    with pytest.raises(NoDataToReturn):
+        static_table(
+            "VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), update_static_file=True
+        )
+    assert _variables_file(nemosis_fixture).read_bytes() == original
+
+
+def test_check_answered_with_404_raises(nemosis_fixture, monkeypatch):
+    static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+    monkeypatch.setitem(
+        defaults.static_table_url, "VARIABLES_FCAS_4_SECOND",
+        defaults.static_table_url["VARIABLES_FCAS_4_SECOND"] + ".moved",
+    )
+
+    with pytest.raises(NoDataToReturn):
+        static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), max_age=0)
+
+
+def test_failed_download_without_cached_file_raises(nemosis_fixture, aemo_unreachable):
+    aemo_unreachable()
+
+    with pytest.raises(NoDataToReturn):
+        static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture))
+
+
+@pytest.mark.parametrize("max_age", [-1, "1 hour", True])
+def test_invalid_max_age_raises(nemosis_fixture, max_age):
+    with pytest.raises(UserInputError, match="max_age"):
+        static_table("VARIABLES_FCAS_4_SECOND", str(nemosis_fixture), max_age=max_age)
@@ -376,7 +376,7 @@ def _rewrite_index(directory: Path) -> None:
 def _filter_multisection_zip(zip_bytes: bytes, sections_to_keep: dict[int, dict]) -> bytes:
     """Filter sections listed in `sections_to_keep` by their column-values,
     and drop all D rows from every other section. I rows stay untouched so
-    NEMOSIS's section-counting (_find_start_row_nth_table) still matches up.
+    NEMOSIS's section-counting (mms_csv.split_mms_sections) still matches up.
     """
     csv_name, csv_bytes = read_single_csv_from_zip(zip_bytes)
     text = csv_bytes.decode("utf-8")
@@ -0,0 +1,96 @@
+"""Tests for `nemosis.cache_manifest.CacheManifest`, the SQLite index of
+cache files that the fetch loop consults instead of globbing the cache
+directory."""
+import glob
+import pickle
+
+import pandas as pd
+import pytest
+
+from nemosis import dynamic_data_compiler
+from nemosis.cache_manifest import MANIFEST_NAME, CacheManifest
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    data = pd.DataFrame({"SETTLEMENTDATE": ["2018/05/01 00:05:00"] * 3, "RRP": ["1", "2", "3"]})
+    path = tmp_path / "PUBLIC_DVD_DISPATCHPRICE_201805010000.parquet"
+    data.to_parquet(path, index=False)
+    return path, data
+
+
+def test_record_then_lookup(tmp_path, cache_file):
+    path, data = cache_file
+    manifest = CacheManifest(str(tmp_path))
+    manifest.record(str(path), "DISPATCHPRICE", "parquet", data)
+
+    entry = CacheManifest(str(tmp_path)).lookup(str(path), "DISPATCHPRICE")
+    assert entry == {
+        "table_name": "DISPATCHPRICE",
+        "fformat": "parquet",
+        "rows": 3,
+        "columns": ["SETTLEMENTDATE", "RRP"],
+        "size": path.stat().st_size,
+    }
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_existing_file_is_backfilled(tmp_path, cache_file):
+    """Caches written before the manifest existed are still found."""
+    path, _ = cache_file
+    entry = CacheManifest(str(tmp_path)).lookup(str(path), "DISPATCHPRICE")
+    assert entry["rows"] == 3
+    assert entry["columns"] == ["SETTLEMENTDATE", "RRP"]
+
+
+def test_deleted_file_is_dropped(tmp_path, cache_file):
+    path, data = cache_file
+    manifest = CacheManifest(str(tmp_path))
+    manifest.record(str(path), "DISPATCHPRICE", "parquet", data)
+    path.unlink()
+
+    assert manifest.lookup(str(path), "DISPATCHPRICE") is None
+    assert CacheManifest(str(tmp_path))._load() == {}
+
+
+def test_replaced_file_is_reread(tmp_path, cache_file):
+    path, data = cache_file
+    manifest = CacheManifest(str(tmp_path))
+    manifest.record(str(path), "DISPATCHPRICE", "parquet", data)
+    pd.concat([data, data]).to_parquet(path, index=False)
+
+    assert manifest.lookup(str(path), "DISPATCHPRICE")["rows"] == 6
+
+
+def test_pickles_without_entries(tmp_path, cache_file):
+    path, data = cache_file
+    manifest = CacheManifest(str(tmp_path))
+    manifest.record(str(path), "DISPATCHPRICE", "parquet", data)
+    manifest._load()
+
+    copy = pickle.loads(pickle.dumps(manifest))
+    assert copy._entries is None
+    assert copy.lookup(str(path), "DISPATCHPRICE")["rows"] == 3
+
+
+@pytest.mark.parametrize("cache_layout", ["flat", "partitioned"])
+def test_fetch_loop_records_files_and_does_not_glob(nemosis_fixture, monkeypatch, cache_layout):
+    def no_glob(*args, **kwargs):
+        raise AssertionError("the fetch loop should not glob the cache directory")
+
+    monkeypatch.setattr(glob, "glob", no_glob)
+    kwargs = dict(
+        start_time="2018/05/01 00:00:00", end_time="2018/05/01 01:00:00",
+        table_name="DISPATCHPRICE", raw_data_location=str(nemosis_fixture),
+        cache_layout=cache_layout,
+    )
+    first = dynamic_data_compiler(**kwargs)
+    second = dynamic_data_compiler(**kwargs)
+    pd.testing.assert_frame_equal(first, second)
+
+    entries = CacheManifest(str(nemosis_fixture))._load()
+    assert entries
+    for key, entry in entries.items():
+        assert (nemosis_fixture / key).is_file()
+        assert entry["table_name"] == "DISPATCHPRICE"
+        assert "SETTLEMENTDATE" in entry["columns"]
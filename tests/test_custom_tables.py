@@ -0,0 +1,205 @@
+"""Unit tests for the vectorised helpers in `nemosis.custom_tables`,
+each checked against the slower implementation it replaced.
+
+These run in CI, unlike tests/test_performance_stats.py, which fetches
+data from AEMO.
+"""
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nemosis import custom_tables
+
+
+def _fill_scada_per_duid(scada, timeseries_df):
+    """The per-DUID merge loop plant_stats used before
+    fill_missing_scada_intervals, as a reference."""
+    scada_list = []
+    for gen in scada.groupby(["DUID"], as_index=False):
+        temp = pd.merge(timeseries_df, gen[1], "left", on="SETTLEMENTDATE")
+        temp["SCADAVALUE"] = np.where(
+            temp["SCADAVALUE"].isnull(), 0.0, temp["SCADAVALUE"]
+        )
+        temp["DUID"] = np.where(temp["DUID"].isnull(), gen[0], temp["DUID"])
+        scada_list.append(temp)
+    return pd.concat(scada_list).reset_index(drop=True)
+
+
+class TestFillMissingScadaIntervals(unittest.TestCase):
+    def setUp(self):
+        self.timeseries_df = pd.DataFrame(
+            {"SETTLEMENTDATE": pd.date_range("2015-01-01 00:05", periods=4, freq="5min")}
+        )
+        self.scada = pd.DataFrame(
+            {
+                "SETTLEMENTDATE": pd.to_datetime(
+                    [
+                        "2015-01-01 00:10",
+                        "2015-01-01 00:05",
+                        "2015-01-01 00:20",
+                        "2015-01-01 01:00",
+                        "2015-01-01 00:15",
+                    ]
+                ),
+                "DUID": ["B", "A", "A", "A", np.nan],
+                "SCADAVALUE": [10.0, 20.0, 30.0, 40.0, 50.0],
+                "SCADA_TYPE": ["x", "y", "z", "w", "v"],
+            }
+        )
+
+    def test_matches_per_duid_merge(self):
+        result = custom_tables.fill_missing_scada_intervals(
+            self.scada, self.timeseries_df
+        )
+        pd.testing.assert_frame_equal(
+            result, _fill_scada_per_duid(self.scada, self.timeseries_df)
+        )
+        self.assertEqual(
+            result["SCADAVALUE"].tolist(), [20.0, 0.0, 0.0, 30.0, 0.0, 10.0, 0.0, 0.0]
+        )
+
+    def test_duplicate_records_all_kept(self):
+        scada = pd.concat([self.scada, self.scada.iloc[[0]]], ignore_index=True)
+        result = custom_tables.fill_missing_scada_intervals(scada, self.timeseries_df)
+        pd.testing.assert_frame_equal(
+            result, _fill_scada_per_duid(scada, self.timeseries_df)
+        )
+        self.assertEqual(len(result), 9)
+
+    def test_unsorted_intervals(self):
+        timeseries_df = self.timeseries_df.iloc[::-1].reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            custom_tables.fill_missing_scada_intervals(self.scada, timeseries_df),
+            _fill_scada_per_duid(self.scada, timeseries_df),
+        )
+
+
+class TestStatsByMonthAndPlantMatchesPerGroupStats(unittest.TestCase):
+    """stats_by_month_and_plant against stats_for_group applied to each
+    month and DUID, on data with gaps, plants built part way through a
+    month and repeated demand values (no ties at the top decile
+    boundary, which the per-group sort doesn't break consistently)."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        settlementdate = pd.date_range("2017-01-30", periods=1500, freq="5min")
+        frames = []
+        for duid, capacity in [("A", 68.0), ("B", 100.0), ("C", 5.0)]:
+            frame = pd.DataFrame(
+                {
+                    "SETTLEMENTDATE": settlementdate,
+                    "DUID": duid,
+                    "MAXCAPACITY": capacity,
+                    "SCADAVALUE": rng.random(len(settlementdate)) * capacity,
+                    "TRADING_TOTALCLEARED": rng.random(len(settlementdate)) * capacity,
+                    "TRADING_RRP": rng.random(len(settlementdate)) * 100,
+                    "DISPATCH_RRP": rng.random(len(settlementdate)) * 100,
+                    "TOTALDEMAND": rng.permutation(len(settlementdate)) * 1.0,
+                }
+            )
+            frame.loc[rng.random(len(frame)) < 0.1, "SCADAVALUE"] = math.nan
+            frame.loc[frame.index % 6 != 0, ["TRADING_TOTALCLEARED", "TRADING_RRP"]] = math.nan
+            frames.append(frame)
+        self.data = pd.concat(frames, ignore_index=True)
+        # Plant C is built on the first of February.
+        before_built = (self.data["DUID"] == "C") & (
+            self.data["SETTLEMENTDATE"] < pd.Timestamp("2017-02-01")
+        )
+        self.data.loc[before_built, ["MAXCAPACITY", "SCADAVALUE"]] = math.nan
+        # Nodal peak shared by several intervals, first one wins.
+        self.data.loc[self.data["TOTALDEMAND"] > 1495, "TOTALDEMAND"] = 1495.0
+
+    def test_matches(self):
+        expected = self.data.copy()
+        expected["MONTH"] = expected["SETTLEMENTDATE"].dt.strftime("%Y-%m")
+        expected = (
+            expected.groupby(["MONTH", "DUID"], as_index=False)
+            .apply(custom_tables.stats_for_group, include_groups=False)
+            .reset_index(drop=True)
+        )
+        result = custom_tables.stats_by_month_and_plant(self.data.copy())
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+
+
+def _match_errors_full_join(fcas4s, scada_elements):
+    """How fcas4s_scada_match compared elements before
+    aggregate_match_errors: one join over the whole period."""
+    profile_comp = pd.merge(
+        fcas4s, scada_elements, "inner", left_on="TIMESTAMP", right_on="SETTLEMENTDATE"
+    )
+    profile_comp["ERROR"] = (profile_comp["VALUE"] - profile_comp["SCADAVALUE"]).abs()
+    profile_comp = profile_comp.sort_values("ERROR")
+    error_comp = profile_comp.groupby(
+        ["MARKETNAME", "ELEMENTNUMBER", "TIMESTAMP"], as_index=False
+    ).first()
+    error_comp = error_comp.loc[:, ("ELEMENTNUMBER", "MARKETNAME", "SCADAVALUE", "ERROR")]
+    return error_comp.groupby(["MARKETNAME", "ELEMENTNUMBER"], as_index=False).sum()
+
+
+class TestAggregateMatchErrors(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        intervals = pd.date_range("2018-05-01", periods=12, freq="5min")
+        samples = [interval + pd.Timedelta(seconds=s) for interval in intervals for s in (0, 4, 8)]
+        elements = ["1", "2", "10", "11"]
+        self.fcas4s = pd.DataFrame(
+            {
+                "TIMESTAMP": pd.DatetimeIndex(np.repeat(samples, len(elements))).floor("min"),
+                "ELEMENTNUMBER": np.tile(elements, len(samples)),
+                "VALUE": rng.random(len(samples) * len(elements)) * 100,
+            }
+        ).sample(frac=1, random_state=4)
+        self.fcas4s.loc[self.fcas4s.index[:5], "VALUE"] = math.nan
+        markets = ["AGLHAL", "HDWF2", "NSW1-QLD1"]
+        self.scada_elements = pd.DataFrame(
+            {
+                # No scada for the last interval.
+                "SETTLEMENTDATE": np.repeat(intervals[:-1], len(markets)),
+                "MARKETNAME": np.tile(markets, len(intervals) - 1),
+                "SCADAVALUE": rng.random((len(intervals) - 1) * len(markets)) * 100,
+            }
+        )
+        self.scada_elements.loc[3, "SCADAVALUE"] = math.nan
+        self.expected = _match_errors_full_join(self.fcas4s, self.scada_elements)
+
+    def test_one_batch(self):
+        pd.testing.assert_frame_equal(
+            custom_tables.aggregate_match_errors(self.fcas4s, self.scada_elements),
+            self.expected,
+        )
+
+    def test_batch_per_interval(self):
+        pd.testing.assert_frame_equal(
+            custom_tables.aggregate_match_errors(
+                self.fcas4s, self.scada_elements, batch_rows=1
+            ),
+            self.expected,
+            check_exact=False,
+            rtol=1e-12,
+        )
+
+    def test_several_intervals_per_batch(self):
+        pd.testing.assert_frame_equal(
+            custom_tables.aggregate_match_errors(
+                self.fcas4s, self.scada_elements, batch_rows=100
+            ),
+            self.expected,
+            check_exact=False,
+            rtol=1e-12,
+        )
+
+    def test_batch_ends(self):
+        self.assertEqual(custom_tables._batch_ends([40, 40, 40, 150, 10], 100), [2, 3, 4, 5])
+        self.assertEqual(custom_tables._batch_ends([], 100), [])
+
+    def test_no_overlap(self):
+        scada_elements = self.scada_elements.assign(
+            SETTLEMENTDATE=self.scada_elements["SETTLEMENTDATE"] + pd.Timedelta(days=1)
+        )
+        result = custom_tables.aggregate_match_errors(self.fcas4s, scada_elements)
+        self.assertTrue(result.empty)
+        self.assertEqual(
+            list(result.columns), ["MARKETNAME", "ELEMENTNUMBER", "SCADAVALUE", "ERROR"]
+        )
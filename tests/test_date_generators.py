@@ -407,3 +407,33 @@ class TestParseDatetimePy(unittest.TestCase):
             actual_t_start = date_generators.parse_datetime_py(d, midnight='Start')
 
         self.assertEqual(date_generators.parse_datetime_py(d, midnight='start'), date_generators.parse_datetime_py(d))
+
+
+class TestYearMonthDayHourGen(unittest.TestCase):
+    def test_hours_from_start_to_end_included(self):
+        start_time = datetime(2013, 1, 31, 22, 20)
+        end_time = datetime(2013, 2, 1, 1, 5)
+        times = list(date_generators.year_month_day_hour_gen(start_time, end_time))
+        self.assertEqual(
+            times,
+            [
+                ("2013", "01", "31", "22"),
+                ("2013", "01", "31", "23"),
+                ("2013", "02", "01", "00"),
+                ("2013", "02", "01", "01"),
+            ],
+        )
+
+    def test_end_on_the_hour_keeps_its_hour(self):
+        start_time = datetime(2012, 12, 31, 23, 0)
+        end_time = datetime(2013, 1, 1, 0, 0)
+        times = list(date_generators.year_month_day_hour_gen(start_time, end_time))
+        self.assertEqual(
+            times, [("2012", "12", "31", "23"), ("2013", "01", "01", "00")]
+        )
+
+    def test_window_within_one_hour(self):
+        start_time = datetime(2013, 1, 1, 5, 0)
+        end_time = datetime(2013, 1, 1, 5, 0)
+        times = list(date_generators.year_month_day_hour_gen(start_time, end_time))
+        self.assertEqual(times, [("2013", "01", "01", "05")])
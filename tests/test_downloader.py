@@ -14,6 +14,9 @@ HTTP server (in-process) and exercise the actual `requests` code path
 — not a monkeypatch on the function under test.
 """
 import tempfile
+import threading
+import zipfile
+from datetime import datetime, timedelta
 
 import pytest
 import requests
@@ -282,3 +285,552 @@ def test_download_to_path_proceeds_when_pre_check_says_present(
     assert downloaded is True
     assert target.is_file()
     assert target.stat().st_size > 0
+
+
+# ---------------------------------------------------------------------------
+# Thread safety for the max_workers download pool
+# ---------------------------------------------------------------------------
+
+def test_concurrent_download_unzip_csv_fetches_once(aemo_mock_server, tmp_path, monkeypatch):
+    """Several threads asking for the same archive must share one network
+    fetch: the per-path lock makes the others wait and then reuse the
+    zip the first one wrote, rather than racing to write it."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    url = (
+        f"{aemo_mock_server}/Data_Archive/Wholesale_Electricity/MMSDM/2018/"
+        "MMSDM_2018_04/MMSDM_Historical_Data_SQLLoader/DATA/"
+        "PUBLIC_DVD_DISPATCHLOAD_201804010000.zip"
+    )
+    real_get = downloader.session.get
+    call_count = 0
+
+    def counting_get(*args, **kwargs):
+        nonlocal call_count
+        call_count += 1
+        return real_get(*args, **kwargs)
+
+    monkeypatch.setattr(downloader.session, "get", counting_get)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(
+            lambda _: downloader.download_unzip_csv(url, str(tmp_path)), range(4)
+        ))
+
+    assert sorted(results) == [False, False, False, True]
+    assert call_count == 1
+    assert list(tmp_path.glob("*.[Cc][Ss][Vv]"))
+
+
+def test_size_connection_pool_only_grows(monkeypatch):
+    monkeypatch.setattr(downloader, "_pool_size", downloader._DEFAULT_POOL_SIZE)
+    mounted = []
+    monkeypatch.setattr(downloader.session, "mount", lambda prefix, adapter: mounted.append(adapter))
+
+    downloader.size_connection_pool(4)
+    assert mounted == []
+
+    downloader.size_connection_pool(32)
+    assert len(mounted) == 2
+    assert all(adapter._pool_maxsize == 32 for adapter in mounted)
+    assert downloader._pool_size == 32
+
+
+# ---------------------------------------------------------------------------
+# Retries, backoff and resumed downloads
+#
+# A local server that serves one payload with an ETag, honours Range
+# requests (and If-Range), and can be told to answer the next few requests
+# with an error status or to drop the connection part way through the body.
+# ---------------------------------------------------------------------------
+
+PAYLOAD = bytes(range(256)) * 400
+
+
+@pytest.fixture
+def flaky_server(monkeypatch):
+    import http.server
+    import threading
+
+    state = {
+        "script": [], "ranges": [], "if_ranges": [], "honour_range": True,
+        "payload": PAYLOAD, "etag": '"v1"',
+    }
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested = self.headers.get("Range")
+            state["ranges"].append(requested)
+            state["if_ranges"].append(self.headers.get("If-Range"))
+            if self.headers.get("If-Range") not in (None, state["etag"]):
+                requested = None
+            payload = state["payload"]
+            action = state["script"].pop(0) if state["script"] else "ok"
+            if isinstance(action, int):
+                self.send_response(action)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start = 0
+            if requested and state["honour_range"]:
+                start = int(requested.split("=")[1].rstrip("-"))
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+            else:
+                self.send_response(200)
+            if state["etag"]:
+                self.send_header("ETag", state["etag"])
+            body = payload[start:]
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if action == "drop":
+                self.wfile.write(body[: len(body) // 2])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+        def log_message(self, *_args, **_kwargs):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(downloader, "RETRY_BACKOFF_SECONDS", 0)
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/PUBLIC_TEST.zip", state
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+
+def test_download_to_path_retries_transient_status(flaky_server, tmp_path):
+    url, state = flaky_server
+    state["script"] = [503, 429]
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    assert downloader.download_to_path(url, str(target)) is True
+    assert target.read_bytes() == PAYLOAD
+    assert len(state["ranges"]) == 3
+
+
+def test_download_to_path_resumes_dropped_download_with_range(flaky_server, tmp_path):
+    url, state = flaky_server
+    state["script"] = ["drop"]
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    downloader.download_to_path(url, str(target))
+
+    assert target.read_bytes() == PAYLOAD
+    # Resumed from however much of the first half reached the file.
+    first, resumed = state["ranges"]
+    assert first is None
+    assert 0 < int(resumed.split("=")[1].rstrip("-")) <= len(PAYLOAD) // 2
+    assert state["if_ranges"] == [None, '"v1"']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["PUBLIC_TEST.zip"]
+
+
+def test_download_to_path_restarts_when_file_changed_before_resume(
+    flaky_server, tmp_path, monkeypatch
+):
+    url, state = flaky_server
+    state["script"] = ["drop"]
+    changed = PAYLOAD[::-1]
+
+    def change_file(_delay):
+        state["payload"], state["etag"] = changed, '"v2"'
+
+    # AEMO replaces the file while the retry waits.
+    monkeypatch.setattr(downloader.time, "sleep", change_file)
+    target = tmp_path / "PUBLIC_TEST.zip"
+    downloader.download_to_path(url, str(target))
+
+    # The resume's If-Range no longer matched, so the server sent the
+    # whole new file rather than the rest of it spliced onto the old bytes.
+    assert state["if_ranges"] == [None, '"v1"']
+    assert target.read_bytes() == changed
+
+
+def test_download_to_path_restarts_without_validator(flaky_server, tmp_path):
+    url, state = flaky_server
+    state["script"] = ["drop"]
+    state["etag"] = None
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    downloader.download_to_path(url, str(target))
+
+    assert state["ranges"] == [None, None]
+    assert target.read_bytes() == PAYLOAD
+
+
+def test_download_to_path_restarts_when_range_ignored(flaky_server, tmp_path):
+    url, state = flaky_server
+    state["script"] = ["drop"]
+    state["honour_range"] = False
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    downloader.download_to_path(url, str(target))
+
+    assert target.read_bytes() == PAYLOAD
+
+
+def test_download_to_path_does_not_retry_client_errors(flaky_server, tmp_path):
+    url, state = flaky_server
+    state["script"] = [404]
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    with pytest.raises(requests.HTTPError):
+        downloader.download_to_path(url, str(target))
+    assert len(state["ranges"]) == 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_download_to_path_gives_up_after_retries(flaky_server, tmp_path, monkeypatch):
+    url, state = flaky_server
+    monkeypatch.setattr(downloader, "DOWNLOAD_RETRIES", 2)
+    state["script"] = ["drop", "drop", "drop"]
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    with pytest.raises(requests.RequestException):
+        downloader.download_to_path(url, str(target))
+    assert len(state["ranges"]) == 3
+    assert not target.exists()
+
+
+def test_interrupted_download_resumes_in_next_run(flaky_server, tmp_path, monkeypatch):
+    url, state = flaky_server
+    monkeypatch.setattr(downloader, "DOWNLOAD_RETRIES", 0)
+    state["script"] = ["drop"]
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    with pytest.raises(requests.RequestException):
+        downloader.download_to_path(url, str(target))
+    part = tmp_path / "PUBLIC_TEST.zip.part"
+    received = part.stat().st_size
+    assert 0 < received <= len(PAYLOAD) // 2
+    assert (tmp_path / "PUBLIC_TEST.zip.part.validators.json").exists()
+
+    assert downloader.download_to_path(url, str(target)) is True
+    assert target.read_bytes() == PAYLOAD
+    assert state["ranges"][-1] == f"bytes={received}-"
+    assert state["if_ranges"][-1] == '"v1"'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["PUBLIC_TEST.zip"]
+
+
+def test_partial_file_without_validator_is_not_resumed(flaky_server, tmp_path):
+    url, state = flaky_server
+    (tmp_path / "PUBLIC_TEST.zip.part").write_bytes(b"left by an old version")
+    target = tmp_path / "PUBLIC_TEST.zip"
+
+    downloader.download_to_path(url, str(target))
+
+    assert state["ranges"] == [None]
+    assert target.read_bytes() == PAYLOAD
+
+
+# ---------------------------------------------------------------------------
+# Listings kept in the cache directory
+#
+# A new process (simulated by clearing the in-memory cache) answers the
+# pre-check from the listing cache without a request while the listing is
+# fresh, and always for a month AEMO has finished publishing. A stale
+# listing can still confirm a file is listed, and is then refreshed in the
+# background, but can't be trusted to say one is missing, so it is fetched
+# again first.
+# ---------------------------------------------------------------------------
+
+ARCHIVE_DIR = (
+    "/Data_Archive/Wholesale_Electricity/MMSDM/2018/"
+    "MMSDM_2018_04/MMSDM_Historical_Data_SQLLoader/DATA/"
+)
+
+
+@pytest.fixture
+def counted_gets(monkeypatch):
+    urls = []
+    real_get = downloader.session.get
+
+    def counting_get(url, *args, **kwargs):
+        urls.append(url)
+        return real_get(url, *args, **kwargs)
+
+    monkeypatch.setattr(downloader.session, "get", counting_get)
+    return urls
+
+
+@pytest.fixture
+def archive_months_open(monkeypatch):
+    """Treats every archive month as still being published, so the
+    listing TTLs apply to ARCHIVE_DIR."""
+    from nemosis import asof_index
+
+    monkeypatch.setattr(asof_index, "PUBLICATION_LAG_MONTHS", 10**6)
+
+
+def _join_listing_refreshes():
+    for thread in list(downloader._listing_refreshes.values()):
+        thread.join(timeout=5)
+
+
+def test_listing_cache_survives_new_process(aemo_mock_server, tmp_path, counted_gets):
+    url = aemo_mock_server + ARCHIVE_DIR
+    first = downloader.download_html(url, str(tmp_path))
+    downloader._html_cache.clear()
+
+    assert downloader.download_html(url, str(tmp_path)) == first
+    assert counted_gets == [url]
+    assert (tmp_path / "nemosis_listings.sqlite").is_file()
+
+
+def test_stale_listing_confirms_listed_file_and_refreshes(
+    _patch_precheck_prefixes, archive_months_open, aemo_mock_server, tmp_path,
+    counted_gets, monkeypatch,
+):
+    listed = aemo_mock_server + ARCHIVE_DIR + "PUBLIC_DVD_DISPATCHLOAD_201804010000.zip"
+    downloader.download_html(aemo_mock_server + ARCHIVE_DIR, str(tmp_path))
+    downloader._html_cache.clear()
+    counted_gets.clear()
+    monkeypatch.setattr(downloader, "LISTING_TTL_SECONDS", 0)
+
+    assert downloader._pre_check_file_is_missing(listed, str(tmp_path)) is False
+    _join_listing_refreshes()
+    assert counted_gets == [aemo_mock_server + ARCHIVE_DIR]
+
+
+def test_stale_listing_fetched_again_to_answer_missing(
+    _patch_precheck_prefixes, archive_months_open, aemo_mock_server, tmp_path,
+    counted_gets, monkeypatch,
+):
+    not_listed = aemo_mock_server + ARCHIVE_DIR + "PUBLIC_DVD_DOES_NOT_EXIST_201804010000.zip"
+    downloader.download_html(aemo_mock_server + ARCHIVE_DIR, str(tmp_path))
+    downloader._html_cache.clear()
+    counted_gets.clear()
+    monkeypatch.setattr(downloader, "LISTING_TTL_SECONDS", 0)
+
+    assert downloader._pre_check_file_is_missing(not_listed, str(tmp_path)) is True
+    # Fetched once, there and then, rather than left to a background
+    # thread while the file's own request 404s.
+    assert counted_gets == [aemo_mock_server + ARCHIVE_DIR]
+    assert not downloader._listing_refreshes
+
+
+def test_published_archive_month_listing_never_goes_stale(
+    _patch_precheck_prefixes, aemo_mock_server, tmp_path, counted_gets, monkeypatch
+):
+    url = aemo_mock_server + ARCHIVE_DIR
+    downloader.download_html(url, str(tmp_path))
+    downloader._html_cache.clear()
+    counted_gets.clear()
+    monkeypatch.setattr(downloader, "LISTING_TTL_SECONDS", 0)
+    monkeypatch.setattr(downloader, "LISTING_STALE_SECONDS", 0)
+
+    assert downloader._pre_check_file_is_missing(
+        url + "PUBLIC_DVD_DOES_NOT_EXIST_201804010000.zip", str(tmp_path)
+    ) is True
+    assert downloader._pre_check_file_is_missing(
+        url + "PUBLIC_DVD_DISPATCHLOAD_201804010000.zip", str(tmp_path)
+    ) is False
+    assert not counted_gets
+
+
+def test_listing_never_changes_only_for_published_archive_months(monkeypatch):
+    from nemosis import asof_index
+
+    monkeypatch.setattr(asof_index, "PUBLICATION_LAG_MONTHS", 2)
+    closed = datetime.now().replace(day=1) - timedelta(days=70)
+    recent = datetime.now()
+    assert downloader._listing_never_changes(
+        f"https://www.nemweb.com.au/Data_Archive/Wholesale_Electricity/MMSDM/"
+        f"{closed:%Y}/MMSDM_{closed:%Y_%m}/MMSDM_Historical_Data_SQLLoader/DATA/"
+    )
+    assert not downloader._listing_never_changes(
+        f"https://www.nemweb.com.au/Data_Archive/Wholesale_Electricity/MMSDM/"
+        f"{recent:%Y}/MMSDM_{recent:%Y_%m}/MMSDM_Historical_Data_SQLLoader/DATA/"
+    )
+    assert not downloader._listing_never_changes(
+        "https://www.nemweb.com.au/Reports/Current/Daily_Reports/"
+    )
+
+
+def test_listing_refresh_finishes_before_exit(monkeypatch, tmp_path):
+    release = threading.Event()
+    monkeypatch.setattr(downloader, "_fetch_listing", lambda *_args: release.wait(5))
+
+    downloader._refresh_listing_in_background("https://example.com/", str(tmp_path))
+    thread = downloader._listing_refreshes["https://example.com/"]
+    release.set()
+    thread.join(timeout=5)
+
+    # A daemon thread would be killed when a short-lived job exits.
+    assert not thread.daemon
+
+
+def test_listing_past_stale_limit_is_fetched_again(
+    _patch_precheck_prefixes, archive_months_open, aemo_mock_server, tmp_path,
+    counted_gets, monkeypatch,
+):
+    url = aemo_mock_server + ARCHIVE_DIR
+    downloader.download_html(url, str(tmp_path))
+    downloader._html_cache.clear()
+    monkeypatch.setattr(downloader, "LISTING_TTL_SECONDS", 0)
+    monkeypatch.setattr(downloader, "LISTING_STALE_SECONDS", 0)
+
+    downloader._pre_check_file_is_missing(url + "PUBLIC_DVD_X_201804010000.zip", str(tmp_path))
+
+    assert counted_gets == [url, url]
+
+
+def test_prewarm_listings_makes_pre_check_offline(
+    nemosis_fixture, _patch_precheck_prefixes, aemo_mock_server, counted_gets
+):
+    from nemosis import prewarm_listings
+
+    warmed = prewarm_listings("2018/04/01 00:00:00", "2018/04/30 00:00:00", str(nemosis_fixture))
+    assert aemo_mock_server + ARCHIVE_DIR in warmed
+    downloader._html_cache.clear()
+    counted_gets.clear()
+
+    listed = aemo_mock_server + ARCHIVE_DIR + "PUBLIC_DVD_DISPATCHLOAD_201804010000.zip"
+    not_listed = aemo_mock_server + ARCHIVE_DIR + "PUBLIC_DVD_DOES_NOT_EXIST_201804010000.zip"
+    assert downloader._pre_check_file_is_missing(listed, str(nemosis_fixture)) is False
+    assert downloader._pre_check_file_is_missing(not_listed, str(nemosis_fixture)) is True
+    assert counted_gets == []
+
+
+# ---------------------------------------------------------------------------
+# Link index — each listing is parsed once and looked up without scanning
+# ---------------------------------------------------------------------------
+
+LISTING = """<html><body><pre>
+<a href="/Reports/Current/">[To Parent Directory]</a>
+<a href="/Reports/Current/Bidmove_Complete/PUBLIC_BIDMOVE_COMPLETE_20240102_0000000411.zip">b</a>
+<a href="/Reports/Current/Bidmove_Complete/PUBLIC_BIDMOVE_COMPLETE_20240101_0000000410.zip">a</a>
+<a href="PUBLIC_BIDMOVE_COMPLETE_20240101_0000000409.zip#top">c</a>
+</pre></body></html>"""
+LISTING_URL = "https://www.nemweb.com.au/Reports/Current/Bidmove_Complete/"
+
+
+def test_link_index_finds_stub_after_underscore_in_page_order():
+    links = downloader._LinkIndex(LISTING_URL, LISTING)
+    assert links.find("BIDMOVE_COMPLETE_20240101") == (
+        "/Reports/Current/Bidmove_Complete/PUBLIC_BIDMOVE_COMPLETE_20240101_0000000410.zip"
+    )
+    assert links.find("PUBLIC_BIDMOVE_COMPLETE_20240102").endswith("_0000000411.zip")
+    assert links.find("BIDMOVE_COMPLETE_20240103") is None
+
+
+def test_link_index_falls_back_to_substring_match():
+    links = downloader._LinkIndex(LISTING_URL, LISTING)
+    assert links.find("MOVE_COMPLETE_20240102").endswith("_0000000411.zip")
+    assert links.find("Bidmove_Complete/") is not None
+
+
+def test_link_index_membership_is_on_absolute_urls_without_fragments():
+    links = downloader._LinkIndex(LISTING_URL, LISTING)
+    assert LISTING_URL + "PUBLIC_BIDMOVE_COMPLETE_20240101_0000000409.zip" in links
+    assert LISTING_URL + "PUBLIC_BIDMOVE_COMPLETE_20240101_0000000410.zip#x" in links
+    assert LISTING_URL + "PUBLIC_BIDMOVE_COMPLETE_20240103_0000000412.zip" not in links
+
+
+def test_listing_parsed_once_across_lookups(aemo_mock_server, monkeypatch):
+    url = aemo_mock_server + ARCHIVE_DIR
+    built = []
+    real_init = downloader._LinkIndex.__init__
+
+    def counting_init(self, *args):
+        built.append(args[0])
+        real_init(self, *args)
+
+    monkeypatch.setattr(downloader._LinkIndex, "__init__", counting_init)
+    downloader._link_index.cache_clear()
+
+    for day in ("01", "02", "03"):
+        downloader._get_matching_link(url, f"DISPATCHLOAD_201804{day}")
+
+    assert built == [url]
+
+
+def test_max_connections_per_host_caps_concurrent_downloads(aemo_mock_server, tmp_path, monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    in_flight = 0
+    most_in_flight = 0
+    counter_lock = threading.Lock()
+    real_get = downloader.session.get
+
+    def slow_get(*args, **kwargs):
+        nonlocal in_flight, most_in_flight
+        with counter_lock:
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+        time.sleep(0.05)
+        with counter_lock:
+            in_flight -= 1
+        return real_get(*args, **kwargs)
+
+    monkeypatch.setattr(downloader.session, "get", slow_get)
+    monkeypatch.setattr(downloader, "MAX_CONNECTIONS_PER_HOST", 2)
+    url = (
+        f"{aemo_mock_server}/-/media/files/electricity/nem/settlements_and_payments/"
+        "settlements/auction-reports/archive/ancillary-services-market-causer-pays-variables-file.csv"
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(
+            lambda i: downloader.download_to_path(url, str(tmp_path / f"{i}.csv")), range(8)
+        ))
+
+    assert most_in_flight == 2
+    assert len(list(tmp_path.glob("*.csv"))) == 8
+
+
+def test_unpack_report_sections_missing_section_leaves_no_files(tmp_path):
+    from nemosis.custom_errors import DataFormatError
+
+    zip_path = tmp_path / "PUBLIC_DAILY_202605150000_20260516040505.zip"
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr(
+            "PUBLIC_DAILY_202605150000_20260516040505.CSV",
+            "C,NEMP.WORLD,DAILY\r\nI,DISPATCH,CASESOLUTION,1,SETTLEMENTDATE\r\n"
+            'D,DISPATCH,CASESOLUTION,1,"2026/05/15 00:05:00"\r\nC,"END OF REPORT",3\r\n',
+        )
+    outputs = {1: str(tmp_path / "first.csv"), 2: str(tmp_path / "second.csv")}
+
+    with pytest.raises(DataFormatError, match="no section 2"):
+        downloader._unpack_report_sections(str(zip_path), lambda file_name: outputs)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [zip_path.name]
+
+
+def test_unpack_report_sections_routes_other_sections(tmp_path):
+    zip_path = tmp_path / "PUBLIC_DAILY_202605150000_20260516040505.zip"
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr(
+            "PUBLIC_DAILY_202605150000_20260516040505.CSV",
+            "C,NEMP.WORLD,DAILY\r\n"
+            "I,DISPATCH,CASESOLUTION,1,SETTLEMENTDATE\r\n"
+            'D,DISPATCH,CASESOLUTION,1,"2026/05/15 00:05:00"\r\n'
+            "I,DREGION,,2,SETTLEMENTDATE,REGIONID\r\n"
+            'D,DREGION,,2,"2026/05/15 00:05:00",SA1\r\n'
+            "I,DUNIT,,3,SETTLEMENTDATE,DUID\r\n"
+            'D,DUNIT,,3,"2026/05/15 00:05:00",UNIT1\r\n'
+            'C,"END OF REPORT",7\r\n',
+        )
+
+    downloader._unpack_report_sections(
+        str(zip_path),
+        lambda file_name: {2: str(tmp_path / "region.csv")},
+        others=lambda file_name, header: downloader._section_path(
+            str(tmp_path), "PUBLIC_DAILY", header, file_name[13:21]
+        ),
+    )
+
+    assert sorted(p.name for p in tmp_path.glob("*.csv")) == [
+        "PUBLIC_DAILY_DISPATCH_CASESOLUTION_1_20260515.csv",
+        "PUBLIC_DAILY_DUNIT_3_20260515.csv",
+        "region.csv",
+    ]
+    assert (tmp_path / "PUBLIC_DAILY_DUNIT_3_20260515.csv").read_bytes() == (
+        b'I,DUNIT,,3,SETTLEMENTDATE,DUID\r\nD,DUNIT,,3,"2026/05/15 00:05:00",UNIT1\r\n'
+    )
+    assert not list(tmp_path.glob("*.part"))
@@ -38,6 +38,41 @@ def test_dynamic_bad_fformat(nemosis_fixture):
         )
 
 
+@pytest.mark.parametrize("max_workers", [0, -2, 2.5, "4", True])
+def test_dynamic_bad_max_workers(nemosis_fixture, max_workers):
+    with pytest.raises(UserInputError, match="max_workers must be"):
+        dynamic_data_compiler(
+            "2018/05/01 00:00:00", "2018/05/01 01:00:00",
+            "DISPATCHPRICE", str(nemosis_fixture),
+            max_workers=max_workers,
+        )
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"fformat": "csv"}, "requires fformat"),
+    ({"keep_csv": True}, "cannot be used with keep_csv"),
+])
+def test_dynamic_stream_from_zip_incompatible_options(nemosis_fixture, kwargs, message):
+    with pytest.raises(UserInputError, match=message):
+        dynamic_data_compiler(
+            "2018/05/01 00:00:00", "2018/05/01 01:00:00",
+            "DISPATCHPRICE", str(nemosis_fixture),
+            stream_from_zip=True, **kwargs,
+        )
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"cache_layout": "nested"}, "must be 'flat' or 'partitioned'"),
+    ({"cache_layout": "partitioned", "fformat": "feather"}, "requires fformat='parquet'"),
+])
+def test_dynamic_bad_cache_layout(nemosis_fixture, kwargs, message):
+    with pytest.raises(UserInputError, match=message):
+        dynamic_data_compiler(
+            "2018/05/01 00:00:00", "2018/05/01 01:00:00",
+            "DISPATCHPRICE", str(nemosis_fixture), **kwargs,
+        )
+
+
 def test_dynamic_filter_col_not_in_select_columns(nemosis_fixture):
     with pytest.raises(UserInputError, match="Filter columns not valid"):
         dynamic_data_compiler(
@@ -162,6 +197,16 @@ def test_cache_bad_fformat(nemosis_fixture):
         )
 
 
+@pytest.mark.parametrize("n_processes", [0, 1.5, "2"])
+def test_cache_bad_n_processes(nemosis_fixture, n_processes):
+    with pytest.raises(UserInputError, match="n_processes must be"):
+        cache_compiler(
+            "2018/05/01 00:00:00", "2018/05/01 01:00:00",
+            "DISPATCHPRICE", str(nemosis_fixture),
+            n_processes=n_processes,
+        )
+
+
 def test_cache_select_columns_requires_rebuild(nemosis_fixture):
     with pytest.raises(UserInputError, match="rebuild=True"):
         cache_compiler(
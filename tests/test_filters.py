@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 import pandas as pd
 from nemosis import filters
 from pandas.testing import assert_frame_equal
@@ -461,5 +462,41 @@ class TestFiltersColumnValue(unittest.TestCase):
         assert_frame_equal(aim, result)
 
 
+class TestFiltersOnTypedColumns(unittest.TestCase):
+    """Data read from a typed cache already has datetime columns, which
+    the filters use as they are rather than parsing again."""
+
+    def setUp(self):
+        self.start_time = datetime(2014, 6, 1)
+        self.end_time = datetime(2015, 6, 1)
+        self.no_parsing = mock.patch(
+            "nemosis.value_parser.pd.to_datetime",
+            side_effect=AssertionError("column parsed again"),
+        )
+
+    def test_settlement_date(self):
+        data = pd.DataFrame(
+            {"SETTLEMENTDATE": pd.to_datetime(["2011-01-01", "2015-01-01"])}
+        )
+        with self.no_parsing:
+            result = filters.filter_on_settlementdate(
+                data, start_time=self.start_time, end_time=self.end_time
+            )
+        assert_frame_equal(data.iloc[[1]], result)
+
+    def test_start_and_end_date(self):
+        data = pd.DataFrame(
+            {
+                "START_DATE": pd.to_datetime(["2011-01-01", "2015-01-01"]),
+                "END_DATE": pd.to_datetime(["2015-01-01", "2015-07-01"]),
+            }
+        )
+        with self.no_parsing:
+            result = filters.filter_on_start_and_end_date(
+                data, start_time=self.start_time, end_time=self.end_time
+            )
+        assert_frame_equal(data, result)
+
+
 if __name__ == "__main__":
     unittest.main()
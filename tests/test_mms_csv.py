@@ -0,0 +1,217 @@
+"""Unit tests for `nemosis.mms_csv.read_mms_csv`, the single-pass reader
+for AEMO MMS CSVs (`C` header row, `I` column-name row, `D` data rows,
+`C` trailer).
+
+The contract is "same frame as the old two-pass `pd.read_csv` with
+`skiprows=[0, last_line]`", so most tests compare against that directly.
+"""
+import io
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nemosis.mms_csv import read_mms_csv, split_mms_sections
+
+FIXTURE_ZIP = (
+    Path(__file__).parent / "fixtures" / "data" / "Data_Archive"
+    / "Wholesale_Electricity" / "MMSDM" / "2018" / "MMSDM_2018_05"
+    / "MMSDM_Historical_Data_SQLLoader" / "DATA"
+    / "PUBLIC_DVD_DISPATCHPRICE_201805010000.zip"
+)
+
+SAMPLE = (
+    "C,NEMP.WORLD,DVD_TEST,AEMO,PUBLIC,2018/06/01,09:00:00,0000000296662817,,0000000296662817\n"
+    "I,TEST,THING,1,SETTLEMENTDATE,REGIONID,INTERVENTION,RRP,NOTE\n"
+    'D,TEST,THING,1,"2018/05/01 00:05:00",NSW1,0,81.5,\n'
+    'D,TEST,THING,1,"2018/05/01 00:05:00",QLD1,,70,"a note"\n'
+    'D,TEST,THING,1,"2018/05/01 00:10:00",SA1,1,-12.25,NULL\n'
+    'C,"END OF REPORT",6\n'
+)
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    path = tmp_path / "PUBLIC_DVD_TEST_201805010000.CSV"
+    path.write_text(SAMPLE)
+    return path
+
+
+def _two_pass_read(path, **kwargs):
+    last_line_number = len(Path(path).read_bytes().splitlines()) - 1
+    return pd.read_csv(path, skiprows=[0, last_line_number], **kwargs)
+
+
+@pytest.mark.parametrize("dtype", [None, str])
+def test_matches_two_pass_pandas_read(sample_csv, dtype):
+    pd.testing.assert_frame_equal(
+        read_mms_csv(sample_csv, dtype=dtype), _two_pass_read(sample_csv, dtype=dtype)
+    )
+
+
+def test_infers_types_like_pandas(sample_csv):
+    data = read_mms_csv(sample_csv)
+    assert list(data["I"]) == ["D", "D", "D"]
+    assert data["1"].dtype == "int64"
+    # An integer column with a gap can't stay int64.
+    assert data["INTERVENTION"].dtype == "float64"
+    assert data["RRP"].dtype == "float64"
+    assert data["SETTLEMENTDATE"].dtype == "object"
+    assert data["NOTE"].isna().tolist() == [True, False, True]
+
+
+def test_dtype_str_keeps_strings_and_nan(sample_csv):
+    data = read_mms_csv(sample_csv, dtype=str)
+    assert (data.dtypes == "object").all()
+    assert data["RRP"].tolist() == ["81.5", "70", "-12.25"]
+    assert data.loc[1, "INTERVENTION"] is np.nan
+
+
+def test_usecols_list_returns_file_order(sample_csv):
+    data = read_mms_csv(sample_csv, usecols=["RRP", "SETTLEMENTDATE"])
+    assert list(data.columns) == ["SETTLEMENTDATE", "RRP"]
+
+
+def test_usecols_callable(sample_csv):
+    wanted = {"REGIONID", "RRP", "NOT_IN_FILE"}
+    data = read_mms_csv(sample_csv, usecols=lambda column: column in wanted)
+    assert list(data.columns) == ["REGIONID", "RRP"]
+    assert len(data) == 3
+
+
+def test_usecols_missing_column_raises(sample_csv):
+    with pytest.raises(ValueError, match="Usecols do not match columns"):
+        read_mms_csv(sample_csv, usecols=["RRP", "NOT_IN_FILE"])
+
+
+def test_reads_from_binary_stream(sample_csv):
+    stream = io.BytesIO(sample_csv.read_bytes())
+    pd.testing.assert_frame_equal(read_mms_csv(stream), read_mms_csv(sample_csv))
+
+
+def test_blank_header_fields_named_like_pandas(tmp_path):
+    path = tmp_path / "blank.CSV"
+    path.write_text(
+        "C,NEMP.WORLD,DVD_TEST\n"
+        "I,SPDCPC,,2,CONNECTIONPOINTID,FACTOR\n"
+        'C,"END OF REPORT",3\n'
+    )
+    data = read_mms_csv(path)
+    pd.testing.assert_frame_equal(data, _two_pass_read(path))
+    assert list(data.columns) == ["I", "SPDCPC", "Unnamed: 2", "2", "CONNECTIONPOINTID", "FACTOR"]
+
+
+def test_short_rows_fall_back_to_pandas(tmp_path):
+    """pandas pads rows with missing trailing fields; the pyarrow parser
+    rejects them, so the reader falls back rather than failing."""
+    path = tmp_path / "short.CSV"
+    path.write_text(
+        "C,NEMP.WORLD,DVD_TEST\n"
+        "I,TEST,THING,1,REGIONID,RRP\n"
+        "D,TEST,THING,1,NSW1,81.5\n"
+        "D,TEST,THING,1,QLD1\n"
+        'C,"END OF REPORT",4\n'
+    )
+    data = read_mms_csv(path)
+    pd.testing.assert_frame_equal(data, _two_pass_read(path))
+    assert np.isnan(data.loc[1, "RRP"])
+
+
+def test_nrows(sample_csv):
+    pd.testing.assert_frame_equal(
+        read_mms_csv(sample_csv, nrows=2), _two_pass_read(sample_csv, nrows=2)
+    )
+
+
+def test_aemo_archive_matches_two_pass_read(tmp_path):
+    with zipfile.ZipFile(FIXTURE_ZIP) as z:
+        z.extractall(tmp_path)
+    (path,) = tmp_path.glob("*.CSV")
+    pd.testing.assert_frame_equal(
+        read_mms_csv(path, dtype=str), _two_pass_read(path, dtype=str)
+    )
+    typed = read_mms_csv(path)
+    pd.testing.assert_frame_equal(
+        typed, _two_pass_read(path), check_exact=False, rtol=1e-15
+    )
+
+
+def test_column_types_skip_inference(sample_csv):
+    data = read_mms_csv(
+        sample_csv,
+        column_types={"INTERVENTION": "int", "RRP": "float", "1": "string", "SETTLEMENTDATE": "datetime"},
+    )
+    assert data["INTERVENTION"].dtype == "float64"  # gap → float
+    assert data["RRP"].dtype == "float64"
+    assert data["1"].tolist() == ["1", "1", "1"]
+    assert data["SETTLEMENTDATE"].dtype == "object"
+
+
+def test_column_types_float_for_whole_numbers(tmp_path):
+    path = tmp_path / "whole.CSV"
+    path.write_text(
+        "C,NEMP.WORLD,DVD_TEST\n"
+        "I,TEST,THING,1,REGIONID,RRP\n"
+        "D,TEST,THING,1,NSW1,81\n"
+        'C,"END OF REPORT",3\n'
+    )
+    assert read_mms_csv(path)["RRP"].dtype == "int64"
+    assert read_mms_csv(path, column_types={"RRP": "float"})["RRP"].dtype == "float64"
+
+
+def test_column_types_ignored_with_dtype_str(sample_csv):
+    pd.testing.assert_frame_equal(
+        read_mms_csv(sample_csv, dtype=str, column_types={"RRP": "float"}),
+        read_mms_csv(sample_csv, dtype=str),
+    )
+
+
+# ---------------------------------------------------------------------------
+# split_mms_sections — one pass over a file holding several reports
+# ---------------------------------------------------------------------------
+
+MULTI_REPORT = (
+    "C,NEMP.WORLD,BIDMOVE_COMPLETE,AEMO,PUBLIC,2024/01/02,04:00:00,1,BIDMOVE_COMPLETE,1\r\n"
+    "I,BID,BIDDAYOFFER_D,2,SETTLEMENTDATE,DUID,PRICEBAND1,,REBIDEXPLANATION\r\n"
+    'D,BID,BIDDAYOFFER_D,2,"2024/01/01 00:00:00",A,10.50,,"late, rebid"\r\n'
+    'D,BID,BIDDAYOFFER_D,2,"2024/01/01 00:00:00",B,NA,,\r\n'
+    "I,BID,BIDPEROFFER_D,2,SETTLEMENTDATE,DUID,BANDAVAIL1,BANDAVAIL1\r\n"
+    'D,BID,BIDPEROFFER_D,2,"2024/01/01 00:00:00",A,05,1\r\n'
+    "I,BID,MNSP_OFFER,1,SETTLEMENTDATE,LINKID\r\n"
+    'C,"END OF REPORT",8\r\n'
+)
+
+
+def test_split_routes_each_section_once():
+    sinks = {1: io.BytesIO(), 2: io.BytesIO()}
+    calls = []
+
+    def route(position, header):
+        calls.append((position, header[2]))
+        return sinks.get(position)
+
+    headers = split_mms_sections(io.BytesIO(MULTI_REPORT.encode()), route)
+
+    assert calls == [(1, "BIDDAYOFFER_D"), (2, "BIDPEROFFER_D"), (3, "MNSP_OFFER")]
+    assert [header[2] for header in headers] == ["BIDDAYOFFER_D", "BIDPEROFFER_D", "MNSP_OFFER"]
+    assert sinks[2].getvalue() == (
+        b"I,BID,BIDPEROFFER_D,2,SETTLEMENTDATE,DUID,BANDAVAIL1,BANDAVAIL1\r\n"
+        b'D,BID,BIDPEROFFER_D,2,"2024/01/01 00:00:00",A,05,1\r\n'
+    )
+
+
+@pytest.mark.parametrize("dtype", [None, str])
+def test_split_sections_read_back_like_pandas_reads_the_original(tmp_path, dtype):
+    """The frames the old per-section pd.read_csv calls produced."""
+    path = tmp_path / "PUBLIC_BIDMOVE_COMPLETE_20240101_0000000410.CSV"
+    path.write_text(MULTI_REPORT, newline="")
+    sinks = {1: io.BytesIO(), 2: io.BytesIO()}
+    with open(path, "rb") as f:
+        split_mms_sections(f, lambda position, header: sinks.get(position))
+
+    day_offer = pd.read_csv(path, header=1, nrows=2, dtype=dtype)
+    per_offer = pd.read_csv(path, header=4, nrows=1, dtype=dtype)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(sinks[1].getvalue()), dtype=dtype), day_offer)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(sinks[2].getvalue()), dtype=dtype), per_offer)
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 from datetime import datetime
@@ -242,3 +243,111 @@ class TestMostRecent(unittest.TestCase):
             aim["EFFECTIVEDATE"], format="%Y/%m/%d %H:%M:%S"
         )
         assert_frame_equal(aim, result)
+
+
+class TestIncrementalFinalise(unittest.TestCase):
+    def setUp(self):
+        defaults.primary_date_columns["dummy"] = "EFFECTIVEDATE"
+        defaults.effective_date_group_col["dummy"] = ["GENCONID"]
+        defaults.table_primary_keys["dummy"] = ["GENCONID", "EFFECTIVEDATE"]
+        self.start_time = datetime(2017, 1, 5)
+        self.chunks = [
+            pd.DataFrame(
+                {
+                    "EFFECTIVEDATE": pd.to_datetime(
+                        ["2017-01-01", "2017-01-06", "2017-01-02"]
+                    ),
+                    "VERSIONNO": ["1", "1", "1"],
+                    "GENCONID": ["ID1", "ID1", "ID2"],
+                }
+            ),
+            pd.DataFrame(
+                {
+                    "EFFECTIVEDATE": pd.to_datetime(
+                        ["2017-01-03", "2017-01-06", "2017-01-07"]
+                    ),
+                    "VERSIONNO": ["1", "2", "1"],
+                    "GENCONID": ["ID1", "ID1", "ID2"],
+                }
+            ),
+        ]
+        self.functions = [
+            query_wrappers.most_recent_records_before_start_time,
+            query_wrappers.drop_duplicates_by_primary_key,
+        ]
+
+    def test_matches_finalising_all_at_once(self):
+        aim = pd.concat(self.chunks)
+        for function in self.functions:
+            aim = function(aim, self.start_time, "dummy")
+
+        finalise = query_wrappers.IncrementalFinalise(
+            self.functions, self.start_time, "dummy"
+        )
+        frames = [finalise.update(chunk) for chunk in self.chunks]
+        frames.append(finalise.flush())
+        result = pd.concat(frames)
+        assert_frame_equal(aim.reset_index(drop=True), result.reset_index(drop=True))
+
+    def test_duplicate_key_in_later_chunk_dropped(self):
+        finalise = query_wrappers.IncrementalFinalise(
+            [query_wrappers.drop_duplicates_by_primary_key], self.start_time, "dummy"
+        )
+        finalise.update(self.chunks[0])
+        result = finalise.update(self.chunks[1])
+        self.assertEqual(result["VERSIONNO"].tolist(), ["1", "1"])
+        self.assertIsNone(finalise.flush())
+
+
+def _sort_and_merge_most_recent(data, start_time, table_name):
+    # The sort + groupby().last() + merge implementation that
+    # most_recent_records_before_start_time replaced, kept as a reference.
+    date_col = defaults.primary_date_columns[table_name]
+    group_cols = defaults.effective_date_group_col[table_name]
+    after = data[data[date_col] >= start_time].copy()
+    before = data[data[date_col] < start_time].copy()
+    before = before.sort_values(date_col, kind="stable")
+    if len(group_cols) > 0:
+        latest = before.groupby(group_cols, as_index=False).last()
+        group_cols = group_cols + [date_col]
+        most_recent = pd.merge(latest.loc[:, group_cols], before, "inner", group_cols)
+    else:
+        most_recent = before.tail(1)
+    return pd.concat([after, most_recent], sort=False)
+
+
+class TestMostRecentMatchesSortAndMerge(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.data = pd.DataFrame(
+            {
+                "GENCONID": rng.choice(["C%d" % i for i in range(50)] + [None], n),
+                "EFFECTIVEDATE": pd.Timestamp("2020-01-01")
+                + pd.to_timedelta(rng.integers(0, 40, n), unit="D"),
+                "VERSIONNO": rng.integers(1, 4, n),
+                "VALUE": rng.random(n),
+            }
+        )
+        self.data.loc[::97, "EFFECTIVEDATE"] = pd.NaT
+        self.start_time = datetime(2020, 1, 25)
+        defaults.primary_date_columns["dummy"] = "EFFECTIVEDATE"
+
+    def _check(self, group_cols):
+        defaults.effective_date_group_col["dummy"] = group_cols
+        result = query_wrappers.most_recent_records_before_start_time(
+            self.data, self.start_time, "dummy"
+        )
+        aim = _sort_and_merge_most_recent(self.data, self.start_time, "dummy")
+        assert_frame_equal(
+            aim.reset_index(drop=True), result.reset_index(drop=True)
+        )
+
+    def test_grouped(self):
+        self._check(["GENCONID"])
+
+    def test_two_group_columns(self):
+        self._check(["GENCONID", "VERSIONNO"])
+
+    def test_ungrouped(self):
+        self._check([])
@@ -0,0 +1,196 @@
+"""Unit tests for `nemosis.value_parser._infer_column_data_types`, with
+and without the declared column types in `defaults.column_types`, for
+the categorical helpers used with `categoricals=True`, and for the
+sample-based datetime format detection in `_parse_datetime_np`."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nemosis import defaults
+from nemosis.value_parser import (
+    _concat_data_tables,
+    _decode_categorical_columns,
+    _encode_categorical_columns,
+    _date_format_of_shape,
+    _detect_date_format,
+    _infer_column_data_types,
+    _is_text_column,
+    _parse_datetime_np,
+)
+
+# The dtype pandas 3 gives text columns by default.
+PANDAS_3_STR = "string[pyarrow_numpy]"
+
+
+def _frame():
+    return pd.DataFrame({
+        "SETTLEMENTDATE": ["2018/05/01 00:05:00", "2018/05/01 00:10:00"],
+        "DUID": ["AGLHAL", "HDWF2"],
+        "INTERVENTION": ["0", "1"],
+        "RRP": ["81", "70"],
+        "UNKNOWN": ["1.5", "2"],
+    })
+
+
+def test_without_table_name_everything_is_inferred():
+    data = _infer_column_data_types(_frame())
+    assert data["SETTLEMENTDATE"].dtype == "datetime64[ns]"
+    assert data["RRP"].dtype == "int64"
+    assert data["UNKNOWN"].dtype == "float64"
+
+
+def test_declared_types_are_applied():
+    data = _infer_column_data_types(_frame(), "DISPATCHPRICE")
+    assert data["SETTLEMENTDATE"].dtype == "datetime64[ns]"
+    assert data["DUID"].dtype == "object"
+    assert data["INTERVENTION"].dtype == "int64"
+    # Declared float, even when a period happens to hold whole numbers.
+    assert data["RRP"].dtype == "float64"
+    assert data["UNKNOWN"].dtype == "float64"
+
+
+def test_declared_string_is_not_converted(monkeypatch):
+    monkeypatch.setitem(defaults.column_types, "DUID", "string")
+    data = _infer_column_data_types(pd.DataFrame({"DUID": ["1", "2"]}), "DISPATCHLOAD")
+    assert data["DUID"].tolist() == ["1", "2"]
+
+
+def test_int_with_gaps_becomes_float():
+    data = _infer_column_data_types(pd.DataFrame({"VERSIONNO": ["1", np.nan]}), "DUDETAIL")
+    assert data["VERSIONNO"].dtype == "float64"
+
+
+@pytest.mark.parametrize("value", ["2018-05-01 00:05:00", "2018/05/01 00:05:00.000"])
+def test_other_datetime_formats(value):
+    data = _infer_column_data_types(pd.DataFrame({"SETTLEMENTDATE": [value]}), "DISPATCHPRICE")
+    assert data["SETTLEMENTDATE"].tolist() == [pd.Timestamp("2018-05-01 00:05:00")]
+
+
+def test_values_not_matching_declared_type_fall_back_to_inference():
+    data = _infer_column_data_types(pd.DataFrame({"RRP": ["n/a", "x"]}), "DISPATCHPRICE")
+    assert data["RRP"].tolist() == ["n/a", "x"]
+
+
+def test_typed_columns_pass_through():
+    frame = pd.DataFrame({
+        "SETTLEMENTDATE": pd.to_datetime(["2018-05-01 00:05:00"]),
+        "INTERVENTION": np.array([0], dtype="int64"),
+        "RRP": np.array([81.5]),
+    })
+    data = _infer_column_data_types(frame.copy(), "DISPATCHPRICE")
+    pd.testing.assert_frame_equal(data, frame)
+
+
+def test_typed_columns_not_parsed(monkeypatch):
+    def fail(series):
+        raise AssertionError(f"{series.name} parsed")
+
+    monkeypatch.setattr("nemosis.value_parser._parse_column", fail)
+    monkeypatch.setattr("nemosis.value_parser._parse_declared_column", fail)
+    frame = pd.DataFrame({
+        "SETTLEMENTDATE": pd.to_datetime(["2018-05-01 00:05:00"]),
+        "DUID": pd.Series(["AGLHAL"], dtype="category"),
+        "FLAG": [True],
+        "UNKNOWN": [1.5],
+    })
+    data = _infer_column_data_types(frame.copy(), "DISPATCHLOAD")
+    pd.testing.assert_frame_equal(data, frame)
+
+
+def test_typed_int_declared_float_is_cast():
+    data = _infer_column_data_types(pd.DataFrame({"RRP": [81, 70]}), "DISPATCHPRICE")
+    assert data["RRP"].dtype == "float64"
+
+
+def test_string_dtype_columns_are_inferred():
+    data = _infer_column_data_types(_frame().astype(PANDAS_3_STR), "DISPATCHPRICE")
+    assert data["SETTLEMENTDATE"].dtype == "datetime64[ns]"
+    assert data["RRP"].dtype == "float64"
+    assert data["UNKNOWN"].dtype == "float64"
+    assert _is_text_column(data["DUID"])
+
+
+def test_is_text_column():
+    assert _is_text_column(pd.Series(["a", None]))
+    assert _is_text_column(pd.Series(["a", None], dtype=PANDAS_3_STR))
+    assert _is_text_column(pd.Series(["a"], dtype="string"))
+    assert _is_text_column(pd.Series([1, "a"], dtype=object))
+    assert not _is_text_column(pd.Series(["a"], dtype="category"))
+    assert not _is_text_column(pd.Series([1.5]))
+
+
+def test_encode_only_listed_string_columns():
+    frame = pd.DataFrame({"DUID": ["A", "B"], "NAME": ["x", "y"], "REGIONID": [1, 2]})
+    data = _encode_categorical_columns(frame)
+    assert isinstance(data["DUID"].dtype, pd.CategoricalDtype)
+    assert data["NAME"].dtype == object
+    assert data["REGIONID"].dtype == "int64"
+
+
+def test_encode_string_dtype_columns():
+    data = _encode_categorical_columns(pd.DataFrame({"DUID": ["A", "B"]}, dtype=PANDAS_3_STR))
+    assert isinstance(data["DUID"].dtype, pd.CategoricalDtype)
+
+
+def test_concat_unifies_categories():
+    first = _encode_categorical_columns(pd.DataFrame({"DUID": ["A", "B"]}))
+    second = _encode_categorical_columns(pd.DataFrame({"DUID": ["C", "A"]}))
+    data = _concat_data_tables([first, second])
+    assert isinstance(data["DUID"].dtype, pd.CategoricalDtype)
+    assert data["DUID"].tolist() == ["A", "B", "C", "A"]
+    assert list(data["DUID"].cat.categories) == ["A", "B", "C"]
+
+
+def test_decode_round_trips():
+    frame = pd.DataFrame({"DUID": ["A", np.nan, "B"]})
+    data = _decode_categorical_columns(_encode_categorical_columns(frame.copy()))
+    pd.testing.assert_frame_equal(data, frame)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2018/05/01 00:05:00", "%Y/%m/%d %H:%M:%S"),
+        ("2018/05/01 00:05:00.000", "%Y/%m/%d %H:%M:%S.%f"),
+        ("2018-05-01 00:05:00", "%Y-%m-%d %H:%M:%S"),
+    ],
+)
+def test_format_detected_from_sample(value, expected):
+    assert _detect_date_format(pd.Series([value, np.nan, value])) == expected
+
+
+def test_format_memoized_by_layout():
+    _date_format_of_shape.cache_clear()
+    _detect_date_format(pd.Series(["2018/05/01 00:05:00"]))
+    _detect_date_format(pd.Series(["2021/12/31 23:55:00"]))
+    info = _date_format_of_shape.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_datetime_column_not_reparsed():
+    parsed = pd.Series(pd.to_datetime(["2018-05-01 00:05:00"]))
+    assert _parse_datetime_np(parsed) is parsed
+
+
+def test_mixed_formats_raise():
+    with pytest.raises(ValueError):
+        _parse_datetime_np(pd.Series(["2018/05/01 00:05:00", "2018-05-01 00:10:00"]))
+
+
+def test_all_missing_column():
+    data = _parse_datetime_np(pd.Series([np.nan, np.nan], dtype=object))
+    assert data.isna().all()
+    assert data.dtype == "datetime64[ns]"
+
+
+def test_not_dates_raise():
+    with pytest.raises(ValueError):
+        _parse_datetime_np(pd.Series(["AGLHAL", "HDWF2"]))
+
+
+def test_coerce_drops_malformed_values():
+    data = _parse_datetime_np(
+        pd.Series(["2018/05/01 00:05:00", "2018/05/01 00:1", "2018/05/01 00:15:00"]),
+        errors="coerce",
+    )
+    assert data.isna().tolist() == [False, True, False]